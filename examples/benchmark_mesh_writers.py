@@ -0,0 +1,118 @@
+"""Benchmark the visual mesh writers against trimesh / PyMeshLab export.
+
+Writes a synthetic colored mesh (a wavy height field split into four color
+bands, 5M triangles by default) in every format and prints the throughput
+in MB/s of written file per second.
+
+    python examples/benchmark_mesh_writers.py [--triangles 5000000]
+"""
+
+import argparse
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+
+from onshape2xacro.mesh_exporters.buffers import MeshGroup, WeldedMesh
+from onshape2xacro.mesh_exporters.writers import (
+    write_dae,
+    write_obj,
+    write_ply,
+    write_stl,
+)
+
+COLORS = [(0.8, 0.1, 0.1), (0.1, 0.6, 0.2), (0.2, 0.3, 0.9), (0.7, 0.7, 0.7)]
+
+
+def height_field(triangles: int) -> WeldedMesh:
+    """A welded grid of about ``triangles`` triangles, one group per color band."""
+    n = int(np.sqrt(triangles / 2)) + 1
+    x, y = np.meshgrid(np.linspace(0, 500, n), np.linspace(0, 500, n))
+    z = 10 * np.sin(x / 20) * np.cos(y / 30)
+    positions = np.column_stack([x.ravel(), y.ravel(), z.ravel()])
+    normals = np.column_stack(
+        [
+            -np.cos(x / 20).ravel() * np.cos(y / 30).ravel() / 2,
+            np.sin(x / 20).ravel() * np.sin(y / 30).ravel() / 3,
+            np.ones(n * n),
+        ]
+    )
+    normals /= np.linalg.norm(normals, axis=1, keepdims=True)
+
+    groups = []
+    rows = np.array_split(np.arange(n - 1), len(COLORS))
+    for color, band in zip(COLORS, rows):
+        first, last = band[0], band[-1] + 1
+        cells = np.arange(first * n, last * n).reshape(-1, n)[:, :-1].ravel()
+        quads = np.column_stack([cells, cells + 1, cells + n + 1, cells + n])
+        triangles_ = np.vstack([quads[:, [0, 1, 2]], quads[:, [0, 2, 3]]])
+        # Each band owns the grid rows it touches, re-indexed from 0
+        offset = first * n
+        groups.append(
+            MeshGroup(
+                color,
+                positions[offset : (last + 1) * n],
+                normals[offset : (last + 1) * n],
+                triangles_ - offset,
+            )
+        )
+    return WeldedMesh(groups)
+
+
+def _measure(label: str, write, path: Path) -> None:
+    start = time.perf_counter()
+    write(path)
+    elapsed = time.perf_counter() - start
+    size = path.stat().st_size / 1e6
+    print(f"{label:<28}{size:>10.1f} MB{elapsed:>9.2f} s{size / elapsed:>10.1f} MB/s")
+    path.unlink()
+
+
+def _pymeshlab_dae(mesh, path: Path) -> None:
+    import pymeshlab
+
+    temp_obj = path.with_suffix(".obj")
+    mesh.export(temp_obj, file_type="obj")
+    ms = pymeshlab.MeshSet()
+    ms.load_new_mesh(str(temp_obj))
+    ms.save_current_mesh(str(path))
+    temp_obj.unlink()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--triangles", type=int, default=5_000_000)
+    parser.add_argument("--skip-baseline", action="store_true")
+    args = parser.parse_args()
+
+    mesh = height_field(args.triangles)
+    print(f"{mesh.face_count} triangles, {mesh.vertex_count} vertices\n")
+    with tempfile.TemporaryDirectory() as tmp:
+        out = Path(tmp)
+        _measure("onshape2xacro obj", lambda p: write_obj(p, mesh), out / "a.obj")
+        _measure("onshape2xacro dae", lambda p: write_dae(p, mesh), out / "a.dae")
+        _measure(
+            "onshape2xacro ply (binary)", lambda p: write_ply(p, mesh), out / "a.ply"
+        )
+        _measure("onshape2xacro stl", lambda p: write_stl(p, mesh), out / "a.stl")
+        if args.skip_baseline:
+            return
+
+        shared = mesh.to_trimesh()
+        _measure(
+            "trimesh obj",
+            lambda p: shared.export(p, file_type="obj"),
+            out / "b.obj",
+        )
+        _measure(
+            "trimesh + pymeshlab dae",
+            lambda p: _pymeshlab_dae(shared, p),
+            out / "b.dae",
+        )
+        _measure("trimesh ply (binary)", lambda p: shared.export(p), out / "b.ply")
+        _measure("trimesh stl", lambda p: shared.export(p), out / "b.stl")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,61 @@
+"""User-level cache directory shared by every export on this machine."""
+
+import os
+from pathlib import Path
+
+from loguru import logger
+
+CACHE_DIR_ENV = "ONSHAPE2XACRO_CACHE_DIR"
+
+
+def user_cache_dir(name: str) -> Path:
+    """Directory ``name`` inside the user cache.
+
+    The cache root is ``$ONSHAPE2XACRO_CACHE_DIR`` if set, otherwise
+    ``$XDG_CACHE_HOME/onshape2xacro`` (``~/.cache/onshape2xacro``).
+    """
+    root = os.environ.get(CACHE_DIR_ENV)
+    if root:
+        base = Path(root).expanduser()
+    else:
+        xdg = os.environ.get("XDG_CACHE_HOME")
+        base = (Path(xdg) if xdg else Path.home() / ".cache") / "onshape2xacro"
+    return base / name
+
+
+def touch(path: Path) -> None:
+    """Mark a cache entry as recently used."""
+    try:
+        os.utime(path)
+    except OSError:
+        pass
+
+
+def prune_lru(directory: Path, max_bytes: int, pattern: str = "*") -> int:
+    """Delete the least recently used files until ``directory`` fits ``max_bytes``.
+
+    Entries are ordered by modification time, which :func:`touch` bumps on
+    every hit. Returns the number of deleted files.
+    """
+    entries = []
+    for path in directory.glob(pattern):
+        try:
+            stat = path.stat()
+        except OSError:
+            continue
+        entries.append((stat.st_mtime, stat.st_size, path))
+
+    total = sum(size for _, size, _ in entries)
+    removed = 0
+    for _, size, path in sorted(entries, key=lambda e: (e[0], str(e[2]))):
+        if total <= max_bytes:
+            break
+        try:
+            path.unlink()
+        except OSError:
+            continue
+        total -= size
+        removed += 1
+    if removed:
+        logger.debug(f"Evicted {removed} entries from {directory}")
+    return removed
@@ -34,6 +34,17 @@ def parse_args() -> Union[ExportConfig, VisualizeConfig, FetchCadConfig, AuthCon
     )
 
 
+def _describe_part_filter(part_filter) -> str:
+    rules = []
+    if part_filter.min_volume_mm3 > 0:
+        rules.append(f"volume < {part_filter.min_volume_mm3} mm³")
+    if part_filter.min_extent_mm > 0:
+        rules.append(f"extent < {part_filter.min_extent_mm} mm")
+    if part_filter.name_patterns:
+        rules.append("name ~ " + ", ".join(part_filter.name_patterns))
+    return "; ".join(rules)
+
+
 def _confirm_export_config(cli_config: ExportConfig, export_config):
     """Ask user to confirm export configuration using rich."""
     if cli_config.skip_confirmation:
@@ -64,6 +75,10 @@ def _confirm_export_config(cli_config: ExportConfig, export_config):
     table.add_row("Input Path", str(cli_config.path))
     table.add_row("Output Path", str(export_config.export.output))
     table.add_row("Robot Name", export_config.export.name)
+    if cli_config.only_links:
+        table.add_row("Only Links", ", ".join(cli_config.only_links))
+    if cli_config.subtree:
+        table.add_row("Subtree", cli_config.subtree)
 
     formats = export_config.export.visual_option.formats
     if formats:
@@ -73,6 +88,10 @@ def _confirm_export_config(cli_config: ExportConfig, export_config):
 
     max_size = export_config.export.visual_option.max_size_mb
     table.add_row("Visual Max Size (MB)", str(max_size))
+    table.add_row("Visual Decimation", export_config.export.visual_option.decimation)
+    lods = export_config.export.visual_option.lods
+    if lods:
+        table.add_row("Visual LODs", ", ".join(str(r) for r in lods))
 
     col_method = export_config.export.collision_option.method
     table.add_row("Collision Method", col_method)
@@ -83,10 +102,22 @@ def _confirm_export_config(cli_config: ExportConfig, export_config):
         table.add_row("  Resolution", str(coacd.resolution))
         table.add_row("  Max Convex Hull", str(coacd.max_convex_hull))
 
+    for label, part_filter in (
+        ("Visual Part Filter", export_config.export.visual_option.part_filter),
+        ("Collision Part Filter", export_config.export.collision_option.part_filter),
+    ):
+        if part_filter.enabled:
+            table.add_row(label, _describe_part_filter(part_filter))
+
     if export_config.export.bom:
         table.add_row("BOM Path", str(export_config.export.bom))
     else:
         table.add_row("BOM Path", "[yellow]None (mass will be default)[/yellow]")
+    inertia_method = export_config.export.inertia_method
+    if export_config.export.inertia_compare:
+        compared = "mesh" if inertia_method == "exact" else "exact"
+        inertia_method += f" (compared with {compared})"
+    table.add_row("Inertia Method", inertia_method)
 
     table.add_row("Max Depth", str(cli_config.max_depth))
 
@@ -101,6 +132,20 @@ def _confirm_export_config(cli_config: ExportConfig, export_config):
         sys.exit(0)
 
 
+def _merge_part_filter(cli_filter, config_filter) -> None:
+    """Apply CLI part filter overrides onto the loaded configuration (and back)."""
+    from dataclasses import fields
+
+    from onshape2xacro.schema import PartFilterConfig
+
+    for field in fields(PartFilterConfig):
+        cli_val = getattr(cli_filter, field.name)
+        if cli_val is not None:
+            setattr(config_filter, field.name, cli_val)
+        else:
+            setattr(cli_filter, field.name, getattr(config_filter, field.name))
+
+
 def _setup_logging(output_path=None, verbose=False, debug=False):
     """Centralize logging: file sink at DEBUG, console at WARNING+ (INFO+ with --verbose).
 
@@ -222,6 +267,8 @@ def main():
 
             for field in fields(VisualMeshConfig):
                 field_name = field.name
+                if field_name == "part_filter":
+                    continue
                 cli_val = getattr(config.visual_option, field_name)
 
                 if cli_val is not None:
@@ -242,6 +289,15 @@ def main():
                     export_config.export.collision_option.method
                 )
 
+            _merge_part_filter(
+                config.visual_option.part_filter,
+                export_config.export.visual_option.part_filter,
+            )
+            _merge_part_filter(
+                config.collision_option.part_filter,
+                export_config.export.collision_option.part_filter,
+            )
+
             # Override CoACD options
             for field in fields(CoACDConfig):
                 field_name = field.name
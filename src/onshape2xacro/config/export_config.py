@@ -16,16 +16,55 @@ class CoACDOptions:
     max_workers: int = 10
 
 
+@dataclass
+class PartFilterOptions:
+    """Drop small parts (fasteners, washers, ...) from a mesh output.
+
+    Filtered parts are skipped before tessellation but still count toward
+    the link inertia. Thresholds are in STEP units (millimeters).
+    """
+
+    min_volume_mm3: float = 0.0
+    min_extent_mm: float = 0.0
+    name_patterns: list[str] = field(default_factory=list)
+
+    @property
+    def enabled(self) -> bool:
+        return (
+            self.min_volume_mm3 > 0
+            or self.min_extent_mm > 0
+            or bool(self.name_patterns)
+        )
+
+
 @dataclass
 class CollisionOptions:
     method: Literal["fast", "coacd"] = "fast"
     coacd: CoACDOptions = field(default_factory=CoACDOptions)
+    part_filter: PartFilterOptions = field(default_factory=PartFilterOptions)
 
 
 @dataclass
 class VisualMeshOptions:
     formats: list[str] = field(default_factory=lambda: ["obj"])
     max_size_mb: float = 10.0
+    decimation: Literal["uniform", "part_aware"] = "part_aware"
+    max_workers: int = 8
+    lods: list[float] = field(default_factory=list)
+    glb_quantize: bool = False
+    instancing: bool = False
+    scene: bool = False
+    part_filter: PartFilterOptions = field(default_factory=PartFilterOptions)
+
+
+def _parse_part_filter(data: Any) -> PartFilterOptions:
+    if isinstance(data, PartFilterOptions):
+        return data
+    if not isinstance(data, dict):
+        return PartFilterOptions()
+    data = {k.replace("-", "_"): v for k, v in data.items()}
+    valid_keys = PartFilterOptions.__annotations__.keys()
+    return PartFilterOptions(**{k: v for k, v in data.items() if k in valid_keys})
 
 
 @dataclass
@@ -35,6 +74,10 @@ class ExportOptions:
     collision_option: CollisionOptions = field(default_factory=CollisionOptions)
     output: Path = field(default_factory=lambda: Path("output"))
     bom: Path | None = None
+    inertia_method: Literal["exact", "mesh", "onshape"] = "exact"
+    inertia_compare: bool = False
+    inertia_max_workers: int = 8
+    material_densities: dict[str, float] = field(default_factory=dict)
 
 
 @dataclass
@@ -70,6 +113,10 @@ class ExportConfiguration:
         if isinstance(visual_data, dict):
             valid_keys = VisualMeshOptions.__annotations__.keys()
             visual_data = {k: v for k, v in visual_data.items() if k in valid_keys}
+            if "part_filter" in visual_data:
+                visual_data["part_filter"] = _parse_part_filter(
+                    visual_data["part_filter"]
+                )
             export_data["visual_option"] = VisualMeshOptions(**visual_data)
 
         if "output" in export_data:
@@ -88,6 +135,11 @@ class ExportConfiguration:
             coacd_data = {k: v for k, v in coacd_data.items() if k in valid_keys}
             collision_data["coacd"] = CoACDOptions(**coacd_data)
 
+        if "part_filter" in collision_data:
+            collision_data["part_filter"] = _parse_part_filter(
+                collision_data["part_filter"]
+            )
+
         # Support old collision_mesh_method if present
         if "collision_mesh_method" in export_data:
             if "method" not in collision_data:
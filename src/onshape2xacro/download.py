@@ -0,0 +1,296 @@
+"""Resumable downloads of large API results.
+
+The body is written to a partial file. When the server accepts byte
+ranges, a JSON sidecar next to it records the expected size, the ETag and
+the bytes received per segment: a dropped connection is resumed with a
+``Range`` request for what is missing, within the run or by a later one,
+and large bodies are fetched as several ranged segments in parallel.
+``If-Range`` makes the server send the whole body again if it changed.
+"""
+
+import json
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, List, Optional
+
+import requests
+from loguru import logger
+
+# Read size of streamed downloads; bounds their memory use
+DOWNLOAD_CHUNK_SIZE = 1024 * 1024
+DEFAULT_SEGMENTS = 4
+# Smaller bodies are not worth splitting into ranged segments
+PARALLEL_MIN_SIZE = 64 * 1024 * 1024
+# Bytes read before the body is offered to ``accept``
+SNIFF_SIZE = 512
+
+TRANSIENT_ERRORS = (
+    requests.ConnectionError,
+    requests.Timeout,
+    requests.exceptions.ChunkedEncodingError,
+)
+
+# Sends a GET with the given extra headers
+Fetch = Callable[[Dict[str, str]], requests.Response]
+
+
+class _Restart(Exception):
+    """The server ignored a range request; the body must be fetched anew."""
+
+
+def sidecar_path(path: Path) -> Path:
+    return path.with_name(f"{path.name}.json")
+
+
+def _content_length(response: requests.Response) -> Optional[int]:
+    # A compressed body is decoded by requests, so its length is not the file's
+    if response.headers.get("Content-Encoding", "identity") != "identity":
+        return None
+    try:
+        return int(response.headers["Content-Length"])
+    except (KeyError, ValueError):
+        return None
+
+
+def _segments(size: int, count: int) -> List[List[int]]:
+    """``[start, end, received]`` of ``count`` equal segments of ``size`` bytes."""
+    bounds = [size * i // count for i in range(count + 1)]
+    return [[start, end, 0] for start, end in zip(bounds, bounds[1:])]
+
+
+class _Body:
+    """The streamed chunks of ``response``, released by :meth:`close`."""
+
+    def __init__(self, response: requests.Response, chunks: Iterator[bytes]):
+        self.response = response
+        self.chunks = chunks
+
+    def close(self) -> None:
+        self.response.close()
+
+
+class ResumableDownload:
+    """Download of one resource into ``path``, resumed across dropped connections.
+
+    ``source`` identifies the resource in the sidecar, so a partial file
+    is only resumed for the resource it came from.
+    """
+
+    def __init__(
+        self,
+        fetch: Fetch,
+        path: Path,
+        source: str,
+        segments: int = DEFAULT_SEGMENTS,
+        max_retries: int = 5,
+        backoff: float = 0.5,
+    ):
+        self.fetch = fetch
+        self.path = path
+        self.source = source
+        self.segments = max(1, segments)
+        self.max_retries = max_retries
+        self.backoff = backoff
+        # Size, ETag and segment progress; None before the body is requested
+        self.state: Optional[Dict[str, Any]] = None
+        # Cleared once the server answered a range request with the whole body
+        self.use_ranges = True
+        self._lock = threading.Lock()
+
+    @property
+    def sidecar(self) -> Path:
+        return sidecar_path(self.path)
+
+    def _received(self) -> int:
+        if self.state is None:
+            return 0
+        return sum(received for _, _, received in self.state["segments"])
+
+    def _load_state(self) -> Optional[Dict[str, Any]]:
+        try:
+            state = json.loads(self.sidecar.read_text())
+            if (
+                state.get("source") == self.source
+                and state.get("etag")
+                and self.path.stat().st_size == state["size"]
+            ):
+                return state
+        except (OSError, ValueError, KeyError, TypeError):
+            pass
+        return None
+
+    def _save_state(self) -> None:
+        # Called with the lock held
+        tmp = self.sidecar.with_name(f"{self.sidecar.name}.{os.getpid()}.tmp")
+        try:
+            tmp.write_text(json.dumps(self.state))
+            tmp.replace(self.sidecar)
+        except OSError as e:
+            logger.debug(f"Could not record download progress: {e}")
+
+    def discard(self) -> None:
+        """Remove the partial file and its sidecar."""
+        self.state = None
+        self.path.unlink(missing_ok=True)
+        self.sidecar.unlink(missing_ok=True)
+
+    def run(self, accept: Callable[[bytes], bool] = lambda head: True) -> bool:
+        """Download the whole body to ``path``.
+
+        Returns False, reading no further, when ``accept`` rejects the
+        first bytes of a new download. Transient errors are retried from
+        where the body stopped (from the start if the server takes no
+        ranges); once ``max_retries`` attempts in a row made no progress
+        the last error is raised and the partial file is kept for a later
+        run. A server that ignores ranges (or whose ETag does not match)
+        is asked for the whole body once more, sequentially.
+        """
+        self.state = self._load_state()
+        if self.state is not None:
+            logger.info(
+                f"Resuming download of {self.path.name} at "
+                f"{self._received() / 1024 / 1024:.1f} MB"
+            )
+        failures = restarts = 0
+        while True:
+            received = self._received()
+            try:
+                return self._attempt(accept)
+            except _Restart:
+                restarts += 1
+                if restarts > self.max_retries:
+                    raise RuntimeError(
+                        f"Download of {self.source} restarted {restarts} times"
+                    )
+                logger.debug(
+                    f"{self.source} changed or ignored the range request; "
+                    "downloading it whole without ranges"
+                )
+                self.discard()
+                self.use_ranges = False
+            except TRANSIENT_ERRORS as e:
+                if self._received() > received:
+                    failures = 0
+                if failures >= self.max_retries:
+                    raise
+                logger.debug(f"Resuming {self.source} after {type(e).__name__}: {e}")
+                if self.state is not None and not self.state["ranges"]:
+                    self.state = None
+            failures += 1
+            time.sleep(self.backoff * min(failures, 10))
+
+    def _attempt(self, accept: Callable[[bytes], bool]) -> bool:
+        first = None
+        if self.state is None:
+            first = self._start(accept)
+            if first is None:
+                self.discard()
+                return False
+
+        pending = [
+            i
+            for i, (start, end, received) in enumerate(self.state["segments"])
+            if end is None or start + received < end
+        ]
+        with ThreadPoolExecutor(max_workers=max(1, len(pending))) as pool:
+            futures = [
+                pool.submit(self._fill, i, first if i == 0 else None) for i in pending
+            ]
+        if first is not None:
+            first.close()
+        errors = [f.exception() for f in futures if f.exception() is not None]
+        for error in errors:
+            if isinstance(error, _Restart):
+                raise error
+        if errors:
+            raise errors[0]
+
+        self.sidecar.unlink(missing_ok=True)
+        return True
+
+    def _start(self, accept: Callable[[bytes], bool]) -> Optional[_Body]:
+        """Request the whole body and plan its segments from the headers.
+
+        Returns the rest of the body, or None if ``accept`` rejected it.
+        """
+        response = self.fetch({})
+        response.raise_for_status()
+        chunks = response.iter_content(DOWNLOAD_CHUNK_SIZE)
+        head = b""
+        for chunk in chunks:
+            head += chunk
+            if len(head) >= SNIFF_SIZE:
+                break
+        if not accept(head):
+            response.close()
+            return None
+
+        size = _content_length(response)
+        ranges = (
+            self.use_ranges
+            and size is not None
+            and response.headers.get("Accept-Ranges") == "bytes"
+        )
+        if ranges and size >= PARALLEL_MIN_SIZE:
+            segments = _segments(size, self.segments)
+        else:
+            segments = [[0, size, 0]]
+        end = segments[0][1]
+        segments[0][2] = len(head) if end is None else min(len(head), end)
+
+        with open(self.path, "wb") as f:
+            f.write(head)
+            if size is not None:
+                f.truncate(size)
+        with self._lock:
+            self.state = {
+                "source": self.source,
+                "size": size,
+                "etag": response.headers.get("ETag"),
+                "ranges": ranges,
+                "segments": segments,
+            }
+            if ranges:
+                self._save_state()
+        return _Body(response, chunks)
+
+    def _fill(self, index: int, body: Optional[_Body]) -> None:
+        """Receive segment ``index``, continuing ``body`` if given."""
+        state = self.state
+        start, end, received = state["segments"][index]
+        if body is None:
+            last = "" if end is None else end - 1
+            headers = {"Range": f"bytes={start + received}-{last}"}
+            if state["etag"]:
+                headers["If-Range"] = state["etag"]
+            response = self.fetch(headers)
+            response.raise_for_status()
+            if response.status_code != 206:
+                response.close()
+                raise _Restart()
+            body = _Body(response, response.iter_content(DOWNLOAD_CHUNK_SIZE))
+
+        try:
+            with open(self.path, "r+b") as f:
+                f.seek(start + received)
+                for chunk in body.chunks:
+                    if end is not None:
+                        chunk = chunk[: end - start - received]
+                    f.write(chunk)
+                    received += len(chunk)
+                    with self._lock:
+                        state["segments"][index][2] = received
+                        if state["ranges"]:
+                            self._save_state()
+                    if end is not None and start + received >= end:
+                        break
+        finally:
+            # Also when the segment ends before the body does
+            body.close()
+        if end is not None and start + received < end:
+            raise requests.exceptions.ChunkedEncodingError(
+                f"Body ended {end - start - received} bytes early"
+            )
@@ -0,0 +1,137 @@
+"""Record of the last fetch-cad run, for incremental refetches.
+
+``fetch_state.json`` in the output directory records what ``cad.pickle``
+and ``assembly.step`` were fetched from: the document's microversion, the
+``documentMicroversion`` of every subassembly definition and the options
+that shape the CAD data. While the document's microversion is unchanged,
+a later fetch reuses both files. After an edit only the root assembly
+and the changed definitions reach Onshape: unchanged definitions are
+requested by the same microversion and answered by the HTTP cache.
+
+``step_translation.json`` records the STEP translation of a fetch until
+its result is saved, so that a rerun after an interrupted download
+resumes the same result rather than translating the document again.
+"""
+
+import dataclasses
+import json
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, Optional, Tuple
+
+from loguru import logger
+
+from onshape2xacro.mesh_exporters.manifest import tool_version
+
+FETCH_STATE_NAME = "fetch_state.json"
+PENDING_TRANSLATION_NAME = "step_translation.json"
+# Bump when the layout or meaning of the record changes
+FETCH_STATE_VERSION = 1
+
+
+def subassembly_microversions(cad: Any) -> Dict[str, str]:
+    """``documentMicroversion`` of each subassembly definition, by ``did/eid``."""
+    return {
+        f"{sub.documentId}/{sub.elementId}": sub.documentMicroversion
+        for sub in cad.subassemblies.values()
+    }
+
+
+@dataclass
+class FetchState:
+    """What the CAD data in an output directory was fetched from."""
+
+    url: str
+    microversion: str
+    options: Dict[str, Any]
+    subassemblies: Dict[str, str] = field(default_factory=dict)
+    tool_version: str = field(default_factory=tool_version)
+
+    @classmethod
+    def from_cad(cls, url: str, cad: Any, options: Dict[str, Any]) -> "FetchState":
+        return cls(
+            url=url,
+            microversion=cad.document_microversion,
+            options=options,
+            subassemblies=subassembly_microversions(cad),
+        )
+
+    @classmethod
+    def load(cls, output_dir: Path) -> Optional["FetchState"]:
+        path = output_dir / FETCH_STATE_NAME
+        if not path.exists():
+            return None
+        try:
+            data = json.loads(path.read_text())
+            if data.pop("version", None) != FETCH_STATE_VERSION:
+                return None
+            return cls(**data)
+        except Exception as e:
+            logger.warning(f"Ignoring unreadable fetch state {path}: {e}")
+            return None
+
+    def save(self, output_dir: Path) -> None:
+        path = output_dir / FETCH_STATE_NAME
+        data = {"version": FETCH_STATE_VERSION, **dataclasses.asdict(self)}
+        tmp_path = path.with_suffix(".json.tmp")
+        tmp_path.write_text(json.dumps(data, indent=1, sort_keys=True))
+        tmp_path.replace(path)
+
+    def same_document(self, url: str, microversion: Optional[str]) -> bool:
+        """Whether ``url`` at ``microversion`` is the document fetched last time."""
+        return (
+            microversion is not None
+            and self.url == url
+            and self.microversion == microversion
+            and self.tool_version == tool_version()
+        )
+
+    def compare_subassemblies(self, cad: Any) -> Tuple[int, int, int]:
+        """Numbers of unchanged, changed and new subassembly definitions."""
+        unchanged = changed = new = 0
+        for key, microversion in subassembly_microversions(cad).items():
+            if key not in self.subassemblies:
+                new += 1
+            elif self.subassemblies[key] == microversion:
+                unchanged += 1
+            else:
+                changed += 1
+        return unchanged, changed, new
+
+
+@dataclass
+class PendingTranslation:
+    """A STEP translation whose result has not been saved yet.
+
+    ``microversion`` is None for versions and microversions, which never
+    change.
+    """
+
+    url: str
+    microversion: Optional[str]
+    translation_id: str
+
+    @classmethod
+    def load(cls, output_dir: Path) -> Optional["PendingTranslation"]:
+        path = output_dir / PENDING_TRANSLATION_NAME
+        if not path.exists():
+            return None
+        try:
+            return cls(**json.loads(path.read_text()))
+        except Exception as e:
+            logger.warning(f"Ignoring unreadable STEP translation record {path}: {e}")
+            return None
+
+    def save(self, output_dir: Path) -> None:
+        path = output_dir / PENDING_TRANSLATION_NAME
+        tmp_path = path.with_suffix(".json.tmp")
+        tmp_path.write_text(json.dumps(dataclasses.asdict(self), indent=1))
+        tmp_path.replace(path)
+
+    @staticmethod
+    def clear(output_dir: Path) -> None:
+        (output_dir / PENDING_TRANSLATION_NAME).unlink(missing_ok=True)
+
+    def matches(self, url: str, microversion: Optional[str]) -> bool:
+        """Whether this translation is of ``url`` at ``microversion``."""
+        return self.url == url and self.microversion == microversion
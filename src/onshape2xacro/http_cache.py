@@ -0,0 +1,127 @@
+"""Persistent cache of Onshape API responses.
+
+Document content is addressed by workspace (``w``), version (``v``) or
+microversion (``m``). Version and microversion responses never change, so
+they are stored under the user cache directory and reused forever. A
+workspace response is only valid for the workspace's current
+microversion, which is therefore part of its key: a fetch of an unchanged
+document costs one microversion lookup per workspace and no other request.
+"""
+
+import hashlib
+import os
+import re
+import threading
+import zlib
+from pathlib import Path
+from typing import Any, Optional, Tuple
+
+import requests
+from loguru import logger
+from requests.structures import CaseInsensitiveDict
+
+from onshape2xacro.cache import prune_lru, touch, user_cache_dir
+
+# Bump when the stored entry layout changes
+CACHE_VERSION = 1
+
+_DOCUMENT_PATH = re.compile(r"/d/([0-9a-fA-F]{24})/([wvm])/([0-9a-fA-F]{24})(?:/|$)")
+
+
+def document_address(path: str) -> Optional[Tuple[str, str, str]]:
+    """``(did, wvm, id)`` of a document content path, or None."""
+    match = _DOCUMENT_PATH.search(path)
+    return match.groups() if match else None  # type: ignore[return-value]
+
+
+class HttpCache:
+    """Size-bounded LRU store of successful JSON GET responses."""
+
+    def __init__(self, directory: Path, max_size_mb: float):
+        self.directory = directory
+        self.max_bytes = int(max_size_mb * 1024 * 1024)
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+
+    @classmethod
+    def open(cls, max_size_mb: float) -> Optional["HttpCache"]:
+        """The user-level cache, or None when ``max_size_mb`` disables it."""
+        if max_size_mb <= 0:
+            return None
+        directory = user_cache_dir("http")
+        try:
+            directory.mkdir(parents=True, exist_ok=True)
+        except OSError as e:
+            logger.warning(f"HTTP cache disabled: {e}")
+            return None
+        return cls(directory, max_size_mb)
+
+    @property
+    def hit_rate(self) -> float:
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+    def key(self, *parts: Any) -> str:
+        payload = "|".join(str(p) for p in (CACHE_VERSION, *parts))
+        return hashlib.sha1(payload.encode()).hexdigest()
+
+    def _path(self, key: str) -> Path:
+        return self.directory / f"{key}.bin"
+
+    def get(self, key: str, url: str = "") -> Optional[requests.Response]:
+        path = self._path(key)
+        try:
+            data = zlib.decompress(path.read_bytes())
+            content_type, body = data.split(b"\n", 1)
+        except FileNotFoundError:
+            with self._lock:
+                self.misses += 1
+            return None
+        except Exception as e:
+            logger.debug(f"Dropping unreadable HTTP cache entry {path}: {e}")
+            path.unlink(missing_ok=True)
+            with self._lock:
+                self.misses += 1
+            return None
+        touch(path)
+        with self._lock:
+            self.hits += 1
+
+        response = requests.Response()
+        response.status_code = 200
+        response.headers = CaseInsensitiveDict({"Content-Type": content_type.decode()})
+        response._content = body
+        response.encoding = "utf-8"
+        response.url = url
+        return response
+
+    def put(self, key: str, response: requests.Response) -> None:
+        content_type = response.headers.get("Content-Type", "")
+        tmp_path = self._path(key).with_suffix(
+            f".{os.getpid()}.{threading.get_ident()}.tmp"
+        )
+        try:
+            tmp_path.write_bytes(
+                zlib.compress(content_type.encode() + b"\n" + response.content)
+            )
+            tmp_path.replace(self._path(key))
+        except OSError as e:
+            logger.debug(f"Could not write HTTP cache entry: {e}")
+            tmp_path.unlink(missing_ok=True)
+
+    def prune(self) -> None:
+        """Evict the least recently used entries beyond the size limit."""
+        prune_lru(self.directory, self.max_bytes, "*.bin")
+
+    def summary(self) -> str:
+        return (
+            f"HTTP cache: {self.hits} hits, {self.misses} misses "
+            f"({self.hit_rate:.0%} hit rate)"
+        )
+
+
+def cacheable(response: requests.Response) -> bool:
+    return response.status_code == 200 and "json" in response.headers.get(
+        "Content-Type", ""
+    )
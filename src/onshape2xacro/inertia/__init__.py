@@ -3,8 +3,8 @@
 from .types import InertialProperties
 from .calculator import InertiaCalculator
 from .writer import InertiaConfigWriter
-from .bom import BOMParser, BOMEntry
-from .report import InertiaReport, PartWarning, PartDebugInfo
+from .bom import BOMParser, BOMEntry, BOMIndex
+from .report import InertiaReport, PartWarning, PartDebugInfo, MethodComparison
 
 __all__ = [
     "InertialProperties",
@@ -12,7 +12,9 @@ __all__ = [
     "InertiaConfigWriter",
     "BOMParser",
     "BOMEntry",
+    "BOMIndex",
     "InertiaReport",
     "PartWarning",
     "PartDebugInfo",
+    "MethodComparison",
 ]
@@ -0,0 +1,128 @@
+"""Batched inertia aggregation and validation.
+
+Per-part masses, centers of mass and 3x3 tensors are stacked into arrays so
+that placing parts in the link frame, the parallel-axis shift and the sum
+over parts are a handful of NumPy operations regardless of part count.
+"""
+
+from typing import List, Sequence, Tuple
+
+import numpy as np
+
+from .types import InertialProperties, MassProperties
+
+
+def stack_parts(
+    parts: Sequence[MassProperties],
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Volumes ``(n,)``, COMs ``(n, 3)`` and unit-density tensors ``(n, 3, 3)``."""
+    if not parts:
+        return np.zeros(0), np.zeros((0, 3)), np.zeros((0, 3, 3))
+    return (
+        np.array([p.volume for p in parts], dtype=float),
+        np.array([p.com for p in parts], dtype=float).reshape(-1, 3),
+        np.array([p.inertia for p in parts], dtype=float).reshape(-1, 3, 3),
+    )
+
+
+def place_parts(
+    coms: np.ndarray, inertias: np.ndarray, transforms: np.ndarray
+) -> Tuple[np.ndarray, np.ndarray]:
+    """Move COMs and tensors by rigid 4x4 ``transforms`` (one per part)."""
+    rotations = transforms[:, :3, :3]
+    placed_coms = np.einsum("nij,nj->ni", rotations, coms) + transforms[:, :3, 3]
+    placed_inertias = np.einsum("nij,njk,nlk->nil", rotations, inertias, rotations)
+    return placed_coms, placed_inertias
+
+
+def aggregate(
+    masses: np.ndarray, coms: np.ndarray, inertias: np.ndarray
+) -> Tuple[float, np.ndarray, np.ndarray]:
+    """Total mass, COM and tensor about that COM of rigidly joined parts.
+
+    ``inertias`` are each about their own part's COM; they are shifted to
+    the combined COM with the parallel-axis theorem and summed.
+    """
+    total = float(masses.sum())
+    if total <= 0:
+        return 0.0, np.zeros(3), np.zeros((3, 3))
+
+    com = masses @ coms / total
+    offsets = coms - com
+    shifts = masses[:, None, None] * (
+        np.einsum("ni,ni->n", offsets, offsets)[:, None, None] * np.eye(3)
+        - np.einsum("ni,nj->nij", offsets, offsets)
+    )
+    return total, com, (inertias + shifts).sum(axis=0)
+
+
+def to_inertial(
+    mass: float, com: np.ndarray, inertia: np.ndarray
+) -> InertialProperties:
+    return InertialProperties(
+        mass=mass,
+        com=(float(com[0]), float(com[1]), float(com[2])),
+        ixx=float(inertia[0, 0]),
+        iyy=float(inertia[1, 1]),
+        izz=float(inertia[2, 2]),
+        ixy=float(inertia[0, 1]),
+        ixz=float(inertia[0, 2]),
+        iyz=float(inertia[1, 2]),
+    )
+
+
+def tensor_of(props: InertialProperties) -> np.ndarray:
+    return np.array(
+        [
+            [props.ixx, props.ixy, props.ixz],
+            [props.ixy, props.iyy, props.iyz],
+            [props.ixz, props.iyz, props.izz],
+        ]
+    )
+
+
+def validate_tensors(tensors: np.ndarray) -> List[List[str]]:
+    """Physical-consistency warnings for each tensor in a ``(k, 3, 3)`` stack.
+
+    Checks positive diagonals, the triangle inequality between diagonal
+    moments and positive definiteness, all in one pass over the stack.
+    """
+    tensors = np.asarray(tensors, dtype=float).reshape(-1, 3, 3)
+    diagonal = np.diagonal(tensors, axis1=1, axis2=2)
+    non_positive = (diagonal <= 0).any(axis=1)
+    zero = (diagonal == 0).any(axis=1)
+    # (a, b, c) triples for a + b < c
+    triangles = [(0, 1, 2), (0, 2, 1), (1, 2, 0)]
+    violated = np.stack(
+        [diagonal[:, a] + diagonal[:, b] < diagonal[:, c] for a, b, c in triangles],
+        axis=1,
+    )
+    symmetric = (tensors + tensors.transpose(0, 2, 1)) / 2
+    smallest = np.linalg.eigvalsh(symmetric)[:, 0] if len(tensors) else np.zeros(0)
+    not_definite = ~non_positive & (smallest <= 0)
+    names = ("ixx", "iyy", "izz")
+
+    warnings: List[List[str]] = [[] for _ in range(len(tensors))]
+    flagged = non_positive | violated.any(axis=1) | not_definite
+    for k in np.flatnonzero(flagged):
+        ixx, iyy, izz = diagonal[k]
+        messages = warnings[k]
+        if non_positive[k]:
+            messages.append(
+                f"Invalid inertia: diagonal elements must be positive (ixx={ixx:.3e}, iyy={iyy:.3e}, izz={izz:.3e})"
+            )
+        if zero[k]:
+            messages.append(
+                "Warning: one or more diagonal inertia elements is exactly zero"
+            )
+        for (a, b, c), failed in zip(triangles, violated[k]):
+            if failed:
+                messages.append(
+                    f"Triangle inequality violated: {names[a]}+{names[b]} < {names[c]} "
+                    f"({diagonal[k, a]:.3e}+{diagonal[k, b]:.3e} < {diagonal[k, c]:.3e})"
+                )
+        if not_definite[k]:
+            messages.append(
+                f"Inertia tensor is not positive definite (smallest principal moment {smallest[k]:.3e})"
+            )
+    return warnings
@@ -1,10 +1,11 @@
 """BOM (Bill of Materials) parser for Onshape CSV export."""
 
+import bisect
 import csv
 import re
 from dataclasses import dataclass
 from pathlib import Path
-from typing import Dict, Optional
+from typing import Dict, Iterable, List, Optional, Set, Tuple, Union
 
 
 @dataclass
@@ -73,3 +74,205 @@ class BOMParser:
             return float(match.group(1))
 
         return None
+
+
+def normalize_name(name: str) -> str:
+    """Lowercase ``name`` and collapse punctuation to single underscores."""
+    s = name.lower()
+    s = s.replace("&", "_")
+    s = s.replace(".", "")
+    s = re.sub(r"[^a-z0-9]", "_", s)
+    s = re.sub(r"_+", "_", s)
+    s = s.strip("_")
+    return s
+
+
+class _SubstringAutomaton:
+    """Aho-Corasick automaton: every pattern occurring in a text, in one pass."""
+
+    def __init__(self, patterns: Iterable[Tuple[str, int]]):
+        # Trie nodes: goto edges, failure link, pattern ids ending here
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        self._out: List[List[int]] = [[]]
+        for pattern, pattern_id in patterns:
+            node = 0
+            for char in pattern:
+                nxt = self._goto[node].get(char)
+                if nxt is None:
+                    nxt = len(self._goto)
+                    self._goto[node][char] = nxt
+                    self._goto.append({})
+                    self._fail.append(0)
+                    self._out.append([])
+                node = nxt
+            self._out[node].append(pattern_id)
+
+        # Breadth-first failure links; outputs inherit their failure node's
+        queue = list(self._goto[0].values())
+        for node in queue:
+            for char, nxt in self._goto[node].items():
+                queue.append(nxt)
+                fail = self._fail[node]
+                while fail and char not in self._goto[fail]:
+                    fail = self._fail[fail]
+                target = self._goto[fail].get(char, 0)
+                self._fail[nxt] = target if target != nxt else 0
+                self._out[nxt] = self._out[nxt] + self._out[self._fail[nxt]]
+
+    def find(self, text: str) -> Set[int]:
+        """Ids of the patterns that occur in ``text``."""
+        found = set(self._out[0])
+        node = 0
+        for char in text:
+            while node and char not in self._goto[node]:
+                node = self._fail[node]
+            node = self._goto[node].get(char, 0)
+            found.update(self._out[node])
+        return found
+
+
+class BOMIndex:
+    """BOM entries indexed for repeated part and link lookups.
+
+    Normalized names, the exact-match tables and substring automata are
+    built once; lookups are memoized. Results are the same as scanning the
+    BOM in order: the first entry (in BOM order, or longest name first for
+    fuzzy part matches) that matches wins.
+    """
+
+    # Fuzzy part matches ignore normalized BOM names shorter than this
+    MIN_FUZZY_LENGTH = 3
+
+    def __init__(self, entries: Dict[str, BOMEntry]):
+        self.entries = entries
+        self.names = list(entries)
+        self._normalized = [normalize_name(n) for n in self.names]
+        self._first_normalized: Dict[str, int] = {}
+        for i, normalized in enumerate(self._normalized):
+            self._first_normalized.setdefault(normalized, i)
+
+        # Fuzzy part matches go longest name first (stable for ties)
+        order = sorted(range(len(self.names)), key=lambda i: -len(self.names[i]))
+        self._fuzzy_rank = {i: rank for rank, i in enumerate(order)}
+        fuzzy = [i for i in order if len(self._normalized[i]) >= self.MIN_FUZZY_LENGTH]
+        self._fuzzy_contained = _SubstringAutomaton(
+            (self._normalized[i], i) for i in fuzzy
+        )
+        # Names containing a query: one search over all of them
+        self._fuzzy_joined = "\0".join(self._normalized[i] for i in fuzzy)
+        self._fuzzy_starts = []
+        position = 0
+        for i in fuzzy:
+            self._fuzzy_starts.append((position, i))
+            position += len(self._normalized[i]) + 1
+
+        self._link_contained = _SubstringAutomaton(
+            (name.lower(), i) for i, name in enumerate(self.names)
+        )
+        self._link_matches: Dict[
+            str, Tuple[Optional[BOMEntry], str, Optional[str]]
+        ] = {}
+        self._part_matches: Dict[
+            str, Tuple[str, Optional[BOMEntry], str, Optional[str]]
+        ] = {}
+
+    @classmethod
+    def of(cls, entries: Union["BOMIndex", Dict[str, BOMEntry]]) -> "BOMIndex":
+        return entries if isinstance(entries, BOMIndex) else cls(entries)
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    def get(self, name: str) -> Optional[BOMEntry]:
+        return self.entries.get(name)
+
+    def match_link(
+        self, link_name: str
+    ) -> Tuple[Optional[BOMEntry], str, Optional[str]]:
+        """Link-level BOM entry, match type and matched BOM name."""
+        if link_name not in self._link_matches:
+            entry = self.entries.get(link_name)
+            if entry:
+                match = (entry, "exact", link_name)
+            else:
+                # Fuzzy match: first BOM name contained in the link name
+                found = self._link_contained.find(link_name.lower())
+                if found:
+                    name = self.names[min(found)]
+                    match = (self.entries[name], "fuzzy", name)
+                else:
+                    match = (None, "none", None)
+            self._link_matches[link_name] = match
+        return self._link_matches[link_name]
+
+    def match_part(
+        self, part_name_full: Optional[str], index: int
+    ) -> Tuple[str, Optional[BOMEntry], str, Optional[str]]:
+        """Part id, BOM entry, match type and matched BOM name of one part.
+
+        Parts without a name are identified as ``solid_<index>``.
+        """
+        part_id = self._part_id(part_name_full) if part_name_full else None
+        if not part_id:
+            return self._match_part_id(f"solid_{index}", part_name_full)
+        if part_name_full not in self._part_matches:
+            self._part_matches[part_name_full] = self._match_part_id(
+                part_id, part_name_full
+            )
+        return self._part_matches[part_name_full]
+
+    @staticmethod
+    def _part_id(part_name_full: str) -> str:
+        # Use part_name as the primary identifier (it contains the actual part name)
+        # Extract the leaf name from the full path (e.g., "sub-asm-base_1_square_base_plate_1" -> "square_base_plate")
+
+        # Remove instance suffix _\d+$
+        part_id = re.sub(r"_\d+$", "", part_name_full)
+        # Try to extract leaf name by removing parent prefix
+        tokens = part_id.split("_")
+        # Look for common assembly prefixes (tokens[0] might be "sub-asm-xxx")
+        if len(tokens) > 2 and (
+            tokens[0].startswith("sub") or tokens[0].startswith("asm")
+        ):
+            # Skip "sub-asm-xxx_1" prefix pattern
+            for j in range(len(tokens)):
+                if tokens[j].isdigit():
+                    part_id = (
+                        "_".join(tokens[j + 1 :]) if j + 1 < len(tokens) else part_id
+                    )
+                    break
+        return part_id
+
+    def _match_part_id(
+        self, part_id: str, part_name_full: Optional[str]
+    ) -> Tuple[str, Optional[BOMEntry], str, Optional[str]]:
+        entry = self.entries.get(part_id)
+        if entry:
+            return part_id, entry, "exact", part_id
+
+        i = self._first_normalized.get(normalize_name(part_id))
+        if i is not None:
+            return part_id, self.entries[self.names[i]], "exact", self.names[i]
+
+        if part_name_full:
+            # Fuzzy match: BOM names contained in the part name, or
+            # containing it; the longest name wins
+            normalized_full = normalize_name(part_name_full)
+            found = self._fuzzy_contained.find(normalized_full)
+            found.update(self._containing(normalized_full))
+            if found:
+                name = self.names[min(found, key=self._fuzzy_rank.__getitem__)]
+                return part_id, self.entries[name], "fuzzy", name
+
+        return part_id, None, "none", None
+
+    def _containing(self, query: str) -> Set[int]:
+        """Fuzzy-eligible BOM names whose normalized form contains ``query``."""
+        found: Set[int] = set()
+        position = self._fuzzy_joined.find(query)
+        while position != -1:
+            k = bisect.bisect_right(self._fuzzy_starts, (position, len(self.names))) - 1
+            found.add(self._fuzzy_starts[k][1])
+            position = self._fuzzy_joined.find(query, position + 1)
+        return found
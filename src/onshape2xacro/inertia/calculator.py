@@ -1,8 +1,7 @@
 """Compute mass properties from STEP geometry using CadQuery."""
 
 from pathlib import Path
-import re
-from typing import Dict, Optional, Tuple, TYPE_CHECKING
+from typing import Any, Dict, List, Optional, TYPE_CHECKING, Union
 import logging
 
 if TYPE_CHECKING:
@@ -10,11 +9,22 @@ if TYPE_CHECKING:
     from .report import InertiaReport
 
 import cadquery as cq
-
-from .types import InertialProperties
+import numpy as np
+
+from .aggregation import (
+    aggregate,
+    place_parts,
+    stack_parts,
+    tensor_of,
+    to_inertial,
+    validate_tensors,
+)
+from .bom import BOMIndex
+from .types import InertialProperties, MassProperties
 
 logger = logging.getLogger(__name__)
 
+
 # Material densities in kg/m³
 # Sources: MatWeb, manufacturer datasheets
 MATERIAL_DENSITIES = {
@@ -64,6 +74,65 @@ MATERIAL_DENSITIES = {
 }
 
 
+class MaterialResolver:
+    """Memoized material name -> density lookup.
+
+    ``densities`` (e.g. a user table) extend and override
+    :data:`MATERIAL_DENSITIES`. Names match exactly after lowercasing, then
+    by substring with longer table names first.
+    """
+
+    def __init__(
+        self,
+        default_density: float = 1000.0,
+        densities: Optional[Dict[str, float]] = None,
+    ):
+        self.default_density = default_density
+        self.densities = dict(MATERIAL_DENSITIES)
+        self.densities.update(
+            {name.lower().strip(): value for name, value in (densities or {}).items()}
+        )
+        self._by_length = sorted(self.densities, key=len, reverse=True)
+        self._resolved: Dict[str, float] = {}
+
+    def resolve(self, material: Optional[str]) -> Optional[float]:
+        """
+        Look up density for material name.
+
+        Returns None if material is None (triggers zero-mass path).
+        Returns default_density if material is unknown.
+        """
+        if material is None:
+            return None
+        if material not in self._resolved:
+            self._resolved[material] = self._lookup(material)
+        return self._resolved[material]
+
+    def _lookup(self, material: str) -> float:
+        # Normalize: lowercase, strip whitespace
+        key = material.lower().strip()
+
+        # Direct match
+        if key in self.densities:
+            return self.densities[key]
+
+        # Partial match (e.g., "Aluminum 6061" matches "aluminum")
+        # Prefer longer matches (e.g., "stainless steel" over "steel")
+        for mat_name in self._by_length:
+            if mat_name in key or key in mat_name:
+                density = self.densities[mat_name]
+                logger.info(
+                    f"Matched material '{material}' to '{mat_name}' (density={density} kg/m³)"
+                )
+                return density
+
+        # Unknown material - log warning, return default
+        logger.warning(
+            f"Unknown material '{material}', using default density {self.default_density} kg/m³"
+        )
+        return self.default_density
+
+
 class InertiaCalculator:
     """Computes mass and inertia properties from STEP geometry."""
 
@@ -71,6 +140,7 @@ class InertiaCalculator:
         self,
         default_density: float = 1000.0,
         mm_to_m: float = 0.001,
+        material_densities: Optional[Dict[str, float]] = None,
     ):
         """
         Initialize calculator.
@@ -78,9 +148,14 @@ class InertiaCalculator:
         Args:
             default_density: Default material density in kg/m³
             mm_to_m: Conversion factor from model units to meters
+            material_densities: Extra material densities in kg/m³, taking
+                precedence over the built-in table
         """
         self.default_density = default_density
         self.mm_to_m = mm_to_m
+        self.materials = MaterialResolver(default_density, material_densities)
+        # Unit-density properties per part prototype (by shape hash)
+        self._prototype_properties: Dict[int, MassProperties] = {}
 
     def compute_from_step(
         self,
@@ -156,118 +231,69 @@ class InertiaCalculator:
         )
 
     def _get_density(self, material: Optional[str]) -> Optional[float]:
-        """
-        Look up density for material name.
+        """Density of ``material`` (None if unassigned, default if unknown)."""
+        return self.materials.resolve(material)
 
-        Returns None if material is None (triggers zero-mass path).
-        Returns default_density if material is unknown.
-        """
-        if material is None:
-            return None
-
-        # Normalize: lowercase, strip whitespace
-        key = material.lower().strip()
-
-        # Direct match
-        if key in MATERIAL_DENSITIES:
-            return MATERIAL_DENSITIES[key]
-
-        # Partial match (e.g., "Aluminum 6061" matches "aluminum")
-        # Prefer longer matches (e.g., "stainless steel" over "steel")
-        for mat_name in sorted(MATERIAL_DENSITIES.keys(), key=len, reverse=True):
-            density = MATERIAL_DENSITIES[mat_name]
-            if mat_name in key or key in mat_name:
-                logger.info(
-                    f"Matched material '{material}' to '{mat_name}' (density={density} kg/m³)"
-                )
-                return density
+    def _solid_mass_properties(self, solid) -> MassProperties:
+        """Integrate a solid once, for unit density."""
+        volume_mm3 = solid.Volume()
+        if volume_mm3 <= 0:
+            return MassProperties(volume_mm3, np.zeros(3), np.zeros((3, 3)))
 
-        # Unknown material - log warning, return default
-        logger.warning(
-            f"Unknown material '{material}', using default density {self.default_density} kg/m³"
+        com_vec = solid.centerOfMass(solid)
+        return MassProperties(
+            volume=volume_mm3,
+            com=np.array([com_vec.x, com_vec.y, com_vec.z]),
+            inertia=np.array(solid.matrixOfInertia(solid), dtype=float),
         )
-        return self.default_density
 
-    def _compute_solid_properties(self, solid, density: float) -> InertialProperties:
-        """Compute properties for a single solid with given density."""
-        volume_mm3 = solid.Volume()
-        volume_m3 = volume_mm3 * (self.mm_to_m**3)
-        mass = volume_m3 * density
+    def prototype_properties(self, shape: Any) -> MassProperties:
+        """Unit-density properties of a part prototype in its own frame.
 
+        Computed once per prototype; instances are placed by the
+        ``transforms`` given to :meth:`compute_from_parts_with_bom`.
+        """
+        key = hash(shape)
+        if key not in self._prototype_properties:
+            self._prototype_properties[key] = self._solid_mass_properties(
+                cq.Shape.cast(shape)
+            )
+        return self._prototype_properties[key]
+
+    def _scale_properties(
+        self, unit: MassProperties, density: float
+    ) -> InertialProperties:
+        """Physical properties (SI units) of a solid with the given density."""
+        mass = unit.volume * (self.mm_to_m**3) * density
         if mass <= 0:
             return InertialProperties(
                 mass=0.0, com=(0.0, 0.0, 0.0), ixx=0.0, iyy=0.0, izz=0.0
             )
 
-        com_vec = solid.centerOfMass(solid)
-        com = (
-            com_vec.x * self.mm_to_m,
-            com_vec.y * self.mm_to_m,
-            com_vec.z * self.mm_to_m,
-        )
-
-        inertia_matrix = solid.matrixOfInertia(solid)
-        scale = (self.mm_to_m**5) * density
-
+        com = tuple(float(c) * self.mm_to_m for c in unit.com)
+        inertia = unit.inertia * ((self.mm_to_m**5) * density)
         return InertialProperties(
             mass=mass,
             com=com,
-            ixx=inertia_matrix[0][0] * scale,
-            iyy=inertia_matrix[1][1] * scale,
-            izz=inertia_matrix[2][2] * scale,
-            ixy=inertia_matrix[0][1] * scale,
-            ixz=inertia_matrix[0][2] * scale,
-            iyz=inertia_matrix[1][2] * scale,
-        )
-
-    def _apply_parallel_axis_theorem(
-        self, props: InertialProperties, link_com: Tuple[float, float, float]
-    ) -> InertialProperties:
-        """
-        Apply parallel axis theorem to shift inertia from part COM to link COM.
-
-        Args:
-            props: Inertial properties about the part's own COM
-            link_com: Center of mass of the combined link (x, y, z) in meters
-
-        Returns:
-            New InertialProperties with inertia shifted to link COM
-        """
-        dx = props.com[0] - link_com[0]
-        dy = props.com[1] - link_com[1]
-        dz = props.com[2] - link_com[2]
-
-        m = props.mass
-
-        ixx_shifted = props.ixx + m * (dy * dy + dz * dz)
-        iyy_shifted = props.iyy + m * (dx * dx + dz * dz)
-        izz_shifted = props.izz + m * (dx * dx + dy * dy)
-        ixy_shifted = props.ixy - m * dx * dy
-        ixz_shifted = props.ixz - m * dx * dz
-        iyz_shifted = props.iyz - m * dy * dz
-
-        return InertialProperties(
-            mass=props.mass,
-            com=props.com,
-            ixx=ixx_shifted,
-            iyy=iyy_shifted,
-            izz=izz_shifted,
-            ixy=ixy_shifted,
-            ixz=ixz_shifted,
-            iyz=iyz_shifted,
+            ixx=float(inertia[0, 0]),
+            iyy=float(inertia[1, 1]),
+            izz=float(inertia[2, 2]),
+            ixy=float(inertia[0, 1]),
+            ixz=float(inertia[0, 2]),
+            iyz=float(inertia[1, 2]),
         )
 
     def _compute_with_known_mass(self, solid, known_mass: float) -> InertialProperties:
         """Compute properties when mass is known from BOM."""
-        volume_mm3 = solid.Volume()
-        volume_m3 = volume_mm3 * (self.mm_to_m**3)
+        unit = self._solid_mass_properties(solid)
+        volume_m3 = unit.volume * (self.mm_to_m**3)
 
         if volume_m3 > 0:
             effective_density = known_mass / volume_m3
         else:
             effective_density = self.default_density
 
-        return self._compute_solid_properties(solid, effective_density)
+        return self._scale_properties(unit, effective_density)
 
     def _validate_inertia(self, props: InertialProperties) -> list[str]:
         """
@@ -279,32 +305,46 @@ class InertiaCalculator:
         Returns:
             List of warning messages (empty if valid)
         """
-        warnings = []
+        return validate_tensors(tensor_of(props)[None])[0]
 
-        if props.ixx <= 0 or props.iyy <= 0 or props.izz <= 0:
-            warnings.append(
-                f"Invalid inertia: diagonal elements must be positive (ixx={props.ixx:.3e}, iyy={props.iyy:.3e}, izz={props.izz:.3e})"
-            )
+    def validate_links(self, report: "InertiaReport", link_names: List[str]) -> None:
+        """Validate the tensors of several links in one batch.
 
-        if props.ixx == 0 or props.iyy == 0 or props.izz == 0:
-            warnings.append(
-                "Warning: one or more diagonal inertia elements is exactly zero"
-            )
+        Warnings are added to ``report`` as ``link_total`` entries, in the
+        order of ``link_names``.
+        """
+        names = [n for n in link_names if n in report.link_properties]
+        if not names:
+            return
+        tensors = np.stack([tensor_of(report.link_properties[n]) for n in names])
+        for link_name, warnings in zip(names, validate_tensors(tensors)):
+            for warning in warnings:
+                report.add_warning(link_name, "link_total", warning)
+
+    def bom_subset(
+        self,
+        bom_entries: Union[Dict[str, "BOMEntry"], BOMIndex],
+        link_name: str,
+        part_count: int,
+        part_metadata: list[Dict[str, str]] | None = None,
+    ) -> Dict[str, "BOMEntry"]:
+        """The BOM entries a link's parts resolve to, in BOM order.
 
-        if props.ixx + props.iyy < props.izz:
-            warnings.append(
-                f"Triangle inequality violated: ixx+iyy < izz ({props.ixx:.3e}+{props.iyy:.3e} < {props.izz:.3e})"
-            )
-        if props.ixx + props.izz < props.iyy:
-            warnings.append(
-                f"Triangle inequality violated: ixx+izz < iyy ({props.ixx:.3e}+{props.izz:.3e} < {props.iyy:.3e})"
-            )
-        if props.iyy + props.izz < props.ixx:
-            warnings.append(
-                f"Triangle inequality violated: iyy+izz < ixx ({props.iyy:.3e}+{props.izz:.3e} < {props.ixx:.3e})"
+        Matching takes the first candidate in a fixed order, so the link
+        resolves to the same entries against this subset as against the
+        full BOM.
+        """
+        bom = BOMIndex.of(bom_entries)
+        names = set()
+        _, _, name = bom.match_link(link_name)
+        names.add(name)
+        for i in range(part_count):
+            part_meta = (
+                part_metadata[i] if part_metadata and i < len(part_metadata) else None
             )
-
-        return warnings
+            part_name_full = part_meta.get("part_name") if part_meta else None
+            names.add(bom.match_part(part_name_full, i)[3])
+        return {k: v for k, v in bom.entries.items() if k in names}
 
     def compute_from_step_with_bom(
         self,
@@ -348,137 +388,92 @@ class InertiaCalculator:
                 mass=0.0, com=(0.0, 0.0, 0.0), ixx=0.0, iyy=0.0, izz=0.0
             )
 
-        # Aggregate properties
-        total_mass = 0.0
-        weighted_com = [0.0, 0.0, 0.0]
-        total_ixx = 0.0
-        total_iyy = 0.0
-        total_izz = 0.0
-        total_ixy = 0.0
-        total_ixz = 0.0
-        total_iyz = 0.0
+        return self.compute_from_parts_with_bom(
+            [self._solid_mass_properties(solid) for solid in solids],
+            bom_entries,
+            link_name,
+            report,
+            part_metadata=part_metadata,
+        )
+
+    def compute_from_parts_with_bom(
+        self,
+        parts: List[MassProperties],
+        bom_entries: Union[Dict[str, "BOMEntry"], BOMIndex],
+        link_name: str,
+        report: "InertiaReport",
+        part_metadata: list[Dict[str, str]] | None = None,
+        transforms: Optional[np.ndarray] = None,
+        validate: bool = True,
+        onshape_densities: Optional[List[Optional[float]]] = None,
+    ) -> InertialProperties:
+        """
+        Aggregate link inertial properties from per-part mass properties.
+
+        Same BOM priorities as :meth:`compute_from_step_with_bom`, without
+        re-integrating any geometry: each part's unit-density properties
+        are scaled by its density. Placement, scaling and the parallel-axis
+        sum run as batched NumPy operations over all parts.
+
+        Args:
+            parts: Unit-density properties of each part (mm)
+            bom_entries: Dict of part_name -> BOMEntry from BOM CSV, or a
+                BOMIndex of it to share between links
+            link_name: Name of this link (for warnings)
+            report: InertiaReport to collect warnings
+            part_metadata: Optional list of dicts with part_id and part_name for each part
+            transforms: Optional (n, 4, 4) rigid transforms (mm) placing each
+                part in the link frame; without them parts are already there
+            validate: Check the link tensor now; pass False to validate many
+                links at once later with :meth:`validate_links`
+            onshape_densities: Optional per-part densities (kg/m³) of parts
+                whose properties come from Onshape (None for the others);
+                these replace BOM material and default densities, but a BOM
+                mass still takes priority
+
+        Returns:
+            Aggregated InertialProperties for the link
+        """
+        if not parts:
+            return InertialProperties(
+                mass=0.0, com=(0.0, 0.0, 0.0), ixx=0.0, iyy=0.0, izz=0.0
+            )
 
         from .report import PartDebugInfo
 
         part_debug_infos = []
 
         # Match BOM entry ONCE per link (not per solid)
-        bom_entry = bom_entries.get(link_name)
-        match_type = "none"
-        bom_match_name = None
+        bom = BOMIndex.of(bom_entries)
+        bom_entry, match_type, bom_match_name = bom.match_link(link_name)
 
-        if bom_entry:
-            match_type = "exact"
-            bom_match_name = link_name
-        else:
-            # Fuzzy match: find BOM entry name in link name
-            for bom_name in bom_entries:
-                if bom_name.lower() in link_name.lower():
-                    bom_entry = bom_entries[bom_name]
-                    match_type = "fuzzy"
-                    bom_match_name = bom_name
-                    break
-
-        # First pass: compute properties using density for all solids
-        # This gives us the relative mass distribution
+        # First pass: resolve each part's density from the BOM
         solid_props_list = []
-        for i, solid in enumerate(solids):
-            volume_mm3 = solid.Volume()
+        densities = np.empty(len(parts))
+        for i, part in enumerate(parts):
+            volume_mm3 = part.volume
             volume_cm3 = volume_mm3 / 1000.0
 
             # Get part metadata if available
             part_meta = (
                 part_metadata[i] if part_metadata and i < len(part_metadata) else None
             )
-            part_meta.get("part_id") if part_meta else None
             part_name_full = part_meta.get("part_name") if part_meta else None
             mesh_match = part_meta.get("mesh_match") if part_meta else None
 
-            # Use part_name as the primary identifier (it contains the actual part name)
-            # Extract the leaf name from the full path (e.g., "sub-asm-base_1_square_base_plate_1" -> "square_base_plate")
-
-            part_id = None
-            if part_name_full:
-                # Remove instance suffix _\d+$
-                part_id = re.sub(r"_\d+$", "", part_name_full)
-                # Try to extract leaf name by removing parent prefix
-                parts = part_id.split("_")
-                # Look for common assembly prefixes (parts[0] might be "sub-asm-xxx")
-                if len(parts) > 2 and (
-                    parts[0].startswith("sub") or parts[0].startswith("asm")
-                ):
-                    # Skip "sub-asm-xxx_1" prefix pattern
-                    for j in range(len(parts)):
-                        if parts[j].isdigit():
-                            part_id = (
-                                "_".join(parts[j + 1 :])
-                                if j + 1 < len(parts)
-                                else part_id
-                            )
-                            break
-
-            if not part_id:
-                part_id = f"solid_{i}"
-
-            part_bom_entry = None
-            part_match_type = "none"
-            part_bom_match_name = None
-
-            def normalize_name(name: str) -> str:
-                s = name.lower()
-                s = s.replace("&", "_")
-                s = s.replace(".", "")
-                s = re.sub(r"[^a-z0-9]", "_", s)
-                s = re.sub(r"_+", "_", s)
-                s = s.strip("_")
-                return s
-
-            part_bom_entry = bom_entries.get(part_id)
-            if part_bom_entry:
-                part_match_type = "exact"
-                part_bom_match_name = part_id
-
-            if not part_bom_entry and part_id:
-                normalized_part = normalize_name(part_id)
-                for bom_name in bom_entries:
-                    if normalize_name(bom_name) == normalized_part:
-                        part_bom_entry = bom_entries[bom_name]
-                        part_match_type = "exact"
-                        part_bom_match_name = bom_name
-                        break
-
-            if not part_bom_entry and part_name_full:
-                # Try fuzzy match
-                normalized_full = normalize_name(part_name_full)
-                # Sort BOM entries by length (descending) to match longest names first
-                # This prevents "screw M4" from matching "screw M4x10" if both exist (though unlikely with normalize)
-                # But more importantly, avoids short random matches
-                sorted_bom_names = sorted(bom_entries.keys(), key=len, reverse=True)
-
-                for bom_name in sorted_bom_names:
-                    normalized_bom = normalize_name(bom_name)
-                    # Skip very short matches to avoid false positives (e.g. "a", "b", "no")
-                    # But allow "4310", "J1_A" (length 4)
-                    if len(normalized_bom) < 3:
-                        continue
-
-                    if (
-                        normalized_bom in normalized_full
-                        or normalized_full in normalized_bom
-                    ):
-                        part_bom_entry = bom_entries[bom_name]
-                        part_match_type = "fuzzy"
-                        part_bom_match_name = bom_name
-                        break
-                    if part_bom_entry:
-                        break
-                    if part_bom_entry:
-                        break
+            part_id, part_bom_entry, part_match_type, part_bom_match_name = (
+                bom.match_part(part_name_full, i)
+            )
 
             # Determine which density to use (prefer part-specific BOM, fallback to link-level)
             # CRITICAL FIX: Do NOT use bom_entry (link-level) as fallback for mass calculation.
             # If a screw is unmatched, it should NOT inherit the mass of the entire base plate.
             effective_bom = part_bom_entry
+            onshape_density = (
+                onshape_densities[i]
+                if onshape_densities and i < len(onshape_densities)
+                else None
+            )
 
             # Priority 1: If BOM has mass, use mass/volume to get effective density
             if effective_bom and effective_bom.has_mass:
@@ -492,6 +487,10 @@ class InertiaCalculator:
                     # Volume is zero - this shouldn't happen but handle gracefully
                     density = self.default_density
                     material = None
+            # Onshape mass properties already carry the part's material
+            elif onshape_density is not None:
+                material = None
+                density = onshape_density
             # Priority 2: If BOM has material (but no mass), use material density
             elif effective_bom and effective_bom.has_material:
                 material = effective_bom.material
@@ -509,10 +508,9 @@ class InertiaCalculator:
                 material = None
                 density = self.default_density
 
-            props = self._compute_solid_properties(solid, density)
+            densities[i] = density
             solid_props_list.append(
                 (
-                    props,
                     volume_cm3,
                     material,
                     part_id,
@@ -524,8 +522,21 @@ class InertiaCalculator:
                 )
             )
 
+        # Batched: place, scale by density and aggregate every part at once
+        volumes, coms, inertias = stack_parts(parts)
+        if transforms is not None:
+            coms, inertias = place_parts(coms, inertias, np.asarray(transforms))
+        masses = volumes * (self.mm_to_m**3) * densities
+        # Empty or inverted solids contribute nothing
+        valid = masses > 0
+        masses = np.where(valid, masses, 0.0)
+        coms = coms * self.mm_to_m
+        inertias = (
+            inertias
+            * np.where(valid, (self.mm_to_m**5) * densities, 0.0)[:, None, None]
+        )
+
         for i, (
-            props,
             volume_cm3,
             material,
             part_id,
@@ -546,6 +557,8 @@ class InertiaCalculator:
 
             if part_bom_entry and part_bom_entry.has_mass:
                 mass_source = "BOM Mass"
+            elif onshape_densities and onshape_densities[i] is not None:
+                mass_source = "Onshape"
             elif part_bom_entry and part_bom_entry.has_material:
                 mass_source = "Material Density"
                 if self._get_density(material) is None:
@@ -563,8 +576,6 @@ class InertiaCalculator:
                         "Part not found in BOM, using default density",
                     )
 
-            final_props = props
-
             debug_info = PartDebugInfo(
                 part_id=part_id,
                 bom_match=part_bom_match_name or bom_match_name,
@@ -572,89 +583,20 @@ class InertiaCalculator:
                 mass_source=mass_source,
                 material=material,
                 volume_cm3=volume_cm3,
-                mass_kg=final_props.mass,
-                ixx=final_props.ixx,
-                iyy=final_props.iyy,
-                izz=final_props.izz,
+                mass_kg=float(masses[i]),
+                ixx=float(inertias[i, 0, 0]),
+                iyy=float(inertias[i, 1, 1]),
+                izz=float(inertias[i, 2, 2]),
                 mesh_match=mesh_match,
                 warnings=part_warnings,
             )
             part_debug_infos.append(debug_info)
 
-            total_mass += final_props.mass
-            if final_props.mass > 0:
-                for j in range(3):
-                    weighted_com[j] += final_props.com[j] * final_props.mass
-
         report.add_link_parts(link_name, part_debug_infos)
 
-        if total_mass > 0:
-            com = tuple(c / total_mass for c in weighted_com)
-        else:
-            com = (0.0, 0.0, 0.0)
-
-        total_ixx = 0.0
-        total_iyy = 0.0
-        total_izz = 0.0
-        total_ixy = 0.0
-        total_ixz = 0.0
-        total_iyz = 0.0
-
-        for i, (
-            props,
-            volume_cm3,
-            material,
-            part_id,
-            part_name,
-            part_bom_entry,
-            part_match_type,
-            part_bom_match_name,
-            mesh_match,
-        ) in enumerate(solid_props_list):
-            if part_bom_entry and part_bom_entry.has_mass:
-                volume_m3 = volume_cm3 * 1e-6
-                if volume_m3 > 0:
-                    effective_density = part_bom_entry.mass_kg / volume_m3
-                else:
-                    effective_density = self.default_density
-
-                final_props = self._compute_solid_properties(
-                    solids[i], effective_density
-                )
-            elif part_bom_entry and part_bom_entry.has_material:
-                # Recalculate using material density (in case it wasn't used in pass 1)
-                mat_density = (
-                    self._get_density(part_bom_entry.material) or self.default_density
-                )
-                final_props = self._compute_solid_properties(solids[i], mat_density)
-            else:
-                # If no specific part match, we MUST NOT use the link-level 'effective_bom'
-                # because that assigns the mass of the entire assembly to each unmatched screw.
-                # Just use default density or whatever was computed in pass 1 (which used default if no part match)
-                final_props = props
-
-            shifted_props = self._apply_parallel_axis_theorem(final_props, com)
-
-            total_ixx += shifted_props.ixx
-            total_iyy += shifted_props.iyy
-            total_izz += shifted_props.izz
-            total_ixy += shifted_props.ixy
-            total_ixz += shifted_props.ixz
-            total_iyz += shifted_props.iyz
-
-        final_props = InertialProperties(
-            mass=total_mass,
-            com=com,
-            ixx=total_ixx,
-            iyy=total_iyy,
-            izz=total_izz,
-            ixy=total_ixy,
-            ixz=total_ixz,
-            iyz=total_iyz,
-        )
-
-        validation_warnings = self._validate_inertia(final_props)
-        for warning in validation_warnings:
-            report.add_warning(link_name, "link_total", warning)
+        final_props = to_inertial(*aggregate(masses, coms, inertias))
+        if validate:
+            for warning in self._validate_inertia(final_props):
+                report.add_warning(link_name, "link_total", warning)
 
         return final_props
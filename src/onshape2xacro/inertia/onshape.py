@@ -0,0 +1,45 @@
+"""Mass properties computed by Onshape.
+
+``fetch-cad --mass-properties`` stores each part's Onshape mass properties
+(SI units, part coordinates, tensor about the centroid) on the pickled CAD
+parts. They already include the material assigned in Onshape, so a link's
+inertia can be aggregated from them without integrating any geometry.
+"""
+
+from typing import Any, Optional, Tuple
+
+import numpy as np
+
+from .types import MassProperties
+
+
+def onshape_mass_properties(part: Any) -> Optional[Tuple[MassProperties, float]]:
+    """Onshape's properties of ``part`` as unit-density properties and a density.
+
+    The unit-density form (mm, like prototype shapes) lets these parts go
+    through the same placement and BOM handling as integrated ones: the
+    density (kg/m³) reproduces Onshape's mass. Returns None when the part
+    has no usable Onshape data (not fetched, or no material assigned).
+    """
+    props = getattr(part, "MassProperty", None)
+    if props is None:
+        return None
+    try:
+        mass = float(props.mass[0])
+        volume = float(props.volume[0])  # m³
+        com = np.asarray(props.centroid[:3], dtype=float)  # m
+        inertia = np.asarray(props.inertia[:9], dtype=float).reshape(3, 3)
+    except (AttributeError, IndexError, TypeError, ValueError):
+        return None
+    if mass <= 0 or volume <= 0 or not np.isfinite(inertia).all():
+        return None
+
+    density = mass / volume
+    return (
+        MassProperties(
+            volume=volume * 1e9,
+            com=com * 1000.0,
+            inertia=inertia / density * 1e15,
+        ),
+        density,
+    )
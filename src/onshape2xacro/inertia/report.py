@@ -4,8 +4,10 @@ from dataclasses import dataclass, field
 from typing import Dict, List, Optional
 from pathlib import Path
 
+import numpy as np
 from loguru import logger
 
+from .aggregation import tensor_of
 from .types import InertialProperties
 
 
@@ -36,6 +38,31 @@ class PartDebugInfo:
     warnings: List[str] = field(default_factory=list)
 
 
+@dataclass
+class MethodComparison:
+    """Mesh-based or Onshape link inertia measured against the exact B-rep result."""
+
+    mass_error: float  # relative
+    com_error_mm: float
+    inertia_error: float  # relative, Frobenius norm of the tensor difference
+
+    @classmethod
+    def between(
+        cls, exact: InertialProperties, mesh: InertialProperties
+    ) -> "MethodComparison":
+        exact_tensor = tensor_of(exact)
+        scale = np.linalg.norm(exact_tensor)
+        return cls(
+            mass_error=abs(mesh.mass - exact.mass) / exact.mass if exact.mass else 0.0,
+            com_error_mm=float(
+                np.linalg.norm(np.subtract(mesh.com, exact.com)) * 1000.0
+            ),
+            inertia_error=float(np.linalg.norm(tensor_of(mesh) - exact_tensor) / scale)
+            if scale
+            else 0.0,
+        )
+
+
 @dataclass
 class InertiaReport:
     """Report collecting inertia results and warnings."""
@@ -43,6 +70,7 @@ class InertiaReport:
     link_properties: Dict[str, InertialProperties] = field(default_factory=dict)
     warnings: List[PartWarning] = field(default_factory=list)
     link_parts: Dict[str, List[PartDebugInfo]] = field(default_factory=dict)
+    comparisons: Dict[str, MethodComparison] = field(default_factory=dict)
 
     def add_warning(self, link_name: str, part_name: str, message: str) -> None:
         """Add a warning for a part."""
@@ -84,6 +112,32 @@ class InertiaReport:
             logger.warning(summary)
         else:
             logger.info(summary)
+        if self.comparisons:
+            worst = max(
+                self.comparisons, key=lambda name: self.comparisons[name].inertia_error
+            )
+            c = self.comparisons[worst]
+            logger.info(
+                f"Inertia error against exact over {len(self.comparisons)} links: worst is "
+                f"{worst} (mass {c.mass_error:.2%}, COM {c.com_error_mm:.3f} mm, "
+                f"inertia {c.inertia_error:.2%})"
+            )
+
+    def generate_comparison_table(self) -> str:
+        """Markdown table of per-link errors against the exact method."""
+        lines = [
+            "## Inertia Method Comparison\n",
+            "Relative error of the mesh-based or Onshape method against exact B-rep integration.\n",
+            "| Link | Mass Error | COM Offset (mm) | Inertia Error |",
+            "|------|------------|-----------------|---------------|",
+        ]
+        for link_name in sorted(self.comparisons):
+            c = self.comparisons[link_name]
+            lines.append(
+                f"| {link_name} | {c.mass_error:.3%} | {c.com_error_mm:.3f} | "
+                f"{c.inertia_error:.3%} |"
+            )
+        return "\n".join(lines)
 
     def generate_debug_table(self) -> str:
         """Generate markdown table of parts breakdown per link."""
@@ -136,6 +190,9 @@ class InertiaReport:
 
             lines.append("\n---\n")
 
+        if self.comparisons:
+            lines.append(self.generate_comparison_table())
+
         return "\n".join(lines)
 
     def save_debug_table(self, output_path: Path) -> None:
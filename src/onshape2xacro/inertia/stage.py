@@ -0,0 +1,238 @@
+"""Link inertia as a stage of its own, optionally on a process pool.
+
+The exporter collects one :class:`LinkInertiaTask` per link while it builds
+meshes, then computes them all at once. Tasks are self-contained (prototype
+shapes, their tessellations, placements, part metadata and the BOM entries
+the link resolves to), so a worker needs nothing else from the export.
+Results come back in task order and are merged in that order, which keeps
+the report independent of the number of workers.
+"""
+
+import hashlib
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from io import BytesIO
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+from loguru import logger
+from OCP.BinTools import BinTools, BinTools_FormatVersion_CURRENT
+from OCP.TopoDS import TopoDS_Shape
+
+from .bom import BOMEntry
+from .calculator import InertiaCalculator
+from .mesh import mesh_mass_properties
+from .report import InertiaReport, MethodComparison, PartDebugInfo, PartWarning
+from .types import InertialProperties, MassProperties
+
+# Exact properties of deserialized prototypes, per worker process
+_BREP_PROPERTIES: Dict[str, MassProperties] = {}
+
+
+def serialize_shape(shape: Any) -> bytes:
+    """Binary B-rep of ``shape`` without its triangulation."""
+    stream = BytesIO()
+    BinTools.Write_s(shape, stream, False, False, BinTools_FormatVersion_CURRENT)
+    return stream.getvalue()
+
+
+def deserialize_shape(data: bytes) -> TopoDS_Shape:
+    shape = TopoDS_Shape()
+    BinTools.Read_s(shape, BytesIO(data))
+    return shape
+
+
+@dataclass
+class LinkInertiaTask:
+    """Everything needed to compute one link's inertia.
+
+    ``shapes`` and ``meshes`` hold the link's distinct prototypes (shapes
+    in memory, or serialized with :func:`serialize_shape` for a worker);
+    ``prototype_index`` maps each part to its prototype and ``transforms``
+    place the parts in the link frame (mm). ``onshape`` holds each part's
+    Onshape properties from :func:`onshape_mass_properties`, if any; with
+    the ``"onshape"`` method only prototypes of parts without them need a
+    shape, the others may be None.
+    """
+
+    link_name: str
+    prototype_index: List[int]
+    transforms: np.ndarray
+    part_metadata: List[Dict[str, Any]]
+    bom_entries: Dict[str, BOMEntry]
+    method: str = "exact"
+    compare: bool = False
+    default_density: float = 1000.0
+    material_densities: Optional[Dict[str, float]] = None
+    shapes: List[Any] = field(default_factory=list)
+    meshes: List[Tuple[np.ndarray, np.ndarray]] = field(default_factory=list)
+    onshape: List[Optional[Tuple[MassProperties, float]]] = field(default_factory=list)
+
+    def serialized(self) -> "LinkInertiaTask":
+        """A copy with the prototype shapes serialized for another process."""
+        shapes = [
+            s if s is None or isinstance(s, bytes) else serialize_shape(s)
+            for s in self.shapes
+        ]
+        return LinkInertiaTask(**{**self.__dict__, "shapes": shapes})
+
+
+@dataclass
+class LinkInertiaResult:
+    """A link's inertia, debug rows and warnings, or the error that stopped it."""
+
+    link_name: str
+    properties: Optional[InertialProperties] = None
+    parts: List[PartDebugInfo] = field(default_factory=list)
+    warnings: List[PartWarning] = field(default_factory=list)
+    comparison: Optional[MethodComparison] = None
+    error: Optional[str] = None
+
+
+def _exact_properties(shape: Any, calc: InertiaCalculator) -> MassProperties:
+    if not isinstance(shape, bytes):
+        return calc.prototype_properties(shape)
+    key = hashlib.sha1(shape).hexdigest()
+    if key not in _BREP_PROPERTIES:
+        _BREP_PROPERTIES[key] = calc.prototype_properties(deserialize_shape(shape))
+    return _BREP_PROPERTIES[key]
+
+
+def _link_properties(
+    task: LinkInertiaTask,
+    method: str,
+    calc: InertiaCalculator,
+    report: InertiaReport,
+) -> InertialProperties:
+    onshape = task.onshape if method == "onshape" else []
+    if method == "mesh":
+        prototypes = [mesh_mass_properties(*m) for m in task.meshes]
+    else:
+        # Only prototypes of parts Onshape has no properties for are integrated
+        needed = {
+            k
+            for i, k in enumerate(task.prototype_index)
+            if i >= len(onshape) or onshape[i] is None
+        }
+        prototypes = [
+            _exact_properties(s, calc) if k in needed else None
+            for k, s in enumerate(task.shapes)
+        ]
+    parts = [prototypes[k] for k in task.prototype_index]
+    for i, known in enumerate(onshape):
+        if known is not None:
+            parts[i] = known[0]
+    # Instances are moved into the link frame in one batch
+    return calc.compute_from_parts_with_bom(
+        parts,
+        task.bom_entries,
+        task.link_name,
+        report,
+        part_metadata=task.part_metadata,
+        transforms=task.transforms,
+        validate=False,
+        onshape_densities=[None if known is None else known[1] for known in onshape]
+        or None,
+    )
+
+
+def compute_link_inertia(
+    task: LinkInertiaTask, calc: Optional[InertiaCalculator] = None
+) -> LinkInertiaResult:
+    """Compute one task; with ``compare``, also the other method's error.
+
+    The exact method is compared with the mesh method, the others with
+    the exact one.
+    """
+    if calc is None:
+        calc = InertiaCalculator(
+            default_density=task.default_density,
+            material_densities=task.material_densities,
+        )
+    report = InertiaReport()
+    result = LinkInertiaResult(task.link_name)
+    try:
+        result.properties = _link_properties(task, task.method, calc, report)
+    except Exception as e:
+        result.error = str(e)
+        return result
+    result.parts = report.link_parts.get(task.link_name, [])
+    result.warnings = report.warnings
+
+    if result.properties and task.compare:
+        other = "mesh" if task.method == "exact" else "exact"
+        try:
+            # Scratch report: warnings and debug rows stay those of the
+            # selected method
+            other_props = _link_properties(task, other, calc, InertiaReport())
+        except Exception as e:
+            logger.warning(
+                f"Failed to compute {other} inertia of {task.link_name} "
+                f"for comparison: {e}"
+            )
+            other_props = None
+        if other_props:
+            exact, mesh = (
+                (result.properties, other_props)
+                if task.method == "exact"
+                else (other_props, result.properties)
+            )
+            result.comparison = MethodComparison.between(exact, mesh)
+    return result
+
+
+def run_inertia_stage(
+    tasks: List[LinkInertiaTask],
+    max_workers: int = 1,
+    calc: Optional[InertiaCalculator] = None,
+    progress: Optional[Callable[[LinkInertiaResult], None]] = None,
+) -> List[LinkInertiaResult]:
+    """Compute every task, in a process pool when ``max_workers > 1``.
+
+    Results are returned in task order. The serial path shares ``calc``
+    (and its prototype cache) across links. ``progress`` is called with
+    each result as it becomes available.
+    """
+    results = []
+    if max_workers > 1 and len(tasks) > 1:
+        payload = [task.serialized() for task in tasks]
+        with ProcessPoolExecutor(max_workers=min(max_workers, len(tasks))) as pool:
+            for result in pool.map(compute_link_inertia, payload):
+                results.append(result)
+                if progress is not None:
+                    progress(result)
+        return results
+    for task in tasks:
+        results.append(compute_link_inertia(task, calc))
+        if progress is not None:
+            progress(results[-1])
+    return results
+
+
+def merge_results(
+    results: List[LinkInertiaResult], report: InertiaReport
+) -> Tuple[List[str], List[str]]:
+    """Add results to ``report`` in order.
+
+    Returns the names of the links that got inertia and of those that failed.
+    """
+    computed, failed = [], []
+    for result in results:
+        if result.error is not None:
+            logger.warning(
+                f"Failed to compute inertia for {result.link_name}: {result.error}"
+            )
+            failed.append(result.link_name)
+            continue
+        report.add_link_parts(result.link_name, result.parts)
+        report.warnings.extend(result.warnings)
+        if result.comparison is not None:
+            report.comparisons[result.link_name] = result.comparison
+        if result.properties:
+            report.link_properties[result.link_name] = result.properties
+            computed.append(result.link_name)
+            logger.info(
+                f"Computed inertia for {result.link_name}: "
+                f"mass={result.properties.mass:.4f} kg"
+            )
+    return computed, failed
@@ -3,6 +3,8 @@
 from dataclasses import dataclass
 from typing import Tuple
 
+import numpy as np
+
 
 @dataclass
 class InertialProperties:
@@ -34,3 +36,16 @@ class InertialProperties:
                 "iyz": self.iyz,
             },
         }
+
+
+@dataclass
+class MassProperties:
+    """Density-independent mass properties of a solid in model units (mm).
+
+    ``inertia`` is the tensor about the center of mass for unit density;
+    physical values scale linearly with the density.
+    """
+
+    volume: float  # mm³
+    com: np.ndarray  # (3,) mm
+    inertia: np.ndarray  # (3, 3) mm⁵
@@ -0,0 +1,192 @@
+"""Welded vertex/index buffers shared by the visual mesh writers.
+
+A link's visual parts are grouped by color and welded once into indexed
+positions, normals and triangles. Every output format is then serialized
+from the same buffers.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from onshape2xacro.mesh_exporters.decimation import PartMesh
+
+# Normals of corners sharing a position are averaged below this angle.
+CREASE_ANGLE_DEG = 30.0
+# Positions closer than this (relative to the mesh diagonal) are welded.
+WELD_TOLERANCE = 1e-7
+
+
+def _normalize(vectors: np.ndarray) -> np.ndarray:
+    norms = np.linalg.norm(vectors, axis=-1, keepdims=True)
+    return np.divide(vectors, norms, out=np.zeros_like(vectors), where=norms > 0)
+
+
+def weld_mesh(
+    vertices: np.ndarray,
+    faces: np.ndarray,
+    crease_angle_deg: float = CREASE_ANGLE_DEG,
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Weld a triangle soup into indexed positions, normals and triangles.
+
+    Corners at the same position share a vertex when their smoothed normals
+    agree; corners on sharp edges (face normal further than
+    ``crease_angle_deg`` from the smoothed normal) keep the face normal, so
+    CAD edges stay crisp while curved surfaces are shaded smoothly.
+    """
+    vertices = np.asarray(vertices, dtype=np.float64).reshape(-1, 3)
+    faces = np.asarray(faces, dtype=np.int64).reshape(-1, 3)
+    if len(faces) == 0:
+        return np.zeros((0, 3)), np.zeros((0, 3)), np.zeros((0, 3), dtype=np.int64)
+
+    diagonal = float(np.linalg.norm(vertices.max(axis=0) - vertices.min(axis=0)))
+    tolerance = max(diagonal * WELD_TOLERANCE, 1e-12)
+    _, first, position_index = np.unique(
+        np.round(vertices / tolerance).astype(np.int64),
+        axis=0,
+        return_index=True,
+        return_inverse=True,
+    )
+    positions = vertices[first]
+    corners = position_index.reshape(-1)[faces]
+
+    # Drop triangles that collapsed while welding
+    corners = corners[
+        (corners[:, 0] != corners[:, 1])
+        & (corners[:, 1] != corners[:, 2])
+        & (corners[:, 0] != corners[:, 2])
+    ]
+    if len(corners) == 0:
+        return np.zeros((0, 3)), np.zeros((0, 3)), np.zeros((0, 3), dtype=np.int64)
+
+    tri = positions[corners]
+    weighted = np.cross(tri[:, 1] - tri[:, 0], tri[:, 2] - tri[:, 0])
+    face_normals = _normalize(weighted)
+
+    def _smooth(mask: np.ndarray) -> np.ndarray:
+        accumulated = np.zeros_like(positions)
+        corner_normals = np.broadcast_to(weighted[:, None, :], corners.shape + (3,))
+        np.add.at(accumulated, corners[mask], corner_normals[mask])
+        return _normalize(accumulated)
+
+    # First pass smooths everything, second pass only across soft edges
+    cos_crease = np.cos(np.radians(crease_angle_deg))
+    smooth = _smooth(np.ones(corners.shape, dtype=bool))
+    soft = np.einsum("fck,fk->fc", smooth[corners], face_normals) >= cos_crease
+    smooth = _smooth(soft)
+    normals = np.where(
+        soft[..., None], smooth[corners], face_normals[:, None, :]
+    ).reshape(-1, 3)
+
+    # Corners with the same position and (8-bit) normal become one vertex
+    keys = np.column_stack(
+        [corners.reshape(-1), np.round(normals * 127.0).astype(np.int64)]
+    )
+    _, first, inverse = np.unique(keys, axis=0, return_index=True, return_inverse=True)
+    welded_positions = positions[corners.reshape(-1)[first]]
+    welded_normals = _normalize(normals[first])
+    return welded_positions, welded_normals, inverse.reshape(-1, 3)
+
+
+def _group_by_color(
+    parts: Sequence[PartMesh],
+) -> List[Tuple[Optional[Tuple[float, float, float]], np.ndarray, np.ndarray]]:
+    """Concatenate parts sharing a color, preserving first-seen order."""
+    groups: Dict[Any, Tuple[List[np.ndarray], List[np.ndarray], int]] = {}
+    for part in parts:
+        if part.face_count == 0:
+            continue
+        color = None if part.color is None else tuple(float(c) for c in part.color)
+        vertices, faces, offset = groups.get(color, ([], [], 0))
+        vertices.append(np.asarray(part.vertices, dtype=np.float64))
+        faces.append(np.asarray(part.faces, dtype=np.int64) + offset)
+        groups[color] = (vertices, faces, offset + len(part.vertices))
+    return [
+        (color, np.concatenate(vertices), np.concatenate(faces))
+        for color, (vertices, faces, _) in groups.items()
+    ]
+
+
+@dataclass
+class MeshGroup:
+    """Welded triangles of all parts sharing one color."""
+
+    color: Optional[Tuple[float, float, float]]
+    positions: np.ndarray  # (n, 3) float
+    normals: np.ndarray  # (n, 3) float, unit length
+    triangles: np.ndarray  # (m, 3) int
+
+
+@dataclass
+class WeldedMesh:
+    """A link's visual mesh as welded buffers, one group per color."""
+
+    groups: List[MeshGroup]
+
+    @classmethod
+    def from_parts(cls, parts: Sequence[PartMesh]) -> "WeldedMesh":
+        return cls(
+            [
+                MeshGroup(color, *weld_mesh(vertices, faces))
+                for color, vertices, faces in _group_by_color(parts)
+            ]
+        )
+
+    @property
+    def face_count(self) -> int:
+        return sum(len(g.triangles) for g in self.groups)
+
+    @property
+    def vertex_count(self) -> int:
+        return sum(len(g.positions) for g in self.groups)
+
+    @property
+    def has_colors(self) -> bool:
+        return any(g.color is not None for g in self.groups)
+
+    def concatenated(
+        self,
+    ) -> Tuple[np.ndarray, np.ndarray, np.ndarray, Optional[np.ndarray]]:
+        """All groups as one set of buffers.
+
+        Returns positions, normals, triangles and per-face RGBA colors
+        (``uint8``, ``None`` when no group has a color).
+        """
+        positions, normals, triangles, colors = [], [], [], []
+        offset = 0
+        for group in self.groups:
+            positions.append(group.positions)
+            normals.append(group.normals)
+            triangles.append(group.triangles + offset)
+            offset += len(group.positions)
+            rgba = [255, 255, 255, 255]
+            if group.color is not None:
+                rgba = [int(c * 255) for c in group.color] + [255]
+            colors.append(np.tile(np.array(rgba, np.uint8), (len(group.triangles), 1)))
+
+        if not self.groups:
+            empty = np.zeros((0, 3))
+            return empty, empty, np.zeros((0, 3), dtype=np.int64), None
+        return (
+            np.concatenate(positions),
+            np.concatenate(normals),
+            np.concatenate(triangles),
+            np.concatenate(colors) if self.has_colors else None,
+        )
+
+    def to_trimesh(self) -> Any:
+        import trimesh
+
+        positions, normals, triangles, face_colors = self.concatenated()
+        mesh = trimesh.Trimesh(
+            vertices=positions,
+            faces=triangles,
+            vertex_normals=normals,
+            process=False,
+        )
+        if face_colors is not None:
+            mesh.visual.face_colors = face_colors
+        return mesh
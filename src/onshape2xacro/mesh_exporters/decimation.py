@@ -0,0 +1,256 @@
+"""Part-aware decimation of visual meshes.
+
+Instead of decimating a link's concatenated triangle soup uniformly, each
+part keeps its own submesh and receives a share of the link's face budget
+proportional to its surface area weighted by how visible it is from the
+outside of the link. Parts are then decimated independently (in parallel);
+the writers weld them back into one mesh (``buffers.WeldedMesh``).
+"""
+
+from __future__ import annotations
+
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from typing import List, Optional, Sequence, Tuple
+
+import numpy as np
+from loguru import logger
+
+# Parts never get decimated below this many faces (unless they had fewer).
+MIN_PART_FACES = 12
+# Task lists with fewer input faces are decimated inline: sending them to
+# worker processes costs more than it saves
+POOL_MIN_FACES = 50_000
+# Hidden parts still keep a fraction of the budget they would get by area alone.
+MIN_VISIBILITY = 0.25
+# Number of vertices sampled per part for the visibility estimate.
+VISIBILITY_SAMPLES = 256
+
+
+@dataclass
+class PartMesh:
+    """Triangle mesh of a single part, in link coordinates."""
+
+    vertices: np.ndarray  # (n, 3) float
+    faces: np.ndarray  # (m, 3) int
+    color: Optional[Tuple[float, float, float]] = None
+
+    @property
+    def face_count(self) -> int:
+        return len(self.faces)
+
+    def surface_area(self) -> float:
+        if len(self.faces) == 0:
+            return 0.0
+        tri = self.vertices[self.faces]
+        cross = np.cross(tri[:, 1] - tri[:, 0], tri[:, 2] - tri[:, 0])
+        return float(0.5 * np.linalg.norm(cross, axis=1).sum())
+
+
+def _sample_vertices(vertices: np.ndarray) -> np.ndarray:
+    vertices = np.asarray(vertices, dtype=float).reshape(-1, 3)
+    if len(vertices) <= VISIBILITY_SAMPLES:
+        return vertices
+    step = len(vertices) / VISIBILITY_SAMPLES
+    return vertices[(np.arange(VISIBILITY_SAMPLES) * step).astype(np.int64)]
+
+
+def part_visibility(parts: Sequence[PartMesh]) -> np.ndarray:
+    """Estimate how exposed each part is, in ``[MIN_VISIBILITY, 1]``.
+
+    A part counts as visible in proportion to how many of its (sampled)
+    vertices lie close to the convex hull of the whole link. Parts buried
+    inside the link (bearings, inner screws) score low.
+    """
+    visibility = np.ones(len(parts))
+    samples = [_sample_vertices(p.vertices) for p in parts]
+    points = np.concatenate([s for s in samples if len(s)] or [np.zeros((0, 3))])
+    if len(points) < 4:
+        return visibility
+
+    try:
+        from scipy.spatial import ConvexHull
+
+        hull = ConvexHull(points)
+    except Exception as e:
+        logger.debug(f"Convex hull for visibility failed, using area only: {e}")
+        return visibility
+
+    diagonal = float(np.linalg.norm(points.max(axis=0) - points.min(axis=0)))
+    tolerance = max(diagonal * 0.02, 1e-9)
+    normals = hull.equations[:, :3]
+    offsets = hull.equations[:, 3]
+
+    for i, sample in enumerate(samples):
+        if len(sample) == 0:
+            continue
+        # Distance to each hull plane is -(n.x + d) >= 0 for interior points.
+        depth = -(sample @ normals.T + offsets)
+        near_hull = depth.min(axis=1) <= tolerance
+        visibility[i] = MIN_VISIBILITY + (1.0 - MIN_VISIBILITY) * near_hull.mean()
+
+    return visibility
+
+
+def allocate_face_budget(
+    parts: Sequence[PartMesh],
+    budget: int,
+    weights: Optional[np.ndarray] = None,
+) -> np.ndarray:
+    """Split ``budget`` faces between ``parts`` proportionally to ``weights``.
+
+    Parts never receive more faces than they have; the surplus is handed to
+    the remaining parts (water filling). Every part keeps at least
+    ``MIN_PART_FACES`` faces so small parts do not collapse entirely.
+    """
+    counts = np.array([p.face_count for p in parts], dtype=np.int64)
+    if weights is None:
+        weights = np.array([p.surface_area() for p in parts])
+    weights = np.maximum(np.asarray(weights, dtype=float), 0.0)
+
+    floor = np.minimum(counts, MIN_PART_FACES)
+    if budget >= counts.sum():
+        return counts.copy()
+
+    targets = floor.astype(float)
+    remaining = float(budget - floor.sum())
+    open_mask = counts > floor
+    while remaining > 0.5 and open_mask.any():
+        open_weights = np.where(open_mask, weights, 0.0)
+        total = open_weights.sum()
+        if total <= 0:
+            # No area information left: split evenly between open parts
+            open_weights = open_mask.astype(float)
+            total = open_weights.sum()
+        share = remaining * open_weights / total
+        proposed = targets + share
+        capped = open_mask & (proposed >= counts)
+        if not capped.any():
+            targets = proposed
+            break
+        remaining -= float((counts[capped] - targets[capped]).sum())
+        targets[capped] = counts[capped]
+        open_mask &= ~capped
+
+    return np.minimum(np.floor(targets).astype(np.int64), counts)
+
+
+def decimate_mesh(
+    vertices: np.ndarray, faces: np.ndarray, target_faces: int
+) -> Tuple[np.ndarray, np.ndarray]:
+    """Quadric edge-collapse decimation of a single mesh to ``target_faces``."""
+    if target_faces >= len(faces):
+        return vertices, faces
+
+    try:
+        import pymeshlab
+
+        ms = pymeshlab.MeshSet()
+        ms.add_mesh(
+            pymeshlab.Mesh(
+                vertex_matrix=np.asarray(vertices, dtype=np.float64),
+                face_matrix=np.asarray(faces, dtype=np.int32),
+            )
+        )
+        ms.meshing_decimation_quadric_edge_collapse(
+            targetfacenum=int(target_faces), preservenormal=True
+        )
+        mesh = ms.current_mesh()
+        return mesh.vertex_matrix(), mesh.face_matrix()
+    except Exception as e:
+        logger.debug(f"PyMeshLab decimation failed: {e}. Falling back to trimesh.")
+
+    try:
+        import trimesh
+
+        decimated = trimesh.Trimesh(
+            vertices=vertices, faces=faces, process=False
+        ).simplify_quadric_decimation(face_count=int(target_faces))
+        return np.asarray(decimated.vertices), np.asarray(decimated.faces)
+    except Exception as e:
+        logger.debug(f"Trimesh decimation failed: {e}. Keeping full resolution.")
+        return vertices, faces
+
+
+def _decimate_task(
+    args: Tuple[int, np.ndarray, np.ndarray, int],
+) -> Tuple[int, np.ndarray, np.ndarray]:
+    index, vertices, faces, target_faces = args
+    new_vertices, new_faces = decimate_mesh(vertices, faces, target_faces)
+    return index, new_vertices, new_faces
+
+
+class DecimationPool:
+    """Worker processes shared by the decimations of one export.
+
+    The processes start with the first task list worth sending to them;
+    single tasks and small lists are decimated inline.
+    """
+
+    def __init__(self, max_workers: int = 1):
+        self.max_workers = max_workers
+        self._executor: Optional[ProcessPoolExecutor] = None
+
+    def map(
+        self, tasks: List[Tuple[int, np.ndarray, np.ndarray, int]]
+    ) -> List[Tuple[int, np.ndarray, np.ndarray]]:
+        faces = sum(len(task[2]) for task in tasks)
+        if self.max_workers <= 1 or len(tasks) < 2 or faces < POOL_MIN_FACES:
+            return [_decimate_task(task) for task in tasks]
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(max_workers=self.max_workers)
+        return list(self._executor.map(_decimate_task, tasks))
+
+    def close(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown()
+            self._executor = None
+
+    def __enter__(self) -> "DecimationPool":
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.close()
+
+
+def decimate_parts(
+    parts: Sequence[PartMesh],
+    budget: int,
+    max_workers: int = 1,
+    strategy: str = "part_aware",
+    pool: Optional[DecimationPool] = None,
+) -> List[PartMesh]:
+    """Decimate ``parts`` so that together they have about ``budget`` faces.
+
+    With the ``part_aware`` strategy the budget is split by surface area times
+    visibility; ``uniform`` keeps the same fraction of every part. Parts that
+    need decimation are processed in ``pool``, or in a pool of
+    ``max_workers`` processes for this call only.
+    """
+    if not parts:
+        return []
+
+    if strategy == "uniform":
+        weights = np.array([p.face_count for p in parts], dtype=float)
+    else:
+        weights = np.array([p.surface_area() for p in parts]) * part_visibility(parts)
+    targets = allocate_face_budget(parts, budget, weights)
+
+    result = list(parts)
+    tasks = [
+        (i, p.vertices, p.faces, int(targets[i]))
+        for i, p in enumerate(parts)
+        if targets[i] < p.face_count
+    ]
+    if not tasks:
+        return result
+
+    if pool is not None:
+        outputs = pool.map(tasks)
+    else:
+        with DecimationPool(min(max_workers, len(tasks))) as call_pool:
+            outputs = call_pool.map(tasks)
+
+    for index, vertices, faces in outputs:
+        result[index] = PartMesh(vertices, faces, parts[index].color)
+    return result
@@ -0,0 +1,359 @@
+"""Compact binary glTF (GLB) writer for visual meshes.
+
+Meshes are written straight from NumPy buffers: vertices are welded per
+color group, indices use 16 bits whenever a primitive has few enough
+vertices, and part colors become materials. On request, positions are
+quantized to 16-bit integers and normals to 8-bit integers
+(``KHR_mesh_quantization``), which not every viewer supports.
+Repeated parts can be stored once and placed with ``EXT_mesh_gpu_instancing``.
+"""
+
+from __future__ import annotations
+
+import json
+import struct
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from onshape2xacro.mesh_exporters.buffers import WeldedMesh
+from onshape2xacro.mesh_exporters.decimation import PartMesh
+
+GLB_MAGIC = 0x46546C67  # "glTF"
+CHUNK_JSON = 0x4E4F534A
+CHUNK_BIN = 0x004E4942
+
+# Accessor component types
+BYTE = 5120
+UNSIGNED_BYTE = 5121
+SHORT = 5122
+UNSIGNED_SHORT = 5123
+UNSIGNED_INT = 5125
+FLOAT = 5126
+
+# Buffer view targets
+ARRAY_BUFFER = 34962
+ELEMENT_ARRAY_BUFFER = 34963
+
+QUANTIZATION_EXTENSION = "KHR_mesh_quantization"
+INSTANCING_EXTENSION = "EXT_mesh_gpu_instancing"
+_COMPONENT_TYPES = {
+    np.dtype(np.int8): BYTE,
+    np.dtype(np.uint8): UNSIGNED_BYTE,
+    np.dtype(np.int16): SHORT,
+    np.dtype(np.uint16): UNSIGNED_SHORT,
+    np.dtype(np.uint32): UNSIGNED_INT,
+    np.dtype(np.float32): FLOAT,
+}
+_ACCESSOR_TYPES = {1: "SCALAR", 2: "VEC2", 3: "VEC3", 4: "VEC4", 16: "MAT4"}
+
+
+class GlbBuilder:
+    """Accumulates glTF JSON and the binary chunk of a single GLB file."""
+
+    def __init__(self, generator: str = "onshape2xacro"):
+        self.gltf: Dict[str, Any] = {
+            "asset": {"version": "2.0", "generator": generator},
+            "scene": 0,
+            "scenes": [{"nodes": []}],
+            "nodes": [],
+            "meshes": [],
+            "materials": [],
+            "accessors": [],
+            "bufferViews": [],
+            "buffers": [],
+        }
+        self._chunks: List[bytes] = []
+        self._length = 0
+        self._materials: Dict[Tuple[float, ...], int] = {}
+
+    def use_extension(self, name: str, required: bool = False) -> None:
+        used = self.gltf.setdefault("extensionsUsed", [])
+        if name not in used:
+            used.append(name)
+        if required:
+            needed = self.gltf.setdefault("extensionsRequired", [])
+            if name not in needed:
+                needed.append(name)
+
+    def add_buffer_view(
+        self,
+        data: np.ndarray,
+        target: Optional[int] = None,
+        byte_stride: Optional[int] = None,
+    ) -> int:
+        raw = np.ascontiguousarray(data).tobytes()
+        view: Dict[str, Any] = {
+            "buffer": 0,
+            "byteOffset": self._length,
+            "byteLength": len(raw),
+        }
+        if target is not None:
+            view["target"] = target
+        if byte_stride is not None:
+            view["byteStride"] = byte_stride
+        self._chunks.append(raw)
+        self._length += len(raw)
+        padding = (-self._length) % 4
+        if padding:
+            self._chunks.append(b"\x00" * padding)
+            self._length += padding
+        self.gltf["bufferViews"].append(view)
+        return len(self.gltf["bufferViews"]) - 1
+
+    def add_accessor(
+        self,
+        data: np.ndarray,
+        components: int,
+        target: Optional[int] = None,
+        normalized: bool = False,
+        with_bounds: bool = False,
+    ) -> int:
+        """Add ``data`` (rows may be padded beyond ``components``) as an accessor."""
+        data = np.asarray(data)
+        rows = data.reshape(len(data), -1)
+        stride = None
+        if target == ARRAY_BUFFER and rows.shape[1] != components:
+            stride = rows.shape[1] * rows.dtype.itemsize
+        accessor: Dict[str, Any] = {
+            "bufferView": self.add_buffer_view(rows, target, stride),
+            "componentType": _COMPONENT_TYPES[rows.dtype],
+            "count": len(rows),
+            "type": _ACCESSOR_TYPES[components],
+        }
+        if normalized:
+            accessor["normalized"] = True
+        if with_bounds and len(rows):
+            values = rows[:, :components]
+            cast = float if rows.dtype.kind == "f" else int
+            accessor["min"] = [cast(v) for v in values.min(axis=0)]
+            accessor["max"] = [cast(v) for v in values.max(axis=0)]
+        self.gltf["accessors"].append(accessor)
+        return len(self.gltf["accessors"]) - 1
+
+    def add_material(self, color: Sequence[float]) -> int:
+        rgba = tuple(float(c) for c in color)
+        if len(rgba) == 3:
+            rgba = rgba + (1.0,)
+        if rgba not in self._materials:
+            self.gltf["materials"].append(
+                {
+                    "pbrMetallicRoughness": {
+                        "baseColorFactor": list(rgba),
+                        "metallicFactor": 0.0,
+                        "roughnessFactor": 0.9,
+                    },
+                    **({"alphaMode": "BLEND"} if rgba[3] < 1.0 else {}),
+                }
+            )
+            self._materials[rgba] = len(self.gltf["materials"]) - 1
+        return self._materials[rgba]
+
+    def add_mesh(
+        self,
+        mesh: WeldedMesh | Sequence[PartMesh],
+        name: Optional[str] = None,
+        quantize: bool = False,
+    ) -> Tuple[int, Optional[Dict[str, Any]]]:
+        """Add a mesh with one primitive per color.
+
+        Returns the mesh index and, for quantized meshes, the node transform
+        (``translation`` and ``scale``) that maps the integer grid back to
+        model units. The transform must be applied on every node using the
+        mesh.
+        """
+        if not isinstance(mesh, WeldedMesh):
+            mesh = WeldedMesh.from_parts(mesh)
+        groups = [g for g in mesh.groups if len(g.triangles)]
+
+        dequantize = None
+        if quantize and groups:
+            self.use_extension(QUANTIZATION_EXTENSION, required=True)
+            all_positions = np.concatenate([g.positions for g in groups])
+            origin = all_positions.min(axis=0)
+            extent = float((all_positions.max(axis=0) - origin).max())
+            step = extent / 65535.0 if extent > 0 else 1.0
+            dequantize = {"translation": origin.tolist(), "scale": [step] * 3}
+
+        primitives = []
+        for group in groups:
+            positions, normals = group.positions, group.normals
+            if dequantize is not None:
+                # Rows are padded to 4 components: attributes must be 4-byte aligned
+                grid = np.zeros((len(positions), 4), dtype=np.uint16)
+                grid[:, :3] = np.clip(
+                    np.round((positions - origin) / step), 0, 65535
+                ).astype(np.uint16)
+                packed = np.zeros((len(normals), 4), dtype=np.int8)
+                packed[:, :3] = np.round(normals * 127.0).astype(np.int8)
+                position_accessor = self.add_accessor(
+                    grid, 3, ARRAY_BUFFER, with_bounds=True
+                )
+                normal_accessor = self.add_accessor(
+                    packed, 3, ARRAY_BUFFER, normalized=True
+                )
+            else:
+                position_accessor = self.add_accessor(
+                    positions.astype(np.float32), 3, ARRAY_BUFFER, with_bounds=True
+                )
+                normal_accessor = self.add_accessor(
+                    normals.astype(np.float32), 3, ARRAY_BUFFER
+                )
+
+            # 0xFFFF is reserved for primitive restart in some APIs
+            index_type = np.uint16 if len(positions) < 0xFFFF else np.uint32
+            index_accessor = self.add_accessor(
+                group.triangles.reshape(-1).astype(index_type), 1, ELEMENT_ARRAY_BUFFER
+            )
+            primitive: Dict[str, Any] = {
+                "attributes": {
+                    "POSITION": position_accessor,
+                    "NORMAL": normal_accessor,
+                },
+                "indices": index_accessor,
+            }
+            if group.color is not None:
+                primitive["material"] = self.add_material(group.color)
+            primitives.append(primitive)
+
+        mesh: Dict[str, Any] = {"primitives": primitives}
+        if name:
+            mesh["name"] = name
+        self.gltf["meshes"].append(mesh)
+        return len(self.gltf["meshes"]) - 1, dequantize
+
+    def add_node(self, node: Dict[str, Any], parent: Optional[int] = None) -> int:
+        self.gltf["nodes"].append(node)
+        index = len(self.gltf["nodes"]) - 1
+        if parent is None:
+            self.gltf["scenes"][0]["nodes"].append(index)
+        else:
+            self.gltf["nodes"][parent].setdefault("children", []).append(index)
+        return index
+
+    def to_bytes(self) -> bytes:
+        gltf = {k: v for k, v in self.gltf.items() if v != []}
+        binary = b"".join(self._chunks)
+        if binary:
+            gltf["buffers"] = [{"byteLength": len(binary)}]
+        payload = json.dumps(gltf, separators=(",", ":")).encode("utf-8")
+        payload += b" " * ((-len(payload)) % 4)
+
+        chunks = struct.pack("<II", len(payload), CHUNK_JSON) + payload
+        if binary:
+            chunks += struct.pack("<II", len(binary), CHUNK_BIN) + binary
+        return struct.pack("<III", GLB_MAGIC, 2, 12 + len(chunks)) + chunks
+
+    def write(self, path: Path) -> None:
+        Path(path).write_bytes(self.to_bytes())
+
+
+def write_glb(
+    path: Path,
+    mesh: WeldedMesh | Sequence[PartMesh],
+    name: Optional[str] = None,
+    quantize: bool = False,
+) -> None:
+    """Write ``mesh`` (welded, or parts to weld) as a single-mesh GLB file."""
+    builder = GlbBuilder()
+    mesh_index, dequantize = builder.add_mesh(mesh, name=name, quantize=quantize)
+    node: Dict[str, Any] = {"mesh": mesh_index}
+    if name:
+        node["name"] = name
+    if dequantize:
+        node.update(dequantize)
+    builder.add_node(node)
+    builder.write(path)
+
+
+def _instance_trs(
+    matrix: np.ndarray, dequantize: Optional[Dict[str, Any]]
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Translation, rotation (xyzw) and scale of a rigid instance transform.
+
+    The mesh dequantization transform is folded in, since instance
+    transforms are applied on top of the node transform, not below it.
+    """
+    from scipy.spatial.transform import Rotation
+
+    matrix = np.asarray(matrix, dtype=np.float64)
+    rotation = Rotation.from_matrix(matrix[:3, :3])
+    translation = matrix[:3, 3].copy()
+    scale = np.ones(3)
+    if dequantize:
+        translation += rotation.apply(np.asarray(dequantize["translation"]))
+        scale = np.asarray(dequantize["scale"], dtype=np.float64)
+    return translation, rotation.as_quat(), scale
+
+
+def _placed(part: PartMesh, matrix: np.ndarray) -> PartMesh:
+    """``part`` moved by ``matrix``; a reflection flips the winding."""
+    matrix = np.asarray(matrix, dtype=np.float64)
+    faces = part.faces[:, ::-1] if np.linalg.det(matrix[:3, :3]) < 0 else part.faces
+    vertices = part.vertices @ matrix[:3, :3].T + matrix[:3, 3]
+    return PartMesh(vertices, faces, part.color)
+
+
+def write_instanced_glb(
+    path: Path,
+    prototypes: Sequence[Tuple[PartMesh, Sequence[np.ndarray]]],
+    name: Optional[str] = None,
+    quantize: bool = False,
+) -> None:
+    """Write repeated parts once each, placed by ``EXT_mesh_gpu_instancing``.
+
+    ``prototypes`` pairs each distinct part mesh (in its own frame) with the
+    rigid 4x4 transforms of its instances. Prototypes used only once become
+    plain nodes. Mirrored instances, which a rotation cannot express, are
+    written as meshes of their own.
+    """
+    builder = GlbBuilder()
+    root = builder.add_node({"name": name} if name else {})
+    for part, all_transforms in prototypes:
+        transforms = []
+        for matrix in all_transforms:
+            if np.linalg.det(np.asarray(matrix)[:3, :3]) > 0:
+                transforms.append(matrix)
+                continue
+            mesh_index, dequantize = builder.add_mesh(
+                [_placed(part, matrix)], quantize=quantize
+            )
+            builder.add_node({"mesh": mesh_index, **(dequantize or {})}, parent=root)
+        if not transforms:
+            continue
+        mesh_index, dequantize = builder.add_mesh([part], quantize=quantize)
+        trs = [_instance_trs(matrix, dequantize) for matrix in transforms]
+        if len(trs) == 1:
+            translation, rotation, scale = trs[0]
+            builder.add_node(
+                {
+                    "mesh": mesh_index,
+                    "translation": translation.tolist(),
+                    "rotation": rotation.tolist(),
+                    "scale": scale.tolist(),
+                },
+                parent=root,
+            )
+            continue
+
+        builder.use_extension(INSTANCING_EXTENSION, required=True)
+        attributes = {
+            "TRANSLATION": builder.add_accessor(
+                np.array([t for t, _, _ in trs], dtype=np.float32), 3
+            ),
+            "ROTATION": builder.add_accessor(
+                np.array([r for _, r, _ in trs], dtype=np.float32), 4
+            ),
+            "SCALE": builder.add_accessor(
+                np.array([s for _, _, s in trs], dtype=np.float32), 3
+            ),
+        }
+        builder.add_node(
+            {
+                "mesh": mesh_index,
+                "extensions": {INSTANCING_EXTENSION: {"attributes": attributes}},
+            },
+            parent=root,
+        )
+    builder.write(path)
@@ -0,0 +1,206 @@
+"""Build manifest for incremental mesh exports.
+
+The manifest lives next to the meshes and records, per link, a hash of
+everything its meshes and inertia are derived from, together with the
+results of the last export. Links whose hash is unchanged are reused
+instead of being re-tessellated. The hash covers the link's own shapes,
+not the whole STEP file, so editing one part only rebuilds its links.
+"""
+
+from __future__ import annotations
+
+import dataclasses
+import hashlib
+import importlib.metadata
+import json
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Dict, Iterator, List, Optional
+
+import numpy as np
+from loguru import logger
+
+if TYPE_CHECKING:
+    from onshape2xacro.inertia import InertiaReport
+
+MANIFEST_NAME = "build_manifest.json"
+# Bump when the layout or meaning of stored results changes
+MANIFEST_VERSION = 2
+
+
+def tool_version() -> str:
+    try:
+        return importlib.metadata.version("onshape2xacro")
+    except importlib.metadata.PackageNotFoundError:
+        return "unknown"
+
+
+def file_digest(path: Path, chunk_size: int = 1 << 20) -> str:
+    """SHA-1 of a file's contents."""
+    digest = hashlib.sha1()
+    with open(path, "rb") as f:
+        while chunk := f.read(chunk_size):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _to_json(value: Any) -> Any:
+    if dataclasses.is_dataclass(value) and not isinstance(value, type):
+        return dataclasses.asdict(value)
+    if isinstance(value, np.ndarray):
+        # Rounded so that float noise in recomputed transforms does not
+        # invalidate a link
+        return np.round(value.astype(np.float64), 9).tolist()
+    if isinstance(value, (np.floating, np.integer)):
+        return value.item()
+    return repr(value)
+
+
+def inputs_digest(*values: Any) -> str:
+    """Stable hash of JSON-serializable values, dataclasses and arrays."""
+    payload = json.dumps(values, sort_keys=True, default=_to_json)
+    return hashlib.sha1(payload.encode()).hexdigest()
+
+
+def entry_files(entry: Any) -> Iterator[str]:
+    """Mesh files (relative to the mesh directory) referenced by a mesh map entry."""
+    if isinstance(entry, str):
+        yield entry
+        return
+    if not isinstance(entry, dict):
+        return
+    visual = entry.get("visual")
+    if isinstance(visual, dict):
+        yield from visual.values()
+    elif isinstance(visual, str):
+        yield visual
+    for level in entry.get("visual_lods", []):
+        yield from level.values()
+    collision = entry.get("collision")
+    if isinstance(collision, str):
+        yield collision
+    elif isinstance(collision, list):
+        yield from collision
+
+
+@dataclass
+class LinkBuild:
+    """Inputs hash and results of one link's last export."""
+
+    hash: str
+    mesh: Dict[str, Any]
+    missing: List[Dict[str, str]] = field(default_factory=list)
+    # InertialProperties, PartDebugInfo, PartWarning and MethodComparison
+    # as plain dicts
+    inertia: Optional[Dict[str, Any]] = None
+    parts: List[Dict[str, Any]] = field(default_factory=list)
+    warnings: List[Dict[str, Any]] = field(default_factory=list)
+    comparison: Optional[Dict[str, Any]] = None
+    # Hash of the link's shapes; reused while the STEP file is unchanged
+    geometry: Optional[str] = None
+
+    @classmethod
+    def from_export(
+        cls,
+        digest: str,
+        mesh: Dict[str, Any],
+        missing: List[Dict[str, str]],
+        link_name: str,
+        report: Optional["InertiaReport"] = None,
+        geometry: Optional[str] = None,
+    ) -> "LinkBuild":
+        build = cls(digest, mesh, missing, geometry=geometry)
+        if report is not None:
+            props = report.link_properties.get(link_name)
+            build.inertia = dataclasses.asdict(props) if props else None
+            build.parts = [
+                dataclasses.asdict(p) for p in report.link_parts.get(link_name, [])
+            ]
+            build.warnings = [
+                dataclasses.asdict(w)
+                for w in report.warnings
+                if w.link_name == link_name
+            ]
+            comparison = report.comparisons.get(link_name)
+            build.comparison = dataclasses.asdict(comparison) if comparison else None
+        return build
+
+    def restore_inertia(self, link_name: str, report: "InertiaReport") -> None:
+        """Put the stored inertia results of ``link_name`` back into ``report``."""
+        from onshape2xacro.inertia.report import (
+            MethodComparison,
+            PartDebugInfo,
+            PartWarning,
+        )
+        from onshape2xacro.inertia.types import InertialProperties
+
+        if self.inertia:
+            inertia = dict(self.inertia, com=tuple(self.inertia["com"]))
+            report.link_properties[link_name] = InertialProperties(**inertia)
+        if self.parts:
+            report.link_parts[link_name] = [PartDebugInfo(**p) for p in self.parts]
+        report.warnings.extend(PartWarning(**w) for w in self.warnings)
+        if self.comparison:
+            report.comparisons[link_name] = MethodComparison(**self.comparison)
+
+
+class BuildManifest:
+    """Per-link build records stored as ``build_manifest.json``."""
+
+    def __init__(
+        self,
+        path: Path,
+        links: Optional[Dict[str, LinkBuild]] = None,
+        step_digest: Optional[str] = None,
+    ):
+        self.path = path
+        self.links: Dict[str, LinkBuild] = links or {}
+        # Digest of the STEP file the recorded geometry hashes came from
+        self.step_digest = step_digest
+
+    @classmethod
+    def load(cls, mesh_dir: Path) -> "BuildManifest":
+        path = mesh_dir / MANIFEST_NAME
+        if not path.exists():
+            return cls(path)
+        try:
+            data = json.loads(path.read_text())
+            if data.get("version") != MANIFEST_VERSION:
+                logger.info("Build manifest is from another version; rebuilding")
+                return cls(path)
+            links = {
+                name: LinkBuild(**record) for name, record in data["links"].items()
+            }
+        except Exception as e:
+            logger.warning(f"Ignoring unreadable build manifest {path}: {e}")
+            return cls(path)
+        return cls(path, links, data.get("step_digest"))
+
+    def lookup(
+        self, link_name: str, digest: Optional[str] = None
+    ) -> Optional[LinkBuild]:
+        """The previous build of ``link_name`` if its inputs and files are unchanged.
+
+        Without ``digest`` any previous build whose files still exist matches.
+        """
+        build = self.links.get(link_name)
+        if build is None or digest is not None and build.hash != digest:
+            return None
+        mesh_dir = self.path.parent
+        if not all((mesh_dir / f).exists() for f in entry_files(build.mesh)):
+            return None
+        return build
+
+    def save(self) -> None:
+        data = {
+            "version": MANIFEST_VERSION,
+            "tool_version": tool_version(),
+            "step_digest": self.step_digest,
+            "links": {
+                name: dataclasses.asdict(build)
+                for name, build in sorted(self.links.items())
+            },
+        }
+        tmp_path = self.path.with_suffix(".json.tmp")
+        tmp_path.write_text(json.dumps(data, indent=1, default=_to_json))
+        tmp_path.replace(self.path)
@@ -1,8 +1,25 @@
+import copy
+import dataclasses
+import fnmatch
+import hashlib
+import os
 import re
+import shutil
 import time
 import zipfile
 from pathlib import Path
-from typing import Any, Dict, Iterable, List, Optional, Tuple, cast, TYPE_CHECKING
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Callable,
+    Collection,
+    Dict,
+    Iterable,
+    List,
+    Optional,
+    Tuple,
+    cast,
+)
 
 if TYPE_CHECKING:
     from onshape2xacro.inertia import InertiaReport
@@ -18,19 +35,55 @@ from OCP.TDF import TDF_Label, TDF_LabelSequence
 from OCP.Quantity import Quantity_Color
 from OCP.IFSelect import IFSelect_RetDone
 from OCP.TopLoc import TopLoc_Location
-from OCP.BRep import BRep_Builder
-from OCP.BRepBuilderAPI import BRepBuilderAPI_Transform
-from OCP.TopoDS import TopoDS_Compound
+from OCP.BRepBndLib import BRepBndLib
+from OCP.BRepGProp import BRepGProp
+from OCP.Bnd import Bnd_Box
+from OCP.GProp import GProp_GProps
+from OCP.TopAbs import TopAbs_FACE
+from OCP.TopExp import TopExp_Explorer
 from OCP.BRepMesh import BRepMesh_IncrementalMesh
 from OCP.StlAPI import StlAPI_Writer
 from OCP.gp import gp_Trsf
-from OCP.STEPControl import STEPControl_Writer, STEPControl_AsIs
 from loguru import logger
 import trimesh
 import coacd
 from concurrent.futures import ProcessPoolExecutor, as_completed
-from onshape2xacro.config.export_config import CollisionOptions, VisualMeshOptions
-from onshape2xacro.ui import ExportUI, NullExportUI, suppress_c_stdout
+from onshape2xacro.config.export_config import (
+    CollisionOptions,
+    PartFilterOptions,
+    VisualMeshOptions,
+)
+from onshape2xacro.download import (
+    DOWNLOAD_CHUNK_SIZE,
+    SNIFF_SIZE,
+    ResumableDownload,
+)
+from onshape2xacro.inertia.onshape import onshape_mass_properties
+from onshape2xacro.inertia.stage import (
+    LinkInertiaTask,
+    merge_results,
+    run_inertia_stage,
+)
+from onshape2xacro.mesh_exporters.buffers import WeldedMesh
+from onshape2xacro.mesh_exporters.decimation import (
+    DecimationPool,
+    PartMesh,
+    decimate_parts,
+)
+from onshape2xacro.mesh_exporters.gltf import write_instanced_glb
+from onshape2xacro.mesh_exporters.manifest import (
+    BuildManifest,
+    LinkBuild,
+    file_digest,
+    inputs_digest,
+    tool_version,
+)
+from onshape2xacro.mesh_exporters.tessellation_cache import (
+    TessellationCache,
+    shape_fingerprint,
+)
+from onshape2xacro.mesh_exporters.writers import emit_visual_formats
+from onshape2xacro.ui import ExportStats, ExportUI, NullExportUI, suppress_c_stdout
 
 
 EXPORT_ID_REGEX = re.compile(
@@ -380,6 +433,116 @@ def _part_world_matrix(part: Any) -> np.ndarray:
     return mat
 
 
+def _measure_shape(shape: Any) -> Tuple[float, float, int]:
+    """Return (volume mm^3, largest bounding-box side mm, B-rep face count)."""
+    props = GProp_GProps()
+    BRepGProp.VolumeProperties_s(shape, props)
+    volume = abs(props.Mass())
+
+    box = Bnd_Box()
+    BRepBndLib.AddOptimal_s(shape, box, False, False)
+    extent = 0.0
+    if not box.IsVoid():
+        xmin, ymin, zmin, xmax, ymax, zmax = box.Get()
+        extent = max(xmax - xmin, ymax - ymin, zmax - zmin)
+
+    faces = 0
+    explorer = TopExp_Explorer(shape, TopAbs_FACE)
+    while explorer.More():
+        faces += 1
+        explorer.Next()
+
+    return volume, extent, faces
+
+
+def _part_filter_reason(
+    part_filter: PartFilterOptions,
+    part_name: str,
+    measurements: Tuple[float, float, int] | None,
+) -> Optional[str]:
+    """Return why a part is dropped by ``part_filter``, or None to keep it."""
+    lowered = part_name.lower()
+    for pattern in part_filter.name_patterns:
+        if fnmatch.fnmatchcase(lowered, pattern.lower()):
+            return f"name matches '{pattern}'"
+
+    if measurements is None:
+        return None
+    volume, extent, _ = measurements
+    if part_filter.min_volume_mm3 > 0 and volume < part_filter.min_volume_mm3:
+        return f"volume {volume:.1f} mm³ < {part_filter.min_volume_mm3} mm³"
+    if part_filter.min_extent_mm > 0 and extent < part_filter.min_extent_mm:
+        return f"extent {extent:.1f} mm < {part_filter.min_extent_mm} mm"
+    return None
+
+
+def _link_fingerprint(
+    parts: List[Tuple[Any, Any, bool, bool, np.ndarray]],
+) -> str:
+    """Hash a link's placed geometry: part prototypes, transforms and colors.
+
+    Transforms are rounded to 1 um so that repeated modules built from the
+    same parts in the same arrangement fingerprint identically.
+    """
+    entries = sorted(
+        (
+            hash(shape),
+            np.round(link_from_part[:3, :], 3).tobytes(),
+            repr(None if color is None else tuple(round(c, 4) for c in color)),
+            keep_visual,
+            keep_collision,
+        )
+        for shape, color, keep_visual, keep_collision, link_from_part in parts
+    )
+    digest = hashlib.sha1()
+    for entry in entries:
+        digest.update(repr(entry).encode())
+    return digest.hexdigest()
+
+
+def _geometry_digest(
+    parts: List[Tuple[Any, Any, bool, bool, np.ndarray]],
+    missing: List[Dict[str, str]],
+    fingerprint: Callable[[Any], str],
+) -> str:
+    """Hash a link's shapes for the build manifest.
+
+    Unlike :func:`_link_fingerprint` it holds across runs: parts enter by
+    the fingerprint of their B-rep rather than the shape's hash.
+    """
+    return inputs_digest(
+        [
+            (
+                fingerprint(shape),
+                link_from_part,
+                None if color is None else [round(c, 4) for c in color],
+                keep_visual,
+                keep_collision,
+            )
+            for shape, color, keep_visual, keep_collision, link_from_part in parts
+        ],
+        missing,
+    )
+
+
+def _place_mesh(vertices: np.ndarray, faces: np.ndarray, transform: np.ndarray):
+    """Move a prototype mesh into the link frame by a 4x4 transform (mm)."""
+    placed = vertices @ transform[:3, :3].T + transform[:3, 3]
+    if np.linalg.det(transform[:3, :3]) < 0:
+        # Mirroring flips the winding
+        faces = faces[:, ::-1]
+    return placed, faces
+
+
+def _merge_parts(parts: List[PartMesh]) -> PartMesh:
+    """One uncolored mesh holding every part."""
+    offsets = np.cumsum([0] + [len(p.vertices) for p in parts[:-1]])
+    return PartMesh(
+        np.concatenate([p.vertices for p in parts]),
+        np.concatenate([p.faces + offset for p, offset in zip(parts, offsets)]),
+    )
+
+
 def _process_coacd_task(args: Tuple[str, Path, Any, Path]) -> Tuple[str, List[str]]:
     link_name, stl_path, options, mesh_dir = args
     collision_filenames = []
@@ -418,92 +581,188 @@ def _process_coacd_task(args: Tuple[str, Path, Any, Path]) -> Tuple[str, List[st
     return link_name, collision_filenames
 
 
-def _compress_visual_mesh(
-    mesh: Any,
-    vis_path: Path,
-    fmt: str,
+def _oversized_formats(targets: Dict[str, Path], max_size_bytes: int) -> Dict[str, int]:
+    """Sizes of the written files that exceed ``max_size_bytes``."""
+    sizes = {fmt: path.stat().st_size for fmt, path in targets.items() if path.exists()}
+    return {fmt: size for fmt, size in sizes.items() if size > max_size_bytes}
+
+
+def _fit_visual_size(
+    parts: List[PartMesh],
+    targets: Dict[str, Path],
     max_size_bytes: int,
     link_name: str,
+    strategy: str = "part_aware",
+    max_workers: int = 1,
+    quantize: bool = False,
     max_iterations: int = 10,
-) -> None:
-    current_faces = len(mesh.faces)
-    for iteration in range(max_iterations):
-        ratio = 0.5 ** (iteration + 1)
-        target_faces = max(int(current_faces * ratio), 100)
-
-        try:
-            import pymeshlab
-
-            ms = pymeshlab.MeshSet()
-            temp_stl = vis_path.parent / f"{link_name}_compress_tmp.stl"
-            mesh.export(str(temp_stl), file_type="stl")
-            ms.load_new_mesh(str(temp_stl))
-            ms.meshing_decimation_quadric_edge_collapse(targetfacenum=target_faces)
-
-            if fmt == "dae":
-                temp_obj = vis_path.parent / f"{link_name}_compress_tmp.obj"
-                ms.save_current_mesh(str(temp_obj))
-                ms2 = pymeshlab.MeshSet()
-                ms2.load_new_mesh(str(temp_obj))
-                ms2.save_current_mesh(str(vis_path))
-                temp_obj.unlink(missing_ok=True)
-            elif fmt == "obj":
-                ms.save_current_mesh(str(vis_path))
-            else:
-                decimated = trimesh.Trimesh(
-                    vertices=ms.current_mesh().vertex_matrix(),
-                    faces=ms.current_mesh().face_matrix(),
-                )
-                decimated.export(vis_path)
-
-            temp_stl.unlink(missing_ok=True)
-        except Exception:
-            decimated = mesh.simplify_quadric_decimation(target_faces)
-            decimated.export(vis_path, file_type=fmt if fmt != "dae" else "obj")
+    pool: Optional[DecimationPool] = None,
+) -> List[PartMesh]:
+    """Shrink oversized visual files below ``max_size_bytes``.
+
+    Each iteration decimates ``parts`` once, sized for the format furthest
+    over the limit (assuming file size grows linearly with face count), and
+    rewrites every format that is still too large from that one result.
+
+    Returns the decimated parts that were written last.
+    """
+    oversized = _oversized_formats(targets, max_size_bytes)
+    logger.info(
+        f"Visual meshes of {link_name} exceed {max_size_bytes / 1024 / 1024:.1f} MB ("
+        + ", ".join(
+            f"{fmt}: {size / 1024 / 1024:.1f} MB" for fmt, size in oversized.items()
+        )
+        + f"), decimating ({strategy})..."
+    )
+    current_faces = sum(p.face_count for p in parts)
+    decimated = list(parts)
+    for _ in range(max_iterations):
+        ratio = min(max_size_bytes / size for size in oversized.values())
+        budget = int(current_faces * ratio * 0.9)
+        budget = max(min(budget, current_faces // 2 or 1), 100)
+
+        decimated = decimate_parts(
+            parts, budget, max_workers=max_workers, strategy=strategy, pool=pool
+        )
+        mesh = WeldedMesh.from_parts(decimated)
+        emit_visual_formats(
+            mesh,
+            {fmt: targets[fmt] for fmt in oversized},
+            link_name,
+            quantize=quantize,
+            max_workers=max_workers,
+        )
 
-        new_size = vis_path.stat().st_size
-        if new_size <= max_size_bytes:
+        oversized = _oversized_formats(
+            {fmt: targets[fmt] for fmt in oversized}, max_size_bytes
+        )
+        if not oversized:
             logger.info(
-                f"Compressed {vis_path.name} to {new_size / 1024 / 1024:.1f} MB "
-                f"({target_faces} faces)"
+                f"Compressed {link_name} visual meshes to {mesh.face_count} faces"
             )
-            return
+            return decimated
+        if mesh.face_count >= current_faces:
+            break
+        current_faces = mesh.face_count
 
     logger.warning(
-        f"Failed to compress {vis_path.name} below "
-        f"{max_size_bytes / 1024 / 1024:.1f} MB after {max_iterations} iterations. "
-        f"Final size: {vis_path.stat().st_size / 1024 / 1024:.1f} MB"
+        f"Failed to compress {link_name} visual meshes below "
+        f"{max_size_bytes / 1024 / 1024:.1f} MB ("
+        + ", ".join(
+            f"{fmt}: {size / 1024 / 1024:.1f} MB" for fmt, size in oversized.items()
+        )
+        + ")"
     )
+    return decimated
 
 
-class StepMeshExporter:
-    def __init__(
-        self,
-        client: Client | None,
-        cad: Any,
-        asset_path: Path | None = None,
-        deflection: float = 0.01,
-    ):
-        self.client = client
-        self.cad = cad
-        self.asset_path = asset_path
-        self.deflection = deflection
+def _lod_ratios(lods: List[float]) -> List[float]:
+    """Valid LOD face ratios (relative to LOD 0), finest first."""
+    valid = sorted({float(r) for r in lods if 0.0 < float(r) < 1.0}, reverse=True)
+    if len(valid) != len(lods):
+        logger.warning(
+            f"Ignoring invalid or duplicate LOD ratios in {lods}; "
+            "ratios must be between 0 and 1 (exclusive)"
+        )
+    return valid
 
-    def export_step(self, output_path: Path) -> Path:
-        if self.client is None:
-            raise RuntimeError("Cannot export STEP without Onshape client")
-        did = self.cad.document_id
-        wtype = getattr(self.cad, "wtype", None) or getattr(self.cad, "wvm", None)
-        wid = getattr(self.cad, "workspace_id", None) or getattr(
-            self.cad, "wvm_id", None
+
+STEP_MAGIC = b"ISO-10303-21"
+ZIP_MAGIC = b"PK\x03\x04"
+
+
+def _sniff(head: bytes) -> Optional[str]:
+    """``"step"``, ``"zip"`` or None from the first bytes of a download."""
+    if head.lstrip().startswith(STEP_MAGIC):
+        return "step"
+    if head.startswith(ZIP_MAGIC):
+        return "zip"
+    return None
+
+
+def _extract_step_member(archive: Path, output_path: Path) -> bool:
+    """Stream the first STEP member of ``archive`` to ``output_path``."""
+    try:
+        with zipfile.ZipFile(archive) as zf:
+            for info in zf.infolist():
+                if not info.filename.lower().endswith((".step", ".stp")):
+                    continue
+                with zf.open(info) as member:
+                    head = member.read(DOWNLOAD_CHUNK_SIZE)
+                    if _sniff(head) != "step":
+                        continue
+                    # Next to the target, so the final rename is atomic
+                    partial = output_path.with_name(
+                        f".{output_path.name}.{os.getpid()}.part"
+                    )
+                    try:
+                        with open(partial, "wb") as f:
+                            f.write(head)
+                            shutil.copyfileobj(member, f, DOWNLOAD_CHUNK_SIZE)
+                        os.replace(partial, output_path)
+                    finally:
+                        partial.unlink(missing_ok=True)
+                    return True
+    except zipfile.BadZipFile:
+        pass
+    return False
+
+
+def _download_step(client: Client, path: str, output_path: Path) -> bool:
+    """Download the STEP file (plain or zipped) at API ``path`` to ``output_path``.
+
+    The body goes to a resumable partial file that replaces
+    ``output_path`` once complete. Returns False, reading no further,
+    when its first bytes are neither STEP nor ZIP.
+    """
+
+    def fetch(headers: Dict[str, str]) -> Any:
+        return client.request(
+            HTTP.GET,
+            path,
+            headers={"Accept": "application/octet-stream", **headers},
+            log_response=False,
         )
-        eid = self.cad.element_id
-        if not wtype or not wid:
-            raise AttributeError(
-                "CAD object missing workspace identifiers (wtype/workspace_id)"
-            )
 
-        response = self.client.request(
+    partial = output_path.with_name(f".{output_path.name}.download")
+    download = ResumableDownload(fetch, partial, source=path)
+    if not download.run(accept=lambda head: _sniff(head) is not None):
+        return False
+    try:
+        with open(partial, "rb") as f:
+            kind = _sniff(f.read(SNIFF_SIZE))
+        if kind == "step":
+            os.replace(partial, output_path)
+            return True
+        return _extract_step_member(partial, output_path)
+    finally:
+        partial.unlink(missing_ok=True)
+
+
+class StepTranslation:
+    """An assembly STEP translation running on Onshape.
+
+    Started as soon as the document ids are known, it translates while
+    the assembly itself is being fetched; :meth:`download` then waits
+    for it to finish.
+    """
+
+    # Poll quickly at first (small assemblies finish in about a second),
+    # then back off
+    FIRST_POLL_DELAY = 0.25
+    MAX_POLL_DELAY = 5.0
+    POLL_BACKOFF = 1.5
+
+    def __init__(self, client: Client, did: str, translation_id: str):
+        self.client = client
+        self.did = did
+        self.translation_id = translation_id
+
+    @classmethod
+    def start(
+        cls, client: Client, did: str, wtype: str, wid: str, eid: str
+    ) -> "StepTranslation":
+        response = client.request(
             HTTP.POST,
             f"/api/assemblies/d/{did}/{wtype}/{wid}/e/{eid}/translations",
             body={
@@ -520,93 +779,158 @@ class StepMeshExporter:
         translation_id = response.json().get("id")
         if not translation_id:
             raise RuntimeError("Missing translation id from Onshape response")
+        return cls(client, did, translation_id)
 
-        status = {}
+    def wait(self) -> Dict[str, Any]:
+        """Poll until the translation is done; returns its final status."""
+        delay = self.FIRST_POLL_DELAY
         while True:
             status = self.client.request(
                 HTTP.GET,
-                f"/api/translations/{translation_id}",
+                f"/api/translations/{self.translation_id}",
                 log_response=False,
             ).json()
             state = status.get("requestState")
             if state == "DONE":
-                break
+                return status
             if state in {"FAILED", "CANCELED"}:
                 raise RuntimeError(f"STEP translation failed: {state}")
-            time.sleep(5)
+            time.sleep(delay)
+            delay = min(delay * self.POLL_BACKOFF, self.MAX_POLL_DELAY)
 
+    def download(self, output_path: Path) -> Path:
+        """Wait for the translation and write the STEP file to ``output_path``."""
+        status = self.wait()
         external_ids = status.get("resultExternalDataIds") or []
         if not external_ids:
             raise RuntimeError("No external data ids returned for STEP translation")
 
-        def _extract_step_from_content(raw: bytes) -> bytes | None:
-            if raw.lstrip().startswith(b"ISO-10303-21"):
-                return raw
+        # The result may be a STEP, a zipped STEP or an XML manifest
+        for file_id in external_ids:
+            path = f"/api/documents/d/{self.did}/externaldata/{file_id}"
+            if _download_step(self.client, path, output_path):
+                return output_path
 
-            # Check for zip header (PK\x03\x04)
-            if raw.startswith(b"PK\x03\x04"):
-                import io
+        try:
+            path = f"/api/translations/{self.translation_id}/download"
+            if _download_step(self.client, path, output_path):
+                return output_path
+        except Exception:
+            pass
 
-                try:
-                    with zipfile.ZipFile(io.BytesIO(raw)) as zf:
-                        for name in zf.namelist():
-                            if name.lower().endswith(".step") or name.lower().endswith(
-                                ".stp"
-                            ):
-                                with zf.open(name) as f:
-                                    content = f.read()
-                                    if content.lstrip().startswith(b"ISO-10303-21"):
-                                        return content
-                except zipfile.BadZipFile:
-                    pass
-            return None
+        raise RuntimeError(
+            f"No STEP content found in translation results for {output_path.name}. "
+            "Received XML payload (Parasolid tree?) instead."
+        )
 
-        found_step = False
 
-        for file_id in external_ids:
-            download = self.client.request(
-                HTTP.GET,
-                f"/api/documents/d/{did}/externaldata/{file_id}",
-                headers={"Accept": "application/octet-stream"},
-                log_response=False,
-            )
-            download.raise_for_status()
-            content = download.content
-
-            extracted = _extract_step_from_content(content)
-            if extracted is not None:
-                output_path.write_bytes(extracted)
-                found_step = True
-                break
-
-            if content.strip().startswith(b"<?xml") or content.strip().startswith(
-                b"<manifest"
-            ):
-                continue
+class StepMeshExporter:
+    def __init__(
+        self,
+        client: Client | None,
+        cad: Any,
+        asset_path: Path | None = None,
+        deflection: float = 0.01,
+        tessellation_cache: Optional[TessellationCache] = None,
+    ):
+        self.client = client
+        self.cad = cad
+        self.asset_path = asset_path
+        self.deflection = deflection
+        self.tessellation_cache = tessellation_cache
 
-        if not found_step:
-            try:
-                download = self.client.request(
-                    HTTP.GET,
-                    f"/api/translations/{translation_id}/download",
-                    headers={"Accept": "application/octet-stream"},
-                    log_response=False,
+    def export_step(
+        self, output_path: Path, translation: Optional[StepTranslation] = None
+    ) -> Path:
+        """Translate the assembly to STEP and download it to ``output_path``.
+
+        ``translation`` is one already started with
+        :meth:`StepTranslation.start`; by default one is started now.
+        """
+        if self.client is None:
+            raise RuntimeError("Cannot export STEP without Onshape client")
+        if translation is None:
+            did = self.cad.document_id
+            wtype = getattr(self.cad, "wtype", None) or getattr(self.cad, "wvm", None)
+            wid = getattr(self.cad, "workspace_id", None) or getattr(
+                self.cad, "wvm_id", None
+            )
+            eid = self.cad.element_id
+            if not wtype or not wid:
+                raise AttributeError(
+                    "CAD object missing workspace identifiers (wtype/workspace_id)"
                 )
-                download.raise_for_status()
-                extracted = _extract_step_from_content(download.content)
-                if extracted is not None:
-                    output_path.write_bytes(extracted)
-                    return output_path
-            except Exception:
-                pass
+            translation = StepTranslation.start(self.client, did, wtype, wid, eid)
+        return translation.download(output_path)
 
-        if found_step:
-            return output_path
+    def _tessellate(
+        self,
+        shape: Any,
+        prototype_meshes: Dict[int, Tuple[np.ndarray, np.ndarray]],
+        stl_writer: Any,
+        tmp_dir: Path,
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """Mesh of a prototype shape in its own frame (mm).
+
+        Each prototype is tessellated at most once per export, and not at all
+        when the user-level tessellation cache already holds it.
+        """
+        shape_key = hash(shape)
+        if shape_key in prototype_meshes:
+            return prototype_meshes[shape_key]
 
-        raise RuntimeError(
-            f"No STEP content found in translation results for {output_path.name}. "
-            "Received XML payload (Parasolid tree?) instead."
+        cache = self.tessellation_cache
+        cache_key = None
+        if cache is not None:
+            try:
+                cache_key = cache.key(shape, self.deflection)
+            except Exception as e:
+                logger.debug(f"Could not fingerprint shape for the cache: {e}")
+            cached = cache.get(cache_key) if cache_key else None
+            if cached is not None:
+                prototype_meshes[shape_key] = cached
+                return cached
+
+        BRepMesh_IncrementalMesh(shape, self.deflection)
+        proto_stl = tmp_dir / f"prototype_{len(prototype_meshes)}.stl"
+        stl_writer.Write(shape, str(proto_stl))
+        proto_mesh = trimesh.load(str(proto_stl), force="mesh")
+        proto_stl.unlink()
+        # float32 precision (as in binary STL), so cached and fresh meshes
+        # produce identical output
+        mesh = (
+            np.asarray(proto_mesh.vertices, dtype=np.float32).astype(np.float64),
+            np.asarray(proto_mesh.faces, dtype=np.int64),
         )
+        if cache is not None and cache_key:
+            cache.put(cache_key, *mesh)
+        prototype_meshes[shape_key] = mesh
+        return mesh
+
+    def _visual_prototypes(
+        self,
+        parts: List[Tuple[Any, Any, bool, bool, np.ndarray]],
+        prototype_meshes: Dict[int, Tuple[np.ndarray, np.ndarray]],
+        stl_writer: Any,
+        tmp_dir: Path,
+    ) -> List[Tuple[PartMesh, List[np.ndarray]]]:
+        """Group a link's visual parts by prototype shape and color.
+
+        Each prototype is tessellated once in its own frame; its instances are
+        the parts' link-frame transforms.
+        """
+        groups: Dict[Tuple[int, Any], Tuple[Any, List[np.ndarray]]] = {}
+        for shape, color, _, _, link_from_part in parts:
+            key = (hash(shape), color)
+            groups.setdefault(key, (shape, []))[1].append(link_from_part)
+
+        prototypes = []
+        for (_, color), (shape, transforms) in groups.items():
+            vertices, faces = self._tessellate(
+                shape, prototype_meshes, stl_writer, tmp_dir
+            )
+            prototypes.append((PartMesh(vertices, faces, color), transforms))
+        return prototypes
 
     def export_link_meshes(
         self,
@@ -616,6 +940,12 @@ class StepMeshExporter:
         visual_option: Optional[VisualMeshOptions] = None,
         collision_option: Optional[CollisionOptions] = None,
         ui: Optional[ExportUI] = None,
+        stats: Optional[ExportStats] = None,
+        only_links: Optional[Collection[str]] = None,
+        inertia_method: str = "exact",
+        inertia_compare: bool = False,
+        inertia_max_workers: int = 1,
+        material_densities: Optional[Dict[str, float]] = None,
     ) -> Tuple[
         Dict[str, str | Dict[str, str | List[str] | Dict[str, str]]],
         Dict[str, List[Dict[str, str]]],
@@ -623,6 +953,20 @@ class StepMeshExporter:
     ]:
         """Export link meshes from STEP files.
 
+        If ``stats`` is given, small-part filter counts are accumulated into it.
+        If ``only_links`` is given, other links keep the results of the previous
+        export recorded in the build manifest.
+
+        ``inertia_method`` picks exact B-rep integration (``"exact"``), the
+        divergence theorem over the prototype tessellations (``"mesh"``) or
+        the mass properties fetched from Onshape (``"onshape"``, integrating
+        only parts without them). With ``inertia_compare``, the exact method
+        is also compared with the mesh one (the others with the exact one)
+        and each link's relative error is added to the report.
+        Link inertia is computed after all meshes, on up to
+        ``inertia_max_workers`` processes. ``material_densities`` (kg/m³)
+        extend the built-in material table.
+
         Returns:
             Tuple of (mesh_map, missing_meshes, inertia_report) where:
             - mesh_map: Dict mapping link_name -> {"visual": path, "collision": path or [paths]}
@@ -632,9 +976,16 @@ class StepMeshExporter:
         from onshape2xacro.inertia import (
             InertiaCalculator,
             InertiaReport,
+            BOMIndex,
             BOMParser,
         )
 
+        if inertia_method not in ("exact", "mesh", "onshape"):
+            raise ValueError(
+                f"Unknown inertia method '{inertia_method}'; "
+                "use 'exact', 'mesh' or 'onshape'"
+            )
+
         mesh_dir.mkdir(parents=True, exist_ok=True)
         (mesh_dir / "visual").mkdir(parents=True, exist_ok=True)
         (mesh_dir / "collision").mkdir(parents=True, exist_ok=True)
@@ -643,6 +994,9 @@ class StepMeshExporter:
             visual_option = VisualMeshOptions()
         visual_mesh_formats = visual_option.formats
         max_size_bytes = int(visual_option.max_size_mb * 1024 * 1024)
+        lod_ratios = _lod_ratios(visual_option.lods)
+        for level in range(len(lod_ratios) + 1 if lod_ratios else 0):
+            (mesh_dir / "visual" / f"lod{level}").mkdir(parents=True, exist_ok=True)
 
         if collision_option is None:
             collision_option = CollisionOptions(method="fast")
@@ -650,22 +1004,47 @@ class StepMeshExporter:
         if ui is None:
             ui = NullExportUI()
 
+        visual_filter = visual_option.part_filter
+        collision_filter = collision_option.part_filter
+        measure_filtered = any(
+            f.min_volume_mm3 > 0 or f.min_extent_mm > 0
+            for f in (visual_filter, collision_filter)
+        )
+        shape_measurements: Dict[int, Tuple[float, float, int]] = {}
+
+        def _measure(shape: Any) -> Tuple[float, float, int]:
+            shape_key = hash(shape)
+            if shape_key not in shape_measurements:
+                shape_measurements[shape_key] = _measure_shape(shape)
+            return shape_measurements[shape_key]
+
         # Per-link stats accumulated for summary
 
         report = None
         calc = None
         bom_entries = {}
 
+        # Onshape mass properties give inertia without a BOM
+        if bom_path or inertia_method == "onshape":
+            report = InertiaReport()
+            calc = InertiaCalculator(material_densities=material_densities)
         if bom_path:
             bom_path = Path(bom_path) if isinstance(bom_path, str) else bom_path
-            report = InertiaReport()
-            calc = InertiaCalculator()
             if bom_path.exists():
                 parser = BOMParser()
                 bom_entries = parser.parse(bom_path)
                 logger.info(f"Loaded {len(bom_entries)} entries from BOM")
             else:
                 logger.warning(f"BOM file not found: {bom_path}")
+        # Indexed once; every link's parts are matched against it
+        bom_index = BOMIndex(bom_entries)
+        if inertia_method == "onshape" and not any(
+            onshape_mass_properties(part) for part in self.cad.parts.values()
+        ):
+            logger.warning(
+                "No Onshape mass properties in the CAD data (run fetch-cad "
+                "with --mass-properties); integrating every part from the STEP"
+            )
 
         if self.asset_path and self.asset_path.exists():
             asset_path = self.asset_path
@@ -681,71 +1060,111 @@ class StepMeshExporter:
                     f"Invalid STEP file: {asset_path}. Please delete it and re-export."
                 )
 
-        doc = TDocStd_Document(TCollection_ExtendedString("step"))
-        reader = STEPCAFControl_Reader()
-        reader.SetNameMode(True)
-        reader.SetPropsMode(True)
-        reader.SetColorMode(True)
-        reader.SetLayerMode(True)
-        for mode in ["SetMatMode", "SetViewMode", "SetGDTMode", "SetSHUOMode"]:
-            if hasattr(reader, mode):
-                getattr(reader, mode)(True)
-
-        status = reader.ReadFile(str(asset_path))
-        if status != IFSelect_RetDone:
-            raise RuntimeError(f"STEP read failed with status {status}: {asset_path}")
-
-        if not reader.Transfer(doc):
-            raise RuntimeError("STEP transfer failed")
-
-        shape_tool = _get_shape_tool(doc)
-
-        # Initialize color tool
-        color_tool = getattr(XCAFDoc_DocumentTool, "ColorTool_s", None)
-        if callable(color_tool):
-            color_tool = color_tool(doc.Main())
-        else:
-            color_tool = getattr(XCAFDoc_DocumentTool, "ColorTool", None)
+        part_shapes: Dict[Any, Any] = {}
+        part_locations: Dict[Any, TopLoc_Location] = {}
+        part_colors: Dict[Any, Any] = {}
+
+        def _read_step_shapes() -> None:
+            # Parsed on demand: a fully reused export never reads the STEP file
+            doc = TDocStd_Document(TCollection_ExtendedString("step"))
+            reader = STEPCAFControl_Reader()
+            reader.SetNameMode(True)
+            reader.SetPropsMode(True)
+            reader.SetColorMode(True)
+            reader.SetLayerMode(True)
+            for mode in ["SetMatMode", "SetViewMode", "SetGDTMode", "SetSHUOMode"]:
+                if hasattr(reader, mode):
+                    getattr(reader, mode)(True)
+
+            status = reader.ReadFile(str(asset_path))
+            if status != IFSelect_RetDone:
+                raise RuntimeError(
+                    f"STEP read failed with status {status}: {asset_path}"
+                )
+
+            if not reader.Transfer(doc):
+                raise RuntimeError("STEP transfer failed")
+
+            shape_tool = _get_shape_tool(doc)
+
+            # Initialize color tool
+            color_tool = getattr(XCAFDoc_DocumentTool, "ColorTool_s", None)
             if callable(color_tool):
                 color_tool = color_tool(doc.Main())
             else:
-                color_tool = None
+                color_tool = getattr(XCAFDoc_DocumentTool, "ColorTool", None)
+                if callable(color_tool):
+                    color_tool = color_tool(doc.Main())
+                else:
+                    color_tool = None
 
-        labels = _get_free_shape_labels(shape_tool)
+            labels = _get_free_shape_labels(shape_tool)
 
-        part_shapes: Dict[Any, Any] = {}
-        part_locations: Dict[Any, TopLoc_Location] = {}
-        part_colors: Dict[Any, Any] = {}
+            for i in range(labels.Length()):
+                _collect_shapes(
+                    shape_tool,
+                    color_tool,
+                    labels.Value(i + 1),
+                    TopLoc_Location(),
+                    part_shapes,
+                    part_locations,
+                    part_colors,
+                )
 
-        for i in range(labels.Length()):
-            _collect_shapes(
-                shape_tool,
-                color_tool,
-                labels.Value(i + 1),
-                TopLoc_Location(),
-                part_shapes,
-                part_locations,
-                part_colors,
+            has_occurrence_ids = any(
+                isinstance(key, tuple) and len(key) > 0 for key in part_shapes.keys()
             )
 
-        has_occurrence_ids = any(
-            isinstance(key, tuple) and len(key) > 0 for key in part_shapes.keys()
-        )
+            if not has_occurrence_ids:
+                part_counts: Dict[str, int] = {}
+                for part in self.cad.parts.values():
+                    pid = getattr(part, "partId", None)
+                    if pid:
+                        part_counts[pid] = part_counts.get(pid, 0) + 1
+
+                if any(c > 1 for c in part_counts.values()):
+                    raise RuntimeError(
+                        f"STEP file '{asset_path.name}' is missing 'Occurrence Export IDs' required to disambiguate parts.\n"
+                        "Resolution: Delete the file to force a fresh export, or manually export with 'includeExportIds'."
+                    )
 
-        if not has_occurrence_ids:
-            part_counts: Dict[str, int] = {}
-            for part in self.cad.parts.values():
-                pid = getattr(part, "partId", None)
-                if pid:
-                    part_counts[pid] = part_counts.get(pid, 0) + 1
+        step_read = False
 
-            if any(c > 1 for c in part_counts.values()):
-                raise RuntimeError(
-                    f"STEP file '{asset_path.name}' is missing 'Occurrence Export IDs' required to disambiguate parts.\n"
-                    "Resolution: Delete the file to force a fresh export, or manually export with 'includeExportIds'."
-                )
+        # Incremental export: inputs shared by every link, hashed once
+        manifest = BuildManifest.load(mesh_dir)
+        bom_rows = sorted(
+            (name, entry.material, entry.mass_kg) for name, entry in bom_entries.items()
+        )
+        # Links hash their own shapes rather than the whole STEP file; the
+        # recorded hashes hold while the file is unchanged
+        step_digest = file_digest(asset_path)
+        step_unchanged = manifest.step_digest == step_digest
+        common_digest = inputs_digest(
+            tool_version(),
+            self.deflection,
+            # Worker counts and the robot-level scene do not change link files
+            dataclasses.replace(visual_option, max_workers=0, scene=False),
+            dataclasses.replace(
+                collision_option,
+                coacd=dataclasses.replace(collision_option.coacd, max_workers=0),
+            ),
+            (bom_rows, material_densities, inertia_method, inertia_compare)
+            if report is not None
+            else None,
+        )
+        link_digests: Dict[str, str] = {}
+        link_geometries: Dict[str, str] = {}
+        reused_links: set[str] = set()
+        kept_links: set[str] = set()
+        failed_links: set[str] = set()
+        # Links whose collision meshes fell back to a hull or the raw mesh
+        fallback_links: set[str] = set()
+        computed_inertia_links: List[str] = []
 
         stl_writer = StlAPI_Writer()
+        # Tessellated prototype shapes (by shape hash) shared by instanced links
+        prototype_meshes: Dict[int, Tuple[np.ndarray, np.ndarray]] = {}
+        inertia_tasks: List[LinkInertiaTask] = []
         mesh_map: Dict[str, str | Dict[str, str | List[str]]] = {}
         missing_meshes: Dict[str, List[Dict[str, str]]] = {}
 
@@ -790,33 +1209,38 @@ class StepMeshExporter:
                     leaf = leaf[len(prefix) :]
             return leaf
 
-        coacd_tasks = []
-
-        # Count links that have valid keys for progress tracking
-        processable_links = [(ln, lk) for ln, lk in link_records.items() if lk.keys]
-        ui.mesh_progress_start("Meshes", len(processable_links))
-
-        for link_name, link in link_records.items():
-            keys = link.keys
-            if not keys:
-                continue
-
-            ui.mesh_progress_advance("Meshes", link_name)
-
-            # Use CAD-derived transforms (same as ZIP path) for consistency with joint origins.
-            # The STEP shapes are in local part coordinates, so we use CAD API transforms
-            # to place them relative to the link frame.
-            valid_keys = [
-                k
-                for k in keys
-                if self.cad.parts.get(k)
-                and not getattr(self.cad.parts[k], "isRigidAssembly", False)
-            ]
-            if not valid_keys:
-                continue
-
-            link_world = getattr(link, "frame_transform", None)
+        shape_fingerprints: Dict[int, str] = {}
 
+        def _fingerprint(shape: Any) -> str:
+            shape_key = hash(shape)
+            if shape_key not in shape_fingerprints:
+                try:
+                    shape_fingerprints[shape_key] = shape_fingerprint(shape)
+                except Exception as e:
+                    # The per-run hash never matches a later export
+                    logger.debug(f"Could not fingerprint shape: {e}")
+                    shape_fingerprints[shape_key] = f"run-{os.getpid()}-{shape_key}"
+            return shape_fingerprints[shape_key]
+
+        def _resolve_parts(
+            link_name: str, keys: List[Any], link_world: Optional[np.ndarray]
+        ) -> Tuple[
+            List[Tuple[Any, Any, bool, bool, np.ndarray]],
+            List[Dict[str, str]],
+            List[Optional[Tuple[Any, float]]],
+            List[Dict[str, str]],
+        ]:
+            """Match the parts of a link to STEP shapes and apply the part filters.
+
+            Returns the matched parts, their metadata and Onshape mass
+            properties, and the parts missing from the STEP file.
+            """
+            nonlocal step_read
+            if not step_read:
+                _read_step_shapes()
+                step_read = True
+
+            link = link_records[link_name]
             # Scale CAD transform (meters) to STEP coordinate system (millimeters)
             if link_world is not None:
                 link_world_mm = link_world.copy()
@@ -825,15 +1249,13 @@ class StepMeshExporter:
             link_world_mm[:3, 3] *= 1000.0
             link_world_inv = np.linalg.inv(link_world_mm)
 
-            compound = TopoDS_Compound()
-            builder = BRep_Builder()
-            builder.MakeCompound(compound)
             link_missing_parts: List[Dict[str, str]] = []
-            has_valid_shapes = False
             part_metadata_list: List[Dict[str, str]] = []
+            onshape_parts: List[Optional[Tuple[Any, float]]] = []
 
-            # Keep track of individual parts for colored visual export
-            visual_parts: List[Tuple[Any, Optional[Tuple[float, float, float]]]] = []
+            # (prototype shape, color, keep visual, keep collision,
+            #  link_from_part transform in mm)
+            filtered_parts: List[Tuple[Any, Any, bool, bool, np.ndarray]] = []
 
             part_names_list = getattr(link, "part_names", [])
             used_indices: Dict[Any, int] = {}
@@ -927,15 +1349,42 @@ class StepMeshExporter:
 
                 # part_world was computed above
                 link_from_part = link_world_inv @ part_world_mm
-                trsf = _matrix_to_trsf(link_from_part)
-                transformed = BRepBuilderAPI_Transform(shape, trsf, True).Shape()
-                builder.Add(compound, transformed)
-                has_valid_shapes = True
-                visual_parts.append((transformed, color))
 
                 part_name_from_list = (
                     part_names_list[idx] if idx < len(part_names_list) else None
                 )
+
+                keep_visual = keep_collision = True
+                if visual_filter.enabled or collision_filter.enabled:
+                    filter_name = part_name_from_list or getattr(part, "name", str(key))
+                    measurements = _measure(shape) if measure_filtered else None
+                    for part_filter, output in (
+                        (visual_filter, "visual"),
+                        (collision_filter, "collision"),
+                    ):
+                        if not part_filter.enabled:
+                            continue
+                        reason = _part_filter_reason(
+                            part_filter, filter_name, measurements
+                        )
+                        if reason:
+                            logger.debug(
+                                f"Dropping {filter_name} from {link_name} {output} mesh: {reason}"
+                            )
+                            if output == "visual":
+                                keep_visual = False
+                            else:
+                                keep_collision = False
+
+                filtered_parts.append(
+                    (
+                        shape,
+                        color,
+                        keep_visual,
+                        keep_collision,
+                        link_from_part,
+                    )
+                )
                 part_metadata_list.append(
                     {
                         "part_id": getattr(part, "partId", str(key)),
@@ -943,221 +1392,475 @@ class StepMeshExporter:
                         "mesh_match": "FOUND",
                     }
                 )
+                if inertia_method == "onshape":
+                    onshape_parts.append(onshape_mass_properties(part))
+
+            return filtered_parts, part_metadata_list, onshape_parts, link_missing_parts
 
-            if link_missing_parts:
-                missing_meshes[link_name] = link_missing_parts
+        coacd_tasks = []
+        # Geometry fingerprint -> first link exported with it
+        link_fingerprints: Dict[str, str] = {}
+        shared_links: Dict[str, str] = {}
 
-            if has_valid_shapes:
-                BRepMesh_IncrementalMesh(compound, self.deflection)
+        # Count links that have valid keys for progress tracking
+        processable_links = [
+            (ln, lk)
+            for ln, lk in link_records.items()
+            if lk.keys and (only_links is None or ln in only_links)
+        ]
+        ui.mesh_progress_start("Meshes", len(processable_links))
 
-                # Generate intermediate high-res STL
-                temp_stl = mesh_dir / f"{link_name}_raw.stl"
-                stl_writer.Write(compound, str(temp_stl))
+        # One set of decimation workers serves every link
+        with DecimationPool(visual_option.max_workers) as decimation_pool:
+            for link_name, link in link_records.items():
+                keys = link.keys
+                if not keys:
+                    continue
 
-                if report is not None and calc is not None:
-                    try:
-                        temp_step_inertia = mesh_dir / f"{link_name}_inertia.step"
-                        step_writer = STEPControl_Writer()
-                        step_writer.Transfer(compound, STEPControl_AsIs)
-                        step_writer.Write(str(temp_step_inertia))
-
-                        props = calc.compute_from_step_with_bom(
-                            temp_step_inertia,
-                            bom_entries,
-                            link_name,
-                            report,
-                            part_metadata=part_metadata_list,
-                        )
+                if only_links is None or link_name in only_links:
+                    ui.mesh_progress_advance("Meshes", link_name)
+
+                # Use CAD-derived transforms (same as ZIP path) for consistency with joint origins.
+                # The STEP shapes are in local part coordinates, so we use CAD API transforms
+                # to place them relative to the link frame.
+                valid_keys = [
+                    k
+                    for k in keys
+                    if self.cad.parts.get(k)
+                    and not getattr(self.cad.parts[k], "isRigidAssembly", False)
+                ]
+                if not valid_keys:
+                    continue
 
-                        if props:
-                            report.link_properties[link_name] = props
-                            logger.info(
-                                f"Computed inertia for {link_name}: mass={props.mass:.4f} kg"
+                link_world = getattr(link, "frame_transform", None)
+
+                # Reuse the previous export of this link if none of its inputs
+                # changed. Links outside only_links keep it either way.
+                selected = only_links is None or link_name in only_links
+                previous = None if selected else manifest.lookup(link_name)
+                resolved = None
+                if previous is None:
+                    link_inputs = inputs_digest(
+                        common_digest,
+                        link_name,
+                        link_world,
+                        getattr(link, "part_names", []),
+                        [
+                            (
+                                getattr(k, "path", None) or str(k),
+                                getattr(self.cad.parts[k], "partId", None),
+                                _part_world_matrix(self.cad.parts[k]),
+                                onshape_mass_properties(self.cad.parts[k])
+                                if inertia_method == "onshape"
+                                else None,
                             )
-
-                        if temp_step_inertia.exists():
-                            temp_step_inertia.unlink()
-                    except Exception as e:
+                            for k in valid_keys
+                        ],
+                    )
+                    # The link's shapes only need hashing after the STEP changed
+                    stored = manifest.links.get(link_name)
+                    geometry = stored.geometry if stored and step_unchanged else None
+                    if geometry is None:
+                        resolved = _resolve_parts(link_name, keys, link_world)
+                        geometry = _geometry_digest(
+                            resolved[0], resolved[3], _fingerprint
+                        )
+                    link_digest = inputs_digest(link_inputs, geometry)
+                    if selected:
+                        previous = manifest.lookup(link_name, link_digest)
+                shared_source = previous.mesh.get("shared_with") if previous else None
+                if shared_source and shared_source not in reused_links | kept_links:
+                    # The link it shared meshes with was rebuilt
+                    previous = None
+                if previous is not None:
+                    if selected:
+                        logger.debug(
+                            f"{link_name} is unchanged; reusing its previous export"
+                        )
+                        reused_links.add(link_name)
+                        link_digests[link_name] = link_digest
+                        link_geometries[link_name] = geometry
+                    else:
+                        kept_links.add(link_name)
+                    mesh_map[link_name] = copy.deepcopy(previous.mesh)
+                    if previous.missing:
+                        missing_meshes[link_name] = previous.missing
+                    if report is not None:
+                        previous.restore_inertia(link_name, report)
+                    continue
+                if not selected:
+                    logger.warning(
+                        f"{link_name} is not selected but has no previous export to "
+                        "keep; exporting it"
+                    )
+                if resolved is None:
+                    # The recorded geometry hash was for other inputs
+                    resolved = _resolve_parts(link_name, keys, link_world)
+                    geometry = _geometry_digest(resolved[0], resolved[3], _fingerprint)
+                    link_digest = inputs_digest(link_inputs, geometry)
+                link_digests[link_name] = link_digest
+                link_geometries[link_name] = geometry
+                (
+                    filtered_parts,
+                    part_metadata_list,
+                    onshape_parts,
+                    link_missing_parts,
+                ) = resolved
+
+                if link_missing_parts:
+                    missing_meshes[link_name] = link_missing_parts
+
+                if filtered_parts:
+                    dropped_visual = [p for p in filtered_parts if not p[2]]
+                    dropped_collision = [p for p in filtered_parts if not p[3]]
+
+                    if dropped_visual and len(dropped_visual) == len(filtered_parts):
                         logger.warning(
-                            f"Failed to compute inertia for {link_name}: {e}"
+                            f"Part filter would drop every part of {link_name} visual mesh; keeping all"
                         )
-
-                # Process with trimesh
-                try:
-                    visual_files = {}
-                    combined_mesh = None
-
-                    # Prepare combined mesh if needed for non-STL formats
-                    non_stl_formats = [f for f in visual_mesh_formats if f != "stl"]
-                    if non_stl_formats:
-                        # If no parts have color, we can just load the compound STL (faster)
-                        # But if at least one has color, we should process all to match structure
-                        has_colors = any(c is not None for _, c in visual_parts)
-
-                        if not has_colors:
-                            # Fast path
-                            combined_mesh = trimesh.load(str(temp_stl), force="mesh")
-                        else:
-                            # Use trimesh to combine parts with colors
-                            meshes_to_merge = []
-                            for i, (part_shape, part_color) in enumerate(visual_parts):
-                                # Export part_shape to temp STL
-                                part_stl_path = mesh_dir / f"{link_name}_part_{i}.stl"
-                                stl_writer.Write(part_shape, str(part_stl_path))
-
-                                part_mesh = trimesh.load(
-                                    str(part_stl_path), force="mesh"
+                        dropped_visual = []
+                    if dropped_collision and len(dropped_collision) == len(
+                        filtered_parts
+                    ):
+                        logger.warning(
+                            f"Part filter would drop every part of {link_name} collision mesh; keeping all"
+                        )
+                        dropped_collision = []
+
+                    dropped_visual_ids = {id(p) for p in dropped_visual}
+                    dropped_collision_ids = {id(p) for p in dropped_collision}
+                    if dropped_visual or dropped_collision:
+                        visual_faces = sum(_measure(p[0])[2] for p in dropped_visual)
+                        collision_faces = sum(
+                            _measure(p[0])[2] for p in dropped_collision
+                        )
+                        logger.info(
+                            f"Filtered small parts for {link_name}: "
+                            f"{len(dropped_visual)} visual ({visual_faces} B-rep faces), "
+                            f"{len(dropped_collision)} collision "
+                            f"({collision_faces} B-rep faces)"
+                        )
+                        if stats is not None:
+                            stats.filtered_visual_parts += len(dropped_visual)
+                            stats.filtered_visual_brep_faces += visual_faces
+                            stats.filtered_collision_parts += len(dropped_collision)
+                            stats.filtered_collision_brep_faces += collision_faces
+
+                    if report is not None and calc is not None:
+                        # Computed after the link loop; each distinct prototype
+                        # is integrated once and its instances placed in a batch
+                        prototypes: Dict[int, Any] = {}
+                        for p in filtered_parts:
+                            prototypes.setdefault(hash(p[0]), p[0])
+                        prototype_ids = {key: i for i, key in enumerate(prototypes)}
+                        compared = "mesh" if inertia_method == "exact" else "exact"
+                        methods = {inertia_method} | (
+                            {compared} if inertia_compare else set()
+                        )
+                        # Prototypes that must be integrated exactly: with
+                        # Onshape data, only those of parts Onshape has none for
+                        integrated = {
+                            prototype_ids[hash(p[0])]
+                            for p, known in zip(
+                                filtered_parts,
+                                onshape_parts or [None] * len(filtered_parts),
+                            )
+                            if "exact" in methods or known is None
+                        }
+                        try:
+                            # The mesh method integrates the tessellations the
+                            # link meshes reuse
+                            inertia_meshes = (
+                                [
+                                    self._tessellate(
+                                        shape, prototype_meshes, stl_writer, mesh_dir
+                                    )
+                                    for shape in prototypes.values()
+                                ]
+                                if "mesh" in methods
+                                else []
+                            )
+                            inertia_tasks.append(
+                                LinkInertiaTask(
+                                    link_name=link_name,
+                                    prototype_index=[
+                                        prototype_ids[hash(p[0])]
+                                        for p in filtered_parts
+                                    ],
+                                    transforms=np.stack([p[4] for p in filtered_parts]),
+                                    part_metadata=part_metadata_list,
+                                    bom_entries=calc.bom_subset(
+                                        bom_index,
+                                        link_name,
+                                        len(filtered_parts),
+                                        part_metadata_list,
+                                    ),
+                                    method=inertia_method,
+                                    compare=inertia_compare,
+                                    default_density=calc.default_density,
+                                    material_densities=material_densities,
+                                    shapes=[
+                                        shape if i in integrated else None
+                                        for i, shape in enumerate(prototypes.values())
+                                    ]
+                                    if methods != {"mesh"}
+                                    else [],
+                                    meshes=inertia_meshes,
+                                    onshape=onshape_parts,
                                 )
-                                part_stl_path.unlink()
-
-                                if part_color:
-                                    # part_color is (R, G, B) 0.0-1.0
-                                    rgba = [int(c * 255) for c in part_color] + [255]
-                                    part_mesh.visual.face_colors = rgba
+                            )
+                        except Exception as e:
+                            logger.warning(
+                                f"Failed to compute inertia for {link_name}: {e}"
+                            )
+                            failed_links.add(link_name)
+
+                    # Links with identical placed geometry share one set of meshes
+                    fingerprint = _link_fingerprint(filtered_parts)
+                    shared_source = link_fingerprints.setdefault(fingerprint, link_name)
+                    if shared_source != link_name:
+                        logger.info(
+                            f"{link_name} has the same geometry as {shared_source}; "
+                            "reusing its meshes"
+                        )
+                        shared_links[link_name] = shared_source
+                        continue
 
-                                meshes_to_merge.append(part_mesh)
+                    # Link meshes are placed copies of the prototype tessellations;
+                    # parts dropped from both meshes are never tessellated
+                    placed_parts: Dict[int, PartMesh] = {}
+                    for p in filtered_parts:
+                        if (
+                            id(p) in dropped_visual_ids
+                            and id(p) in dropped_collision_ids
+                        ):
+                            continue
+                        vertices, faces = self._tessellate(
+                            p[0], prototype_meshes, stl_writer, mesh_dir
+                        )
+                        placed_parts[id(p)] = PartMesh(
+                            *_place_mesh(vertices, faces, p[4]), p[1]
+                        )
 
-                            if meshes_to_merge:
-                                combined_mesh = trimesh.util.concatenate(
-                                    meshes_to_merge
-                                )
+                    # Intermediate high-res STL (collision source)
+                    temp_stl = mesh_dir / f"{link_name}_raw.stl"
+                    collision_mesh = _merge_parts(
+                        [
+                            placed_parts[id(p)]
+                            for p in filtered_parts
+                            if id(p) not in dropped_collision_ids
+                        ]
+                    )
+                    trimesh.Trimesh(
+                        collision_mesh.vertices, collision_mesh.faces, process=False
+                    ).export(str(temp_stl))
 
-                    for fmt in visual_mesh_formats:
-                        vis_filename = f"visual/{link_name}.{fmt}"
-                        vis_path = mesh_dir / vis_filename
-                        visual_files[fmt] = vis_filename
+                    # Visual meshes: welded once, then serialized to every format
+                    try:
+                        visual_files = {
+                            fmt: f"visual/{link_name}.{fmt}"
+                            for fmt in visual_mesh_formats
+                        }
+                        # Per-part submeshes keep colors and part boundaries
+                        part_meshes = [
+                            placed_parts[id(p)]
+                            for p in filtered_parts
+                            if id(p) not in dropped_visual_ids
+                        ]
+                        if any(p.color is not None for p in part_meshes):
+                            source_parts = part_meshes
+                        else:
+                            # Fast path: the whole visual mesh as one part
+                            source_parts = [_merge_parts(part_meshes)]
 
-                        if fmt == "stl":
-                            import shutil
+                        targets = {
+                            fmt: mesh_dir / vis_filename
+                            for fmt, vis_filename in visual_files.items()
+                        }
+                        emit_targets = dict(targets)
+                        if visual_option.instancing and "glb" in emit_targets:
+                            prototypes = self._visual_prototypes(
+                                [
+                                    p
+                                    for p in filtered_parts
+                                    if id(p) not in dropped_visual_ids
+                                ],
+                                prototype_meshes,
+                                stl_writer,
+                                mesh_dir,
+                            )
+                            write_instanced_glb(
+                                emit_targets.pop("glb"),
+                                prototypes,
+                                name=link_name,
+                                quantize=visual_option.glb_quantize,
+                            )
+                            logger.debug(
+                                f"Instanced {sum(len(t) for _, t in prototypes)} parts "
+                                f"of {link_name} as {len(prototypes)} meshes"
+                            )
+                        emit_visual_formats(
+                            WeldedMesh.from_parts(source_parts),
+                            emit_targets,
+                            link_name,
+                            quantize=visual_option.glb_quantize,
+                            max_workers=visual_option.max_workers,
+                        )
 
-                            shutil.copy(temp_stl, vis_path)
-                            continue
+                        # Size limit: one shared decimation for every oversized format
+                        lod0_parts = source_parts
+                        if max_size_bytes > 0 and _oversized_formats(
+                            targets, max_size_bytes
+                        ):
+                            if visual_option.decimation == "part_aware":
+                                source_parts = part_meshes
+                            lod0_parts = _fit_visual_size(
+                                source_parts,
+                                targets,
+                                max_size_bytes,
+                                link_name,
+                                strategy=visual_option.decimation,
+                                max_workers=visual_option.max_workers,
+                                quantize=visual_option.glb_quantize,
+                                pool=decimation_pool,
+                            )
 
-                        if combined_mesh:
-                            if fmt == "dae":
-                                # trimesh DAE export does not support vertex colors well (single material).
-                                # Use pymeshlab to convert OBJ (which supports colors) to DAE with vertex colors.
-                                temp_obj = mesh_dir / f"{link_name}_temp.obj"
-                                combined_mesh.export(str(temp_obj), file_type="obj")
+                        visual_lods: List[Dict[str, str]] = []
+                        if lod_ratios:
+                            # LOD 0 is the regular (size-limited) visual mesh
+                            for fmt, vis_filename in list(visual_files.items()):
+                                lod_filename = f"visual/lod0/{link_name}.{fmt}"
+                                (mesh_dir / vis_filename).replace(
+                                    mesh_dir / lod_filename
+                                )
+                                visual_files[fmt] = lod_filename
+                            visual_lods.append(dict(visual_files))
+
+                            # Progressive decimation: each level seeds the next one
+                            base_faces = sum(p.face_count for p in lod0_parts)
+                            lod_parts = lod0_parts
+                            for level, ratio in enumerate(lod_ratios, start=1):
+                                lod_parts = decimate_parts(
+                                    lod_parts,
+                                    max(int(base_faces * ratio), 100),
+                                    max_workers=visual_option.max_workers,
+                                    strategy=visual_option.decimation,
+                                    pool=decimation_pool,
+                                )
+                                level_files = {
+                                    fmt: f"visual/lod{level}/{link_name}.{fmt}"
+                                    for fmt in visual_mesh_formats
+                                }
+                                lod_mesh = WeldedMesh.from_parts(lod_parts)
+                                emit_visual_formats(
+                                    lod_mesh,
+                                    {
+                                        fmt: mesh_dir / f
+                                        for fmt, f in level_files.items()
+                                    },
+                                    link_name,
+                                    quantize=visual_option.glb_quantize,
+                                    max_workers=visual_option.max_workers,
+                                )
+                                visual_lods.append(level_files)
+                                logger.info(
+                                    f"Generated LOD {level} for {link_name} "
+                                    f"({lod_mesh.face_count} faces)"
+                                )
 
+                        try:
+                            collision_filenames = []
+                            if collision_option.method == "coacd":
+                                coacd_tasks.append(
+                                    (
+                                        link_name,
+                                        temp_stl,
+                                        collision_option.coacd,
+                                        mesh_dir,
+                                    )
+                                )
+                                col_result = []  # Placeholder
+                            elif collision_option.method == "fast":
+                                col_filename = f"collision/{link_name}_0.stl"
+                                col_path = mesh_dir / col_filename
                                 try:
                                     import pymeshlab
 
                                     ms = pymeshlab.MeshSet()
-                                    ms.load_new_mesh(str(temp_obj))
-                                    ms.save_current_mesh(str(vis_path))
-                                except Exception as e:
-                                    logger.debug(
-                                        f"PyMeshLab DAE conversion failed for {link_name}: {e}. Falling back to trimesh."
-                                    )
-                                    combined_mesh.export(vis_path, file_type="dae")
-                                finally:
-                                    if temp_obj.exists():
-                                        temp_obj.unlink()
-                            elif fmt == "obj":
-                                combined_mesh.export(vis_path, file_type="obj")
-                            else:
-                                combined_mesh.export(vis_path)
-
-                    if max_size_bytes > 0 and combined_mesh is not None:
-                        for fmt, vis_filename in visual_files.items():
-                            vis_path = mesh_dir / vis_filename
-                            if not vis_path.exists():
-                                continue
-                            file_size = vis_path.stat().st_size
-                            if file_size <= max_size_bytes:
-                                continue
-                            logger.info(
-                                f"Visual mesh {vis_filename} is {file_size / 1024 / 1024:.1f} MB, "
-                                f"compressing to {visual_option.max_size_mb:.1f} MB..."
-                            )
-                            _compress_visual_mesh(
-                                combined_mesh, vis_path, fmt, max_size_bytes, link_name
-                            )
-
-                    try:
-                        collision_filenames = []
-                        if collision_option.method == "coacd":
-                            coacd_tasks.append(
-                                (link_name, temp_stl, collision_option.coacd, mesh_dir)
-                            )
-                            col_result = []  # Placeholder
-                        elif collision_option.method == "fast":
-                            col_filename = f"collision/{link_name}_0.stl"
-                            col_path = mesh_dir / col_filename
-                            try:
-                                import pymeshlab
+                                    ms.load_new_mesh(str(temp_stl))
 
-                                ms = pymeshlab.MeshSet()
-                                ms.load_new_mesh(str(temp_stl))
+                                    # Generate Convex Hull
+                                    ms.generate_convex_hull()
 
-                                # Generate Convex Hull
-                                ms.generate_convex_hull()
+                                    # Simplify if needed (target 200 faces)
+                                    if ms.current_mesh().face_number() > 2000:
+                                        ms.meshing_decimation_quadric_edge_collapse(
+                                            targetfacenum=2000,
+                                        )
 
-                                # Simplify if needed (target 200 faces)
-                                if ms.current_mesh().face_number() > 2000:
-                                    ms.meshing_decimation_quadric_edge_collapse(
-                                        targetfacenum=2000,
+                                    ms.save_current_mesh(str(col_path))
+                                except Exception as e:
+                                    logger.debug(
+                                        f"Error creating fast collision mesh for {link_name}: {e}"
                                     )
+                                    fallback_links.add(link_name)
+                                    import shutil
 
-                                ms.save_current_mesh(str(col_path))
-                            except Exception as e:
-                                logger.debug(
-                                    f"Error creating fast collision mesh for {link_name}: {e}"
-                                )
+                                    shutil.copy(temp_stl, col_path)
+                                collision_filenames.append(col_filename)
+
+                            if (
+                                not collision_filenames
+                                and collision_option.method != "coacd"
+                            ):
+                                col_filename = f"collision/{link_name}_0.stl"
+                                col_path = mesh_dir / col_filename
                                 import shutil
 
                                 shutil.copy(temp_stl, col_path)
-                            collision_filenames.append(col_filename)
+                                collision_filenames.append(col_filename)
 
-                        if (
-                            not collision_filenames
-                            and collision_option.method != "coacd"
-                        ):
+                            col_result = collision_filenames
+
+                        except Exception as e:
+                            logger.warning(
+                                f"Error creating collision mesh for {link_name}: {e}"
+                            )
+                            # Fallback to single convex hull (pymeshlab or trimesh)
+                            fallback_links.add(link_name)
                             col_filename = f"collision/{link_name}_0.stl"
                             col_path = mesh_dir / col_filename
-                            import shutil
+                            try:
+                                import shutil
 
-                            shutil.copy(temp_stl, col_path)
-                            collision_filenames.append(col_filename)
+                                shutil.copy(temp_stl, col_path)
+                            except Exception:
+                                pass
+                            col_result = [col_filename]
+
+                        # Store both
+                        mesh_map[link_name] = {
+                            "visual": visual_files,
+                            "collision": col_result,
+                        }
+                        if visual_lods:
+                            mesh_map[link_name]["visual_lods"] = visual_lods
 
-                        col_result = collision_filenames
+                        # Clean up temp
+                        if collision_option.method != "coacd":
+                            temp_stl.unlink()
 
                     except Exception as e:
-                        logger.warning(
-                            f"Error creating collision mesh for {link_name}: {e}"
-                        )
-                        # Fallback to single convex hull (pymeshlab or trimesh)
-                        col_filename = f"collision/{link_name}_0.stl"
-                        col_path = mesh_dir / col_filename
-                        try:
-                            import shutil
-
-                            shutil.copy(temp_stl, col_path)
-                        except Exception:
-                            pass
-                        col_result = [col_filename]
-
-                    # Store both
-                    mesh_map[link_name] = {
-                        "visual": visual_files,
-                        "collision": col_result,
-                    }
-
-                    # Clean up temp
-                    if collision_option.method != "coacd":
-                        temp_stl.unlink()
-
-                except Exception as e:
-                    logger.warning(f"Error processing mesh for {link_name}: {e}")
-                    # Fallback to original STL behavior if trimesh fails
-                    final_stl = mesh_dir / "visual" / f"{link_name}.stl"
-                    if temp_stl.exists():
-                        temp_stl.rename(final_stl)
-                    mesh_map[link_name] = {
-                        "visual": {"stl": f"visual/{final_stl.name}"},
-                        "collision": f"visual/{final_stl.name}",
-                    }
+                        logger.warning(f"Error processing mesh for {link_name}: {e}")
+                        failed_links.add(link_name)
+                        # Fallback to original STL behavior if trimesh fails
+                        final_stl = mesh_dir / "visual" / f"{link_name}.stl"
+                        if temp_stl.exists():
+                            temp_stl.rename(final_stl)
+                        mesh_map[link_name] = {
+                            "visual": {"stl": f"visual/{final_stl.name}"},
+                            "collision": f"visual/{final_stl.name}",
+                        }
 
         ui.mesh_progress_done("Meshes")
 
@@ -1181,6 +1884,7 @@ class StepMeshExporter:
                         logger.error(f"CoACD worker failed for {link_name}: {e}")
                         col_filenames = []
                         result_link_name = link_name
+                        failed_links.add(link_name)
 
                     if result_link_name in mesh_map:
                         entry = mesh_map[result_link_name]
@@ -1204,6 +1908,82 @@ class StepMeshExporter:
                 detail += f", {coacd_fallback_count} fallbacks"
             ui.mesh_progress_done("CoACD collisions", detail)
 
+        # A failed source only has fallback meshes to share; its sharers
+        # take them for now and are exported again next time
+        degraded = {
+            link_name: source
+            for link_name, source in shared_links.items()
+            if source in failed_links | fallback_links
+        }
+        if degraded:
+            logger.warning(
+                "Fallback meshes shared with links of the same geometry: "
+                + ", ".join(f"{link} (from {src})" for link, src in degraded.items())
+            )
+            failed_links.update(degraded)
+        for link_name, source in shared_links.items():
+            if source in mesh_map:
+                mesh_map[link_name] = copy.deepcopy(mesh_map[source])
+                mesh_map[link_name]["shared_with"] = source
+        shared_count = len(shared_links) - len(degraded)
+        if shared_count:
+            logger.info(
+                f"Reused meshes for {shared_count} links with identical geometry"
+            )
+            if stats is not None:
+                stats.shared_mesh_links += shared_count
+
+        if report is not None and calc is not None and inertia_tasks:
+            ui.mesh_progress_start("Inertia", len(inertia_tasks))
+            results = run_inertia_stage(
+                inertia_tasks,
+                max_workers=inertia_max_workers,
+                calc=calc,
+                progress=lambda r: ui.mesh_progress_advance("Inertia", r.link_name),
+            )
+            ui.mesh_progress_done("Inertia")
+            computed_inertia_links, failed_inertia = merge_results(results, report)
+            failed_links.update(failed_inertia)
+            # All links computed in this run are validated in one batch
+            calc.validate_links(report, computed_inertia_links)
+
+        # Record this export; failed links are retried next time
+        if reused_links:
+            logger.info(f"Reused the previous export of {len(reused_links)} links")
+            if stats is not None:
+                stats.reused_links += len(reused_links)
+        if kept_links:
+            logger.info(
+                f"Kept the previous export of {len(kept_links)} unselected links"
+            )
+        manifest.links = {
+            link_name: manifest.links[link_name] for link_name in kept_links
+        } | {
+            link_name: LinkBuild.from_export(
+                digest,
+                mesh_map[link_name],
+                missing_meshes.get(link_name, []),
+                link_name,
+                report,
+                link_geometries[link_name],
+            )
+            for link_name, digest in link_digests.items()
+            if link_name in mesh_map and link_name not in failed_links
+        }
+        manifest.step_digest = step_digest
+        manifest.save()
+
+        cache = self.tessellation_cache
+        if cache is not None:
+            if cache.hits or cache.misses:
+                logger.info(
+                    f"Tessellation cache: {cache.hits} parts reused, "
+                    f"{cache.misses} tessellated"
+                )
+            if stats is not None:
+                stats.cached_tessellations += cache.hits
+            cache.prune()
+
         ui.finish_progress()
 
         return mesh_map, missing_meshes, report
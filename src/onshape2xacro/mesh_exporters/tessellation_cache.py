@@ -0,0 +1,183 @@
+"""Persistent cache of tessellated part prototypes.
+
+Robots built from the same part libraries (motors, bearings, extrusions,
+fasteners) tessellate the same B-reps over and over. Prototype meshes are
+stored under the user cache directory as compressed NumPy archives, keyed
+by a fingerprint of the B-rep and the meshing settings, and shared by
+every export on the machine.
+"""
+
+import hashlib
+import os
+from pathlib import Path
+from typing import Any, Optional, Tuple
+
+import numpy as np
+from loguru import logger
+from OCP.BRepAdaptor import BRepAdaptor_Surface
+from OCP.BRepBndLib import BRepBndLib
+from OCP.BRepGProp import BRepGProp
+from OCP.Bnd import Bnd_Box
+from OCP.GProp import GProp_GProps
+from OCP.TopAbs import (
+    TopAbs_EDGE,
+    TopAbs_FACE,
+    TopAbs_SHELL,
+    TopAbs_SOLID,
+    TopAbs_VERTEX,
+)
+from OCP.TopExp import TopExp_Explorer
+from OCP.TopoDS import TopoDS
+
+from onshape2xacro.cache import prune_lru, touch, user_cache_dir
+
+# Bump when the stored mesh layout, the tessellation pipeline or the
+# fingerprint changes
+CACHE_VERSION = 2
+
+
+def _g(value: float) -> str:
+    # Nine significant digits: stable across re-exports, distinct for real changes
+    return f"{value:.9g}"
+
+
+def _mm(value: float) -> str:
+    # Positions to 1 nm: roundoff near zero must not change the key, and
+    # -0 prints as 0
+    return f"{round(value, 6) + 0.0:.6f}"
+
+
+def _count(shape: Any, kind: Any) -> int:
+    count = 0
+    explorer = TopExp_Explorer(shape, kind)
+    while explorer.More():
+        count += 1
+        explorer.Next()
+    return count
+
+
+def shape_fingerprint(shape: Any) -> str:
+    """Hash a B-rep by topology counts, mass properties, bounds and faces.
+
+    Each face contributes its surface type, orientation, area and centroid,
+    so two shapes only collide if they have the same faces in the same
+    places. Positions are rounded to an absolute tolerance, so roundoff in
+    a re-exported STEP file does not change the hash.
+    """
+    digest = hashlib.sha1()
+    counts = [
+        _count(shape, kind)
+        for kind in (
+            TopAbs_SOLID,
+            TopAbs_SHELL,
+            TopAbs_FACE,
+            TopAbs_EDGE,
+            TopAbs_VERTEX,
+        )
+    ]
+    digest.update(repr(counts).encode())
+
+    props = GProp_GProps()
+    BRepGProp.VolumeProperties_s(shape, props)
+    com = props.CentreOfMass()
+    digest.update(
+        " ".join(
+            [_g(props.Mass())] + [_mm(v) for v in (com.X(), com.Y(), com.Z())]
+        ).encode()
+    )
+
+    box = Bnd_Box()
+    BRepBndLib.AddOptimal_s(shape, box, False, False)
+    if not box.IsVoid():
+        digest.update(" ".join(_mm(v) for v in box.Get()).encode())
+
+    faces = []
+    explorer = TopExp_Explorer(shape, TopAbs_FACE)
+    while explorer.More():
+        face = TopoDS.Face_s(explorer.Current())
+        face_props = GProp_GProps()
+        BRepGProp.SurfaceProperties_s(face, face_props)
+        centroid = face_props.CentreOfMass()
+        faces.append(
+            (
+                int(BRepAdaptor_Surface(face).GetType()),
+                int(face.Orientation()),
+                _g(face_props.Mass()),
+                _mm(centroid.X()),
+                _mm(centroid.Y()),
+                _mm(centroid.Z()),
+            )
+        )
+        explorer.Next()
+    digest.update(repr(sorted(faces)).encode())
+    return digest.hexdigest()
+
+
+class TessellationCache:
+    """Size-bounded LRU store of prototype meshes (vertices in mm, faces)."""
+
+    def __init__(self, directory: Path, max_size_mb: float):
+        self.directory = directory
+        self.max_bytes = int(max_size_mb * 1024 * 1024)
+        self.hits = 0
+        self.misses = 0
+
+    @classmethod
+    def open(cls, max_size_mb: float) -> Optional["TessellationCache"]:
+        """The user-level cache, or None when ``max_size_mb`` disables it."""
+        if max_size_mb <= 0:
+            return None
+        directory = user_cache_dir("tessellation")
+        try:
+            directory.mkdir(parents=True, exist_ok=True)
+        except OSError as e:
+            logger.warning(f"Tessellation cache disabled: {e}")
+            return None
+        return cls(directory, max_size_mb)
+
+    def key(self, shape: Any, deflection: float) -> str:
+        from OCP import __version__ as ocp_version
+
+        payload = f"{CACHE_VERSION}|{ocp_version}|{deflection!r}|"
+        return hashlib.sha1((payload + shape_fingerprint(shape)).encode()).hexdigest()
+
+    def _path(self, key: str) -> Path:
+        return self.directory / f"{key}.npz"
+
+    def get(self, key: str) -> Optional[Tuple[np.ndarray, np.ndarray]]:
+        path = self._path(key)
+        try:
+            with np.load(path) as data:
+                vertices = data["vertices"].astype(np.float64)
+                faces = data["faces"].astype(np.int64)
+        except FileNotFoundError:
+            self.misses += 1
+            return None
+        except Exception as e:
+            logger.debug(f"Dropping unreadable tessellation cache entry {path}: {e}")
+            path.unlink(missing_ok=True)
+            self.misses += 1
+            return None
+        touch(path)
+        self.hits += 1
+        return vertices, faces
+
+    def put(self, key: str, vertices: np.ndarray, faces: np.ndarray) -> None:
+        # The exporter rounds tessellations to float32, so this is lossless
+        index_type = np.uint16 if len(vertices) <= 1 << 16 else np.uint32
+        tmp_path = self._path(key).with_suffix(f".{os.getpid()}.tmp")
+        try:
+            with open(tmp_path, "wb") as f:
+                np.savez_compressed(
+                    f,
+                    vertices=np.asarray(vertices, dtype=np.float32),
+                    faces=np.asarray(faces, dtype=index_type),
+                )
+            tmp_path.replace(self._path(key))
+        except OSError as e:
+            logger.debug(f"Could not write tessellation cache entry: {e}")
+            tmp_path.unlink(missing_ok=True)
+
+    def prune(self) -> None:
+        """Evict the least recently used entries beyond the size limit."""
+        prune_lru(self.directory, self.max_bytes, "*.npz")
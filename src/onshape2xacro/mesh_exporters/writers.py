@@ -0,0 +1,265 @@
+"""Visual mesh format writers.
+
+Every format is serialized from the same :class:`WeldedMesh` buffers, and
+``emit_visual_formats`` writes all requested formats of a link
+concurrently in a thread pool.
+
+Text formats (OBJ, DAE) are formatted a block of rows at a time: one
+``%`` formatting call per block with the row format repeated, instead of
+one call per vertex or face. Binary formats (STL, PLY) are packed into
+structured NumPy records and written with a single call.
+"""
+
+from __future__ import annotations
+
+import struct
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import IO, Any, Dict, Iterator, List, Optional, Tuple
+from xml.sax.saxutils import escape
+
+import numpy as np
+
+from onshape2xacro.mesh_exporters.buffers import WeldedMesh
+from onshape2xacro.mesh_exporters.gltf import write_glb
+
+# Formats written by this module; anything else goes through trimesh
+NATIVE_FORMATS = ("obj", "dae", "ply", "stl", "glb")
+# Rows formatted per block: bounds the temporary strings to a few tens of MB
+BLOCK_ROWS = 1 << 18
+WRITE_BUFFER = 1 << 22
+
+_STL_RECORD = np.dtype(
+    [("normal", "<f4", (3,)), ("vertices", "<f4", (3, 3)), ("attribute", "<u2")]
+)
+_PLY_FACE = np.dtype([("count", "u1"), ("indices", "<i4", (3,))])
+
+
+def _format_rows(row_format: str, rows: np.ndarray) -> Iterator[str]:
+    """Yield ``rows`` formatted with ``row_format``, one string per block."""
+    rows = rows.reshape(len(rows), -1)
+    for start in range(0, len(rows), BLOCK_ROWS):
+        block = rows[start : start + BLOCK_ROWS]
+        yield (row_format * len(block)) % tuple(block.ravel().tolist())
+
+
+def _write_rows(f: IO[str], row_format: str, rows: np.ndarray) -> None:
+    for text in _format_rows(row_format, rows):
+        f.write(text)
+
+
+def _rgb(color: Optional[Tuple[float, float, float]]) -> Tuple[float, float, float]:
+    # Uncolored groups are white, as in WeldedMesh.concatenated
+    return (1.0, 1.0, 1.0) if color is None else tuple(float(c) for c in color[:3])
+
+
+def _vertex_colors(mesh: WeldedMesh) -> np.ndarray:
+    """Per-vertex RGB (0-1) from each group's color."""
+    return np.concatenate(
+        [np.tile(np.array(_rgb(g.color)), (len(g.positions), 1)) for g in mesh.groups]
+        or [np.zeros((0, 3))]
+    )
+
+
+def write_obj(path: Path, mesh: WeldedMesh) -> None:
+    """Write a Wavefront OBJ with normals and, when colored, vertex colors."""
+    positions, normals, triangles, _ = mesh.concatenated()
+    # 1-based indices, the same for position and normal: "f a//a b//b c//c"
+    faces = np.repeat(triangles + 1, 2, axis=1)
+    with open(path, "w", buffering=WRITE_BUFFER) as f:
+        f.write("# onshape2xacro\n")
+        if mesh.has_colors:
+            _write_rows(
+                f,
+                "v %.6f %.6f %.6f %.4f %.4f %.4f\n",
+                np.hstack([positions, _vertex_colors(mesh)]),
+            )
+        else:
+            _write_rows(f, "v %.6f %.6f %.6f\n", positions)
+        _write_rows(f, "vn %.6f %.6f %.6f\n", normals)
+        _write_rows(f, "f %d//%d %d//%d %d//%d\n", faces)
+
+
+def write_ply(path: Path, mesh: WeldedMesh) -> None:
+    """Write a binary little-endian PLY with normals and vertex colors."""
+    positions, normals, triangles, _ = mesh.concatenated()
+    fields = [("position", "<f4", (3,)), ("normal", "<f4", (3,))]
+    if mesh.has_colors:
+        fields.append(("color", "u1", (4,)))
+    vertices = np.zeros(len(positions), dtype=np.dtype(fields))
+    vertices["position"] = positions
+    vertices["normal"] = normals
+    if mesh.has_colors:
+        rgb = np.round(_vertex_colors(mesh) * 255).astype(np.uint8)
+        vertices["color"] = np.hstack([rgb, np.full((len(rgb), 1), 255, np.uint8)])
+    faces = np.zeros(len(triangles), dtype=_PLY_FACE)
+    faces["count"] = 3
+    faces["indices"] = triangles
+
+    header = [
+        "ply",
+        "format binary_little_endian 1.0",
+        "comment onshape2xacro",
+        f"element vertex {len(vertices)}",
+        "property float x",
+        "property float y",
+        "property float z",
+        "property float nx",
+        "property float ny",
+        "property float nz",
+    ]
+    if mesh.has_colors:
+        header += [f"property uchar {c}" for c in ("red", "green", "blue", "alpha")]
+    header += [
+        f"element face {len(faces)}",
+        "property list uchar int vertex_indices",
+        "end_header",
+    ]
+    with open(path, "wb") as f:
+        f.write(("\n".join(header) + "\n").encode("ascii"))
+        f.write(vertices.tobytes())
+        f.write(faces.tobytes())
+
+
+def write_stl(path: Path, mesh: WeldedMesh) -> None:
+    """Write a binary STL file."""
+    positions, _, triangles, _ = mesh.concatenated()
+    corners = positions[triangles]
+    normals = np.cross(corners[:, 1] - corners[:, 0], corners[:, 2] - corners[:, 0])
+    lengths = np.linalg.norm(normals, axis=1, keepdims=True)
+    normals = np.divide(normals, lengths, out=np.zeros_like(normals), where=lengths > 0)
+
+    records = np.zeros(len(triangles), dtype=_STL_RECORD)
+    records["normal"] = normals
+    records["vertices"] = corners
+    with open(path, "wb") as f:
+        f.write(b"onshape2xacro".ljust(80, b" "))
+        f.write(struct.pack("<I", len(records)))
+        f.write(records.tobytes())
+
+
+def _dae_float_array(f: IO[str], array_id: str, rows: np.ndarray) -> None:
+    f.write(f'<float_array id="{array_id}" count="{rows.size}">')
+    _write_rows(f, "%.6f %.6f %.6f ", rows)
+    f.write("</float_array>\n")
+
+
+def write_dae(path: Path, mesh: WeldedMesh, name: str = "mesh") -> None:
+    """Write a COLLADA file with one material per color group.
+
+    Materials (rather than vertex colors) keep part colors in RViz and
+    Gazebo, which both ignore COLLADA vertex colors.
+    """
+    name = escape(name, {'"': "&quot;"})
+    positions, normals, _, _ = mesh.concatenated()
+    geometry = f"{name}-mesh"
+    materials: List[str] = []
+    with open(path, "w", buffering=WRITE_BUFFER) as f:
+        f.write(
+            '<?xml version="1.0" encoding="utf-8"?>\n'
+            '<COLLADA xmlns="http://www.collada.org/2005/11/COLLADASchema" '
+            'version="1.4.1">\n'
+            "<asset><contributor><authoring_tool>onshape2xacro</authoring_tool>"
+            '</contributor><unit name="meter" meter="1"/><up_axis>Z_UP</up_axis>'
+            "</asset>\n<library_effects>\n"
+        )
+        for i, group in enumerate(mesh.groups):
+            r, g, b = _rgb(group.color)
+            f.write(
+                f'<effect id="effect{i}"><profile_COMMON><technique sid="common">'
+                f"<phong><diffuse><color>{r:.4f} {g:.4f} {b:.4f} 1</color></diffuse>"
+                "</phong></technique></profile_COMMON></effect>\n"
+            )
+            materials.append(f"material{i}")
+        f.write("</library_effects>\n<library_materials>\n")
+        for i, material in enumerate(materials):
+            f.write(
+                f'<material id="{material}"><instance_effect url="#effect{i}"/>'
+                "</material>\n"
+            )
+        f.write(
+            "</library_materials>\n<library_geometries>\n"
+            f'<geometry id="{geometry}" name="{name}"><mesh>\n'
+            f'<source id="{geometry}-positions">'
+        )
+        _dae_float_array(f, f"{geometry}-positions-array", positions)
+        f.write(
+            f'<technique_common><accessor source="#{geometry}-positions-array" '
+            f'count="{len(positions)}" stride="3"><param name="X" type="float"/>'
+            '<param name="Y" type="float"/><param name="Z" type="float"/>'
+            "</accessor></technique_common></source>\n"
+            f'<source id="{geometry}-normals">'
+        )
+        _dae_float_array(f, f"{geometry}-normals-array", normals)
+        f.write(
+            f'<technique_common><accessor source="#{geometry}-normals-array" '
+            f'count="{len(normals)}" stride="3"><param name="X" type="float"/>'
+            '<param name="Y" type="float"/><param name="Z" type="float"/>'
+            "</accessor></technique_common></source>\n"
+            f'<vertices id="{geometry}-vertices">'
+            f'<input semantic="POSITION" source="#{geometry}-positions"/>'
+            f'<input semantic="NORMAL" source="#{geometry}-normals"/></vertices>\n'
+        )
+        offset = 0
+        for group, material in zip(mesh.groups, materials):
+            f.write(
+                f'<triangles material="{material}" count="{len(group.triangles)}">'
+                f'<input semantic="VERTEX" source="#{geometry}-vertices" offset="0"/>'
+                "<p>"
+            )
+            _write_rows(f, "%d %d %d ", group.triangles + offset)
+            f.write("</p></triangles>\n")
+            offset += len(group.positions)
+        f.write(
+            "</mesh></geometry>\n</library_geometries>\n"
+            '<library_visual_scenes><visual_scene id="scene">'
+            f'<node id="{name}" name="{name}">'
+            f'<instance_geometry url="#{geometry}"><bind_material><technique_common>'
+        )
+        for material in materials:
+            f.write(f'<instance_material symbol="{material}" target="#{material}"/>')
+        f.write(
+            "</technique_common></bind_material></instance_geometry></node>"
+            "</visual_scene></library_visual_scenes>\n"
+            '<scene><instance_visual_scene url="#scene"/></scene>\n</COLLADA>\n'
+        )
+
+
+def emit_visual_formats(
+    mesh: WeldedMesh,
+    targets: Dict[str, Path],
+    name: str,
+    quantize: bool = False,
+    max_workers: int = 4,
+) -> None:
+    """Write ``mesh`` to every ``format -> path`` in ``targets``.
+
+    Formats are written concurrently when ``max_workers > 1``. Formats
+    without a native writer share one trimesh copy of the buffers.
+    """
+    shared: Optional[Any] = None
+    if set(targets) - set(NATIVE_FORMATS):
+        shared = mesh.to_trimesh()
+
+    def _write(fmt: str, path: Path) -> None:
+        if fmt == "glb":
+            write_glb(path, mesh, name=name, quantize=quantize)
+        elif fmt == "stl":
+            write_stl(path, mesh)
+        elif fmt == "obj":
+            write_obj(path, mesh)
+        elif fmt == "ply":
+            write_ply(path, mesh)
+        elif fmt == "dae":
+            write_dae(path, mesh, name)
+        else:
+            shared.export(path)
+
+    if max_workers > 1 and len(targets) > 1:
+        with ThreadPoolExecutor(max_workers=min(max_workers, len(targets))) as pool:
+            futures = [pool.submit(_write, fmt, path) for fmt, path in targets.items()]
+            for future in futures:
+                future.result()
+    else:
+        for fmt, path in targets.items():
+            _write(fmt, path)
@@ -1,9 +1,15 @@
 import asyncio
+import hashlib
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from functools import lru_cache
-from typing import Optional, List, Any
+from typing import Optional, List, Any, Union
+
+import requests
 from loguru import logger
 
 from onshape_robotics_toolkit import CAD, Client
+from onshape_robotics_toolkit.connect import BASE_URL, HTTP
 from onshape_robotics_toolkit.models.assembly import (
     RootAssembly,
     SubAssembly,
@@ -25,17 +31,215 @@ from onshape_robotics_toolkit.utilities.helpers import (
 )
 from onshape_robotics_toolkit.config import update_mate_limits
 
+from onshape2xacro.http_cache import HttpCache, cacheable, document_address
+from onshape2xacro.scheduler import (
+    DEFAULT_MAX_CONCURRENCY,
+    RequestScheduler,
+    gather_bounded,
+)
+
 
 class OptimizedClient(Client):
     """
     Optimized version of Client class with cached metadata fetches.
+
+    With an ``http_cache``, GET requests for document content are served
+    from disk when possible: version and microversion responses forever,
+    workspace responses while the workspace's microversion is unchanged.
+    Requests that do reach the network go through ``scheduler`` (rate
+    limit, bounded concurrency, retries, connection reuse).
     """
 
+    def __init__(
+        self,
+        env: Optional[str] = None,
+        base_url: str = BASE_URL,
+        http_cache: Optional[HttpCache] = None,
+        scheduler: Optional[RequestScheduler] = None,
+    ):
+        super().__init__(env=env, base_url=base_url)
+        self.http_cache = http_cache
+        self.scheduler = scheduler or RequestScheduler()
+        self._microversions: dict[tuple[str, str], Optional[str]] = {}
+        self._microversions_lock = threading.Lock()
+
     @lru_cache(maxsize=128)
     def get_document_metadata(self, did: str) -> DocumentMetaData:
         logger.debug(f"Fetching document metadata for {did} (cached)")
         return super().get_document_metadata(did)
 
+    def current_microversion(self, did: str, wid: str) -> Optional[str]:
+        """Workspace microversion, looked up once per client."""
+        with self._microversions_lock:
+            if (did, wid) in self._microversions:
+                return self._microversions[(did, wid)]
+        path = f"/api/documents/d/{did}/w/{wid}/currentmicroversion"
+        res = self.scheduler.retrying(
+            path,
+            lambda: super(OptimizedClient, self).request(
+                HTTP.GET, path, log_response=False
+            ),
+        )
+        microversion = None
+        if res.status_code == 200:
+            microversion = res.json().get("microversion")
+        else:
+            logger.debug(
+                f"Could not get the microversion of {did}/w/{wid} "
+                f"({res.status_code}); not caching its requests"
+            )
+        with self._microversions_lock:
+            return self._microversions.setdefault((did, wid), microversion)
+
+    def request(
+        self,
+        method: HTTP,
+        path: str,
+        query: Optional[dict[str, Any]] = None,
+        headers: Optional[dict[str, Any]] = None,
+        body: Optional[Union[dict[str, Any], list[dict[str, Any]]]] = None,
+        base_url: Optional[str] = None,
+        log_response: bool = True,
+        timeout: int = 50,
+    ) -> requests.Response:
+        def send() -> requests.Response:
+            # Each attempt is signed anew
+            return self.scheduler.retrying(
+                path,
+                lambda: super(OptimizedClient, self).request(
+                    method,
+                    path,
+                    query=query,
+                    headers=headers,
+                    body=body,
+                    base_url=base_url,
+                    log_response=log_response,
+                    timeout=timeout,
+                ),
+            )
+
+        cache = self.http_cache
+        address = (
+            document_address(path) if cache is not None and method == HTTP.GET else None
+        )
+        if address is None:
+            return send()
+
+        did, wvm, wvmid = address
+        version = self.current_microversion(did, wvmid) if wvm == "w" else wvmid
+        if version is None:
+            return send()
+
+        key = cache.key(
+            base_url or self._url,
+            # Accounts may see different documents
+            hashlib.sha1(str(self._access_key).encode()).hexdigest(),
+            path,
+            sorted((query or {}).items()),
+            sorted((headers or {}).items()),
+            version,
+        )
+        cached = cache.get(key, url=path)
+        if cached is not None:
+            return cached
+        res = send()
+        if cacheable(res):
+            cache.put(key, res)
+        return res
+
+    def _send_request(
+        self,
+        method: HTTP,
+        url: str,
+        headers: dict[str, Any],
+        body: Optional[Union[dict[str, Any], list[dict[str, Any]]]],
+        timeout: int,
+    ) -> requests.Response:
+        return self.scheduler.send(method, url, headers, body, timeout)
+
+
+def _max_concurrency(client: Client) -> int:
+    """Requests a fan-out may have in flight: the client scheduler's bound."""
+    scheduler = getattr(client, "scheduler", None)
+    if isinstance(scheduler, RequestScheduler):
+        return scheduler.max_concurrency
+    return DEFAULT_MAX_CONCURRENCY
+
+
+def _warn_failures(results: list[Any], what: str) -> None:
+    failed = sum(result is not True for result in results)
+    if failed:
+        logger.warning(f"Could not fetch {failed} of {len(results)} {what}")
+
+
+def _param_expression(params: dict[str, Any], name: str) -> str | None:
+    param = params.get(name)
+    if not isinstance(param, dict):
+        return None
+    if param.get("typeName") == "BTMParameterNullableQuantity":
+        message = param.get("message", {})
+        if not isinstance(message, dict) or message.get("isNull", True):
+            return None
+        expression = message.get("expression")
+        return expression if isinstance(expression, str) else None
+    return None
+
+
+def _apply_mate_limits(
+    features: Any,
+    assembly_keys: list[Optional[PathKey]],
+    mate_lookup: dict[tuple[Optional[PathKey], str], list[MateFeatureData]],
+) -> int:
+    """Set the limits of one definition's mate features on every instance.
+
+    Each feature's limits are parsed once and applied to the matching
+    mates of all instances of the definition. Returns the number of mates
+    that got limits.
+    """
+    count = 0
+    for feature in features.features:
+        if feature.message.featureType != "mate":
+            continue
+
+        feature_id = feature.message.featureId
+
+        params = feature.message.parameter_dict()
+        limits_enabled = params.get("limitsEnabled")
+        if limits_enabled is None or not limits_enabled.get("message", {}).get(
+            "value", False
+        ):
+            continue
+
+        target_mates: List[MateFeatureData] = []
+        for assembly_key in assembly_keys:
+            found_mates = mate_lookup.get((assembly_key, feature_id))
+            if found_mates:
+                target_mates.extend(found_mates)
+
+        if not target_mates:
+            continue
+
+        is_axial = target_mates[0].mateType in (
+            MateType.REVOLUTE,
+            MateType.CYLINDRICAL,
+        )
+        prefix = "limitAxialZ" if is_axial else "limitZ"
+        min_value = parse_onshape_expression(_param_expression(params, prefix + "Min"))
+        max_value = parse_onshape_expression(_param_expression(params, prefix + "Max"))
+        if min_value is None or max_value is None:
+            continue
+
+        limits = {"min": min_value, "max": max_value}
+        for mate in target_mates:
+            mate.limits = limits
+            update_mate_limits(get_sanitized_name(mate.name), limits)
+            count += 1
+            logger.debug(
+                f"Set limits for mate '{mate.name}' ({mate.mateType}): "
+                f"min={min_value:.4f}, max={max_value:.4f}"
+            )
+    return count
+
 
 class OptimizedCAD(CAD):
     """
@@ -90,7 +294,7 @@ class OptimizedCAD(CAD):
             definition_id: tuple[str, str, str, str],
             instances: list[tuple[PathKey, SubAssembly]],
             client: Client,
-        ) -> None:
+        ) -> bool:
             did, wtype, wid, eid = definition_id
             try:
                 logger.debug(
@@ -138,6 +342,8 @@ class OptimizedCAD(CAD):
                 logger.error(
                     f"Failed to fetch root assembly for subassembly definition {definition_id}: {e}"
                 )
+                return False
+            return True
 
         instances_by_def: dict[
             tuple[str, str, str, str], list[tuple[PathKey, SubAssembly]]
@@ -167,7 +373,8 @@ class OptimizedCAD(CAD):
             tasks.append(_fetch_and_populate(def_id, instances, client))
 
         if tasks:
-            await asyncio.gather(*tasks, return_exceptions=True)
+            results = await gather_bounded(tasks, _max_concurrency(client))
+            _warn_failures(results, "subassembly definitions")
 
     def fetch_mate_limits(self, client: Optional[Client]) -> None:
         """
@@ -203,89 +410,34 @@ class OptimizedCAD(CAD):
             if mate.id:
                 mate_lookup.setdefault((asm_key, mate.id), []).append(mate)
 
+        def _fetch_features(def_id: tuple[str, str, str, str]) -> Any:
+            did, wtype, wid, eid = def_id
+            logger.debug(
+                f"Fetching features for assembly definition: {did}/{wid}/{eid} "
+                f"(used by {len(assembly_groups[def_id])} instances)"
+            )
+            return client.get_features(did=did, wtype=wtype, wid=wid, eid=eid)
+
+        # Fetched concurrently, applied in definition order: the same result
+        # as fetching one definition after the other
         limits_found_count = 0
-        for (did, wtype, wid, eid), assembly_keys in assembly_groups.items():
-            try:
-                logger.debug(
-                    f"Fetching features for assembly definition: {did}/{wid}/{eid} (used by {len(assembly_keys)} instances)"
-                )
-                features = client.get_features(did=did, wtype=wtype, wid=wid, eid=eid)
-
-                for feature in features.features:
-                    if feature.message.featureType != "mate":
-                        continue
-
-                    feature_id = feature.message.featureId
-
-                    params = feature.message.parameter_dict()
-                    limits_enabled = params.get("limitsEnabled")
-                    if limits_enabled is None or not limits_enabled.get(
-                        "message", {}
-                    ).get("value", False):
-                        continue
-
-                    target_mates: List[MateFeatureData] = []
-                    for assembly_key in assembly_keys:
-                        found_mates = mate_lookup.get((assembly_key, feature_id))
-                        if found_mates:
-                            target_mates.extend(found_mates)
-
-                    if not target_mates:
-                        continue
-
-                    first_mate = target_mates[0]
-                    is_axial = first_mate.mateType in (
-                        MateType.REVOLUTE,
-                        MateType.CYLINDRICAL,
+        with ThreadPoolExecutor(
+            max_workers=min(_max_concurrency(client), len(assembly_groups))
+        ) as pool:
+            pending = {
+                def_id: pool.submit(_fetch_features, def_id)
+                for def_id in assembly_groups
+            }
+            for (did, wtype, wid, eid), assembly_keys in assembly_groups.items():
+                try:
+                    features = pending[(did, wtype, wid, eid)].result()
+                    limits_found_count += _apply_mate_limits(
+                        features, assembly_keys, mate_lookup
+                    )
+                except Exception as e:
+                    logger.warning(
+                        f"Failed to fetch features for assembly definition {did}/{wid}/{eid}: {e}"
                     )
-
-                    if is_axial:
-                        min_param_name = "limitAxialZMin"
-                        max_param_name = "limitAxialZMax"
-                    else:
-                        min_param_name = "limitZMin"
-                        max_param_name = "limitZMax"
-
-                    def get_param_expression(
-                        param_dict: dict[str, Any], param_name: str
-                    ) -> str | None:
-                        param = param_dict.get(param_name)
-                        if not isinstance(param, dict):
-                            return None
-                        if param.get("typeName") == "BTMParameterNullableQuantity":
-                            message = param.get("message", {})
-                            if not isinstance(message, dict) or message.get(
-                                "isNull", True
-                            ):
-                                return None
-                            expression = message.get("expression")
-                            return expression if isinstance(expression, str) else None
-                        return None
-
-                    min_expression = get_param_expression(params, min_param_name)
-                    max_expression = get_param_expression(params, max_param_name)
-
-                    min_value = parse_onshape_expression(min_expression)
-                    max_value = parse_onshape_expression(max_expression)
-
-                    if min_value is not None and max_value is not None:
-                        limits = {"min": min_value, "max": max_value}
-
-                        for mate in target_mates:
-                            mate.limits = limits
-                            sanitized_mate_name = get_sanitized_name(mate.name)
-                            update_mate_limits(sanitized_mate_name, limits)
-                            limits_found_count += 1
-                            logger.debug(
-                                f"Set limits for mate '{mate.name}' ({mate.mateType}): "
-                                f"min={min_value:.4f}, max={max_value:.4f}"
-                            )
-
-            except Exception as e:
-                logger.warning(
-                    f"Failed to fetch features for assembly definition {did}/{wid}/{eid}: {e}"
-                )
-                continue
 
         logger.info(
             f"Fetched limits for {limits_found_count} mates out of {len(self.mates)} total mates"
@@ -331,7 +483,7 @@ class OptimizedCAD(CAD):
 
         async def _fetch_and_assign(
             def_id: tuple[str, str, str, str, str], parts: list[Part], client: Client
-        ) -> None:
+        ) -> bool:
             did, wtype, wid, eid, partID = def_id
             try:
                 logger.debug(
@@ -362,10 +514,13 @@ class OptimizedCAD(CAD):
 
             except Exception as e:
                 logger.error(f"Failed to fetch mass properties for {def_id}: {e}")
+                return False
+            return True
 
         tasks = []
         for def_id, parts in parts_by_def.items():
             tasks.append(_fetch_and_assign(def_id, parts, client))
 
         if tasks:
-            await asyncio.gather(*tasks, return_exceptions=True)
+            results = await gather_bounded(tasks, _max_concurrency(client))
+            _warn_failures(results, "mass property definitions")
@@ -1,6 +1,6 @@
 import os
 from pathlib import Path
-from typing import Dict, Any
+from typing import Any, Callable, Dict
 import numpy as np
 from onshape_robotics_toolkit import Client, CAD, KinematicGraph
 from onshape2xacro.optimized_cad import OptimizedCAD, OptimizedClient
@@ -9,6 +9,9 @@ from onshape2xacro.condensed_robot import CondensedRobot
 from onshape2xacro.serializers import XacroSerializer
 from onshape2xacro.config.export_config import ExportConfiguration
 from onshape2xacro.config import ConfigOverride
+from onshape2xacro.mesh_exporters.tessellation_cache import TessellationCache
+from onshape2xacro.http_cache import HttpCache
+from onshape2xacro.scheduler import RequestScheduler
 from onshape2xacro.schema import (
     AuthConfig,
     AuthLogoutConfig,
@@ -47,8 +50,20 @@ def _setup_credentials():
     return access_key, secret_key
 
 
-def _get_client_and_cad(url: str, max_depth: int) -> tuple[Client, CAD]:
-    """Setup client and fetch CAD assembly."""
+def _get_client_and_cad(
+    url: str,
+    max_depth: int,
+    http_cache_mb: float = 0,
+    scheduler: RequestScheduler | None = None,
+    on_client: Callable[[Client], CAD | None] | None = None,
+) -> tuple[Client, CAD]:
+    """Setup client and fetch CAD assembly.
+
+    ``http_cache_mb`` > 0 serves repeated API requests from the user-level
+    HTTP cache; ``scheduler`` paces the others (a default one otherwise).
+    ``on_client`` is called with the client before the assembly is fetched;
+    a CAD it returns is used instead of fetching one.
+    """
     if not _setup_credentials()[0]:
         raise ValueError(
             "Onshape credentials not found. Either:\n"
@@ -56,7 +71,16 @@ def _get_client_and_cad(url: str, max_depth: int) -> tuple[Client, CAD]:
             "  2. Run 'onshape2xacro auth login' to store credentials in system keyring"
         )
 
-    client = OptimizedClient(env=None, base_url="https://cad.onshape.com")
+    client = OptimizedClient(
+        env=None,
+        base_url="https://cad.onshape.com",
+        http_cache=HttpCache.open(http_cache_mb),
+        scheduler=scheduler,
+    )
+    if on_client is not None:
+        cad = on_client(client)
+        if cad is not None:
+            return client, cad
     print(f"Fetching assembly from {url}...")
     cad = OptimizedCAD.from_url(
         url, client=client, max_depth=max_depth, fetch_mass_properties=False
@@ -212,9 +236,18 @@ def run_export(
         download_assets=True,
         config=override,
         bom_path=bom_path,
+        inertia_method=export_configuration.export.inertia_method,
+        inertia_compare=export_configuration.export.inertia_compare,
+        inertia_max_workers=export_configuration.export.inertia_max_workers,
+        material_densities=export_configuration.export.material_densities,
         visual_option=visual_option,
         collision_option=export_configuration.export.collision_option,
         ui=ui,
+        only_links=getattr(config, "only_links", None),
+        subtree=getattr(config, "subtree", None),
+        tessellation_cache=TessellationCache.open(
+            getattr(config, "tessellation_cache_mb", 0)
+        ),
     )
     ui.phase_done("serialize")
 
@@ -234,23 +267,127 @@ def run_visualize(config: VisualizeConfig):
 
 def run_fetch_cad(config: FetchCadConfig):
     """Fetch CAD data and save to a directory."""
+    import asyncio
     import pickle
     import shutil
-    from onshape2xacro.mesh_exporters.step import StepMeshExporter
+    from loguru import logger
+    from onshape_robotics_toolkit.models.document import parse_url
+    from onshape2xacro.mesh_exporters.step import StepMeshExporter, StepTranslation
     from onshape2xacro.config.export_config import ExportConfiguration, ExportOptions
-
-    client, cad = _get_client_and_cad(config.url, config.max_depth)
+    from onshape2xacro.fetch_state import FetchState, PendingTranslation
 
     output_dir = Path(config.output)
+    previous = FetchState.load(output_dir)
+    pending = PendingTranslation.load(output_dir)
+    options = {"max_depth": config.max_depth, "mass_properties": config.mass_properties}
+    translation = None
+    # Set when the translation is the one an earlier, interrupted run started
+    resumed = False
+    reuse_step = reuse_cad = False
+
+    def prepare(client: Client) -> CAD | None:
+        # Reuse what is unchanged since the last fetch; otherwise Onshape
+        # translates the STEP while the assembly is being fetched
+        nonlocal translation, resumed, reuse_step, reuse_cad
+        try:
+            _, did, wtype, wid, eid = parse_url(config.url)
+        except ValueError:
+            # Reported by the assembly fetch
+            return None
+        # Versions and microversions never change
+        current = None
+        if wtype == "w":
+            try:
+                current = client.current_microversion(did, wid)
+            except Exception as e:
+                logger.debug(f"Could not look up the document microversion: {e}")
+        if previous is not None and (output_dir / "assembly.step").exists():
+            reuse_step = previous.same_document(
+                config.url, current if wtype == "w" else previous.microversion
+            )
+
+        if reuse_step:
+            if previous.options == options and (output_dir / "cad.pickle").exists():
+                try:
+                    with open(output_dir / "cad.pickle", "rb") as f:
+                        cad = pickle.load(f)
+                    print(
+                        "Document unchanged since the last fetch "
+                        f"(microversion {previous.microversion}); "
+                        "reusing cad.pickle and assembly.step"
+                    )
+                    reuse_cad = True
+                    return cad
+                except Exception as e:
+                    logger.warning(f"Could not reuse {output_dir / 'cad.pickle'}: {e}")
+            print("Document unchanged since the last fetch; reusing assembly.step")
+            return None
+
+        if pending is not None and pending.matches(config.url, current):
+            # Its result is downloaded again, resuming an interrupted download
+            translation = StepTranslation(client, did, pending.translation_id)
+            resumed = True
+            return None
+        try:
+            translation = StepTranslation.start(client, did, wtype, wid, eid)
+        except Exception as e:
+            logger.warning(f"Could not start STEP translation early: {e}")
+            return None
+        if wtype != "w" or current is not None:
+            output_dir.mkdir(parents=True, exist_ok=True)
+            PendingTranslation(config.url, current, translation.translation_id).save(
+                output_dir
+            )
+        return None
+
+    scheduler = RequestScheduler(
+        max_concurrency=config.max_concurrency,
+        requests_per_second=config.requests_per_second,
+    )
+    client, cad = _get_client_and_cad(
+        config.url,
+        config.max_depth,
+        http_cache_mb=config.http_cache_mb,
+        scheduler=scheduler,
+        on_client=prepare,
+    )
     output_dir.mkdir(parents=True, exist_ok=True)
 
-    print(f"Saving CAD data to {output_dir / 'cad.pickle'}...")
-    with open(output_dir / "cad.pickle", "wb") as f:
-        pickle.dump(cad, f)
+    if not reuse_cad:
+        if previous is not None:
+            unchanged, changed, new = previous.compare_subassemblies(cad)
+            print(
+                f"Subassembly definitions since the last fetch: {unchanged} "
+                f"unchanged, {changed} changed, {new} new"
+            )
 
-    print(f"Exporting STEP assembly to {output_dir / 'assembly.step'}...")
-    exporter = StepMeshExporter(client, cad)
-    exporter.export_step(output_dir / "assembly.step")
+        if config.mass_properties:
+            # Stored on the parts, so they are pickled with the CAD data
+            print("Fetching part mass properties...")
+            asyncio.run(cad.fetch_mass_properties_for_parts(client))
+
+        print(f"Saving CAD data to {output_dir / 'cad.pickle'}...")
+        with open(output_dir / "cad.pickle", "wb") as f:
+            pickle.dump(cad, f)
+
+    if not reuse_step:
+        print(f"Exporting STEP assembly to {output_dir / 'assembly.step'}...")
+        exporter = StepMeshExporter(client, cad)
+        if resumed:
+            try:
+                translation.wait()
+                print("Continuing the STEP translation of the interrupted fetch")
+            except Exception as e:
+                logger.warning(
+                    f"The STEP translation of the interrupted fetch is gone ({e}); "
+                    "translating again"
+                )
+                translation = None
+        exporter.export_step(output_dir / "assembly.step", translation=translation)
+        PendingTranslation.clear(output_dir)
+
+    if not reuse_cad:
+        FetchState.from_cad(config.url, cad, options).save(output_dir)
 
     print("Generating default mate values...")
     mate_values = _generate_default_mate_values(cad)
@@ -282,6 +419,15 @@ def run_fetch_cad(config: FetchCadConfig):
             shutil.copy(config.bom, dest_bom)
             print(f"Copied BOM to {dest_bom}")
 
+    http_cache = getattr(client, "http_cache", None)
+    if isinstance(http_cache, HttpCache):
+        print(http_cache.summary())
+        http_cache.prune()
+    if scheduler.stats:
+        print("Onshape API requests:")
+        for line in scheduler.report():
+            print(f"  {line}")
+
     print(f"Fetch CAD complete! Data saved to {output_dir}")
 
 
@@ -0,0 +1,233 @@
+"""Scheduling of Onshape API requests.
+
+Every request of a client goes through one :class:`RequestScheduler`: a
+token bucket spaces requests out (and stops them entirely while Onshape's
+``Retry-After`` is pending), a semaphore bounds the requests in flight,
+and a keep-alive :class:`requests.Session` reuses connections. Rate-limit
+responses and connection errors are retried with jittered exponential
+backoff. Latency and retries are recorded per endpoint for the end-of-run
+report.
+"""
+
+import asyncio
+import random
+import re
+import threading
+import time
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Dict, Iterable, List, Optional
+from urllib.parse import urlparse
+
+import requests
+from loguru import logger
+from requests.adapters import HTTPAdapter
+
+DEFAULT_MAX_CONCURRENCY = 8
+
+# Statuses worth another attempt after a pause
+RETRY_STATUSES = frozenset({429, 502, 503, 504})
+
+_ID = re.compile(r"/[0-9a-fA-F]{24}(?=/|$)")
+
+
+def endpoint_name(url: str) -> str:
+    """``url``'s path with document, workspace and element ids elided."""
+    return _ID.sub("/{id}", urlparse(url).path)
+
+
+def retry_after(response: Optional[requests.Response]) -> Optional[float]:
+    """Seconds requested by a ``Retry-After`` header, if any."""
+    if response is None:
+        return None
+    value = response.headers.get("Retry-After")
+    try:
+        return max(float(value), 0.0) if value is not None else None
+    except ValueError:
+        # HTTP-date form; not used by Onshape
+        return None
+
+
+async def gather_bounded(awaitables: Iterable[Awaitable[Any]], limit: int) -> List[Any]:
+    """``asyncio.gather`` (with exceptions returned) running at most ``limit``."""
+    semaphore = asyncio.Semaphore(max(1, limit))
+
+    async def bounded(awaitable: Awaitable[Any]) -> Any:
+        async with semaphore:
+            return await awaitable
+
+    return await asyncio.gather(
+        *(bounded(a) for a in awaitables), return_exceptions=True
+    )
+
+
+class TokenBucket:
+    """Thread-safe token bucket refilled at ``rate`` tokens per second.
+
+    A ``rate`` <= 0 never limits, except while paused.
+    """
+
+    def __init__(self, rate: float, burst: int):
+        self.rate = rate
+        self.capacity = max(1, burst)
+        self._tokens = float(self.capacity)
+        self._updated = time.monotonic()
+        self._paused_until = 0.0
+        self._lock = threading.Lock()
+
+    def pause(self, seconds: float) -> None:
+        """Hand out no tokens for ``seconds`` (a server ``Retry-After``)."""
+        with self._lock:
+            self._paused_until = max(self._paused_until, time.monotonic() + seconds)
+            self._tokens = 0.0
+
+    def acquire(self) -> None:
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                if now >= self._paused_until and self.rate <= 0:
+                    return
+                if now >= self._paused_until:
+                    start = max(self._updated, self._paused_until)
+                    self._tokens = min(
+                        self.capacity, self._tokens + (now - start) * self.rate
+                    )
+                    self._updated = now
+                    if self._tokens >= 1.0:
+                        self._tokens -= 1.0
+                        return
+                    wait = (1.0 - self._tokens) / self.rate
+                else:
+                    wait = self._paused_until - now
+            time.sleep(wait)
+
+
+@dataclass
+class EndpointStats:
+    requests: int = 0
+    retries: int = 0
+    failures: int = 0
+    total_seconds: float = 0.0
+    max_seconds: float = 0.0
+
+
+class RequestScheduler:
+    """Rate limit, concurrency bound, retries and metrics for API requests.
+
+    ``requests_per_second`` <= 0 disables the steady rate limit; a
+    ``Retry-After`` from the server still pauses every request.
+    """
+
+    def __init__(
+        self,
+        max_concurrency: int = DEFAULT_MAX_CONCURRENCY,
+        requests_per_second: float = 10.0,
+        max_retries: int = 4,
+        backoff: float = 0.5,
+    ):
+        self.max_concurrency = max(1, max_concurrency)
+        self.max_retries = max_retries
+        self.backoff = backoff
+        self.bucket = TokenBucket(requests_per_second, self.max_concurrency)
+        self.session = requests.Session()
+        adapter = HTTPAdapter(
+            pool_connections=self.max_concurrency, pool_maxsize=self.max_concurrency
+        )
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+        self.stats: Dict[str, EndpointStats] = {}
+        self._slots = threading.BoundedSemaphore(self.max_concurrency)
+        self._lock = threading.Lock()
+
+    def _record(self, endpoint: str, **changes: float) -> None:
+        with self._lock:
+            stats = self.stats.setdefault(endpoint, EndpointStats())
+            for name, value in changes.items():
+                if name == "seconds":
+                    stats.requests += 1
+                    stats.total_seconds += value
+                    stats.max_seconds = max(stats.max_seconds, value)
+                else:
+                    setattr(stats, name, getattr(stats, name) + value)
+
+    def send(
+        self,
+        method: str,
+        url: str,
+        headers: Dict[str, Any],
+        body: Any,
+        timeout: float,
+    ) -> requests.Response:
+        """One HTTP exchange on the pooled session, once a token and slot are free."""
+        self.bucket.acquire()
+        with self._slots:
+            start = time.monotonic()
+            try:
+                return self.session.request(
+                    method,
+                    url,
+                    headers=headers,
+                    json=body,
+                    allow_redirects=False,
+                    stream=True,
+                    timeout=timeout,
+                )
+            finally:
+                self._record(endpoint_name(url), seconds=time.monotonic() - start)
+
+    def _delay(self, attempt: int, response: Optional[requests.Response]) -> float:
+        # Full jitter keeps parallel workers from retrying in lockstep
+        delay = random.uniform(0, self.backoff * 2**attempt)
+        requested = retry_after(response)
+        if requested is not None:
+            self.bucket.pause(requested)
+            delay = max(delay, requested)
+        return delay
+
+    def retrying(
+        self, endpoint: str, attempt: Callable[[], requests.Response]
+    ) -> requests.Response:
+        """Call ``attempt`` until it is not rate limited or retries run out.
+
+        ``attempt`` must build a fresh request each time (Onshape signs
+        every request with a new nonce). The last response is returned and
+        the last connection error raised once ``max_retries`` is reached.
+        """
+        endpoint = endpoint_name(endpoint)
+        n = 0
+        while True:
+            response = None
+            try:
+                response = attempt()
+                if response.status_code not in RETRY_STATUSES:
+                    return response
+                reason = f"HTTP {response.status_code}"
+            except (requests.ConnectionError, requests.Timeout) as e:
+                if n == self.max_retries:
+                    self._record(endpoint, failures=1)
+                    raise
+                reason = f"{type(e).__name__}: {e}"
+            if n == self.max_retries:
+                self._record(endpoint, failures=1)
+                return response
+            logger.debug(f"Retrying {endpoint} after {reason}")
+            self._record(endpoint, retries=1)
+            if response is not None:
+                response.close()
+            time.sleep(self._delay(n, response))
+            n += 1
+
+    def report(self) -> List[str]:
+        """One line per endpoint, busiest first."""
+        with self._lock:
+            items = sorted(
+                self.stats.items(), key=lambda item: (-item[1].requests, item[0])
+            )
+        lines = []
+        for endpoint, stats in items:
+            mean = stats.total_seconds / stats.requests if stats.requests else 0.0
+            lines.append(
+                f"{endpoint}: {stats.requests} requests, "
+                f"mean {mean * 1000:.0f} ms, max {stats.max_seconds * 1000:.0f} ms, "
+                f"{stats.retries} retries, {stats.failures} failures"
+            )
+        return lines
@@ -22,6 +22,18 @@ class CoACDConfig:
     """Maximum number of workers for parallel processing."""
 
 
+@dataclass
+class PartFilterConfig:
+    """Configuration for dropping small parts from a mesh output."""
+
+    min_volume_mm3: float | None = None
+    """Drop parts with a volume below this value (mm^3). Defaults to 0 (disabled)."""
+    min_extent_mm: float | None = None
+    """Drop parts whose largest bounding-box side is below this value (mm). Defaults to 0 (disabled)."""
+    name_patterns: list[str] | None = None
+    """Drop parts whose name matches any of these glob patterns (e.g. '*screw*')."""
+
+
 @dataclass
 class CollisionConfig:
     """Configuration for collision mesh generation."""
@@ -30,16 +42,32 @@ class CollisionConfig:
     """Method for collision mesh generation (fast, coacd). Defaults to fast."""
     coacd: CoACDConfig = field(default_factory=CoACDConfig)
     """CoACD specific configuration."""
+    part_filter: PartFilterConfig = field(default_factory=PartFilterConfig)
+    """Small-part filter applied before collision mesh generation."""
 
 
 @dataclass
 class VisualMeshConfig:
     """Configuration for visual mesh generation."""
 
-    formats: list[Literal["glb", "dae", "obj", "stl"]] | None = None
-    """Format for visual meshes (glb, dae, obj, stl). Defaults to obj."""
+    formats: list[Literal["glb", "dae", "obj", "stl", "ply"]] | None = None
+    """Format for visual meshes (glb, dae, obj, stl, ply). Defaults to obj."""
     max_size_mb: float | None = None
     """Maximum file size (MB) per visual mesh. Meshes exceeding this are decimated. Defaults to 10."""
+    decimation: Literal["uniform", "part_aware"] | None = None
+    """Decimation strategy for oversized meshes. part_aware splits the face budget between parts by visible surface area. Defaults to part_aware."""
+    max_workers: int | None = None
+    """Maximum number of processes for parallel per-part decimation. Defaults to 8."""
+    lods: list[float] | None = None
+    """Extra levels of detail as face ratios of LOD 0 (e.g. 0.25 0.05). Meshes go to visual/lod<n>/, selected by the visual_lod xacro arg."""
+    glb_quantize: bool | None = None
+    """Quantize GLB positions and normals (KHR_mesh_quantization) for smaller files. Needs viewer support. Defaults to False."""
+    instancing: bool | None = None
+    """Store repeated parts once per GLB and place them with EXT_mesh_gpu_instancing. Defaults to False."""
+    scene: bool | None = None
+    """Also write the whole robot as one GLB scene (scene/<name>.glb) with a JSON joint map. Defaults to False."""
+    part_filter: PartFilterConfig = field(default_factory=PartFilterConfig)
+    """Small-part filter applied before visual mesh generation."""
 
 
 @dataclass
@@ -56,12 +84,24 @@ class ExportConfig:
     """Path to YAML override configuration file."""
     bom: Path | None = None
     """Path to BOM CSV file for density lookup."""
+    inertia_method: Literal["exact", "mesh", "onshape"] | None = None
+    """How part mass properties are computed: exact B-rep integration, the faster tessellated mesh, or the values fetched from Onshape (fetch-cad --mass-properties). Defaults to exact."""
+    inertia_compare: bool | None = None
+    """Also compute the other inertia method and report each link's relative error against the exact one. Defaults to False."""
+    inertia_max_workers: int | None = None
+    """Maximum number of processes computing link inertia in parallel. Defaults to 8."""
     max_depth: int = 5
     """Maximum subassembly traversal depth."""
     visual_option: VisualMeshConfig = field(default_factory=VisualMeshConfig)
     """Configuration for visual mesh generation."""
     collision_option: CollisionConfig = field(default_factory=CollisionConfig)
     """Configuration for collision mesh generation."""
+    only_links: list[str] | None = None
+    """Only re-export these links, merging them into the existing output directory."""
+    subtree: str | None = None
+    """Only re-export this link and its descendants, merging them into the existing output directory."""
+    tessellation_cache_mb: float = 2048.0
+    """Size limit of the user-level tessellation cache shared by all exports ($ONSHAPE2XACRO_CACHE_DIR, default ~/.cache/onshape2xacro). 0 disables it."""
     skip_confirmation: bool = False
     """Skip configuration confirmation prompt."""
     debug: bool = False
@@ -92,6 +132,14 @@ class FetchCadConfig:
     """Path to BOM CSV file to copy to output directory for inertia calculation."""
     max_depth: int = 5
     """Maximum subassembly traversal depth."""
+    mass_properties: bool = False
+    """Also fetch each part's Onshape mass properties, for export with --inertia-method onshape."""
+    http_cache_mb: float = 512.0
+    """Size limit of the user-level cache of Onshape API responses ($ONSHAPE2XACRO_CACHE_DIR, default ~/.cache/onshape2xacro). Unchanged documents are fetched again with almost no requests. 0 disables it."""
+    max_concurrency: int = 8
+    """Maximum number of Onshape API requests in flight."""
+    requests_per_second: float = 10.0
+    """Steady Onshape API request rate; rate-limit responses (HTTP 429) pause and retry regardless. 0 removes the steady limit."""
 
 
 @dataclass
@@ -1,7 +1,8 @@
 import os
-from typing import Any, TYPE_CHECKING, Dict, List, Optional
+from typing import Any, TYPE_CHECKING, Dict, List, Optional, Set
 from pathlib import Path
 import lxml.etree as ET
+import networkx as nx
 from loguru import logger
 import yaml
 
@@ -10,7 +11,9 @@ from onshape2xacro.config import ConfigOverride
 from onshape2xacro.config.export_config import CollisionOptions, VisualMeshOptions
 from onshape2xacro.naming import sanitize_name
 from onshape2xacro.mesh_exporters.step import StepMeshExporter
+from onshape2xacro.mesh_exporters.tessellation_cache import TessellationCache
 from onshape2xacro.condensed_robot import JointRecord
+from onshape2xacro.serializers.scene import write_robot_scene
 from onshape2xacro.ui import ExportStats, ExportUI, NullExportUI
 
 if TYPE_CHECKING:
@@ -67,9 +70,16 @@ class XacroSerializer(RobotSerializer):
         visual_option: Optional[VisualMeshOptions] = None,
         collision_option: Optional[CollisionOptions] = None,
         ui: Optional[ExportUI] = None,
+        only_links: Optional[List[str]] = None,
+        subtree: Optional[str] = None,
         **options: Any,
     ):
-        """Save robot to hierarchical xacro structure."""
+        """Save robot to hierarchical xacro structure.
+
+        With ``only_links`` or ``subtree``, only the selected links are
+        re-exported; every other link keeps its meshes, inertial and joint
+        limits from the previous export into ``file_path``.
+        """
         out_dir = Path(file_path)
         urdf_dir = out_dir / "urdf"
         if mesh_dir:
@@ -90,6 +100,7 @@ class XacroSerializer(RobotSerializer):
         default_visual_mesh_ext = (
             visual_mesh_formats[0] if visual_mesh_formats else "obj"
         )
+        use_visual_lods = bool(visual_option.lods)
 
         # 1. Export meshes (Stage 6) & Compute Inertials
         mesh_map = {}
@@ -100,6 +111,18 @@ class XacroSerializer(RobotSerializer):
         if ui is None:
             ui = NullExportUI()
 
+        stats = ExportStats(
+            robot_name=sanitize_name(robot.name),
+            output_path=str(out_dir),
+        )
+
+        selected_links = self._select_links(robot, only_links, subtree)
+        if selected_links is not None:
+            logger.info(
+                f"Exporting {len(selected_links)} selected links: "
+                + ", ".join(sorted(selected_links))
+            )
+
         if download_assets:
             mesh_map, missing_meshes, report = self._export_meshes(
                 robot,
@@ -108,6 +131,13 @@ class XacroSerializer(RobotSerializer):
                 bom_path=bom_path,
                 collision_option=collision_option,
                 ui=ui,
+                stats=stats,
+                only_links=selected_links,
+                tessellation_cache=options.get("tessellation_cache"),
+                inertia_method=options.get("inertia_method", "exact"),
+                inertia_compare=options.get("inertia_compare", False),
+                inertia_max_workers=options.get("inertia_max_workers", 1),
+                material_densities=options.get("material_densities"),
             )
 
             if report and report.link_properties:
@@ -170,6 +200,7 @@ class XacroSerializer(RobotSerializer):
                 children,
                 mesh_rel_path=mesh_rel_path,
                 default_visual_mesh_ext=default_visual_mesh_ext,
+                use_visual_lods=use_visual_lods,
             )
 
             with open(module_path, "w") as f:
@@ -212,6 +243,17 @@ class XacroSerializer(RobotSerializer):
             name="visual_mesh_ext",
             default=default_visual_mesh_ext,
         )
+        macro_args = {"visual_mesh_ext": "$(arg visual_mesh_ext)"}
+
+        # Argument for visual level of detail (0 = full resolution)
+        if use_visual_lods:
+            ET.SubElement(
+                entry_point_root,
+                "{http://www.ros.org/wiki/xacro}arg",
+                name="visual_lod",
+                default="0",
+            )
+            macro_args["visual_lod"] = "$(arg visual_lod)"
 
         # Include the macro file
         inc = ET.SubElement(entry_point_root, "{http://www.ros.org/wiki/xacro}include")
@@ -222,7 +264,7 @@ class XacroSerializer(RobotSerializer):
             entry_point_root,
             f"{{http://www.ros.org/wiki/xacro}}{main_name}",
             prefix="",
-            visual_mesh_ext="$(arg visual_mesh_ext)",
+            **macro_args,
         )
 
         entry_point_content = ET.tostring(
@@ -233,15 +275,33 @@ class XacroSerializer(RobotSerializer):
             f.write(entry_point_content)
 
         # 5. Generate default configs (Stage 7)
-        self._generate_default_configs(robot, config_dir, config, computed_inertials)
+        self._generate_default_configs(
+            robot, config_dir, config, computed_inertials, selected_links
+        )
 
-        # 6. Write missing meshes prompt file if any parts failed
+        # 6. Optional single-file scene of the whole robot
+        if visual_option.scene and mesh_map:
+            with open(config_dir / "joint_limits.yaml", "r") as f:
+                joint_limits = (yaml.safe_load(f) or {}).get("joint_limits", {})
+            scene_dir = out_dir / "scene"
+            write_robot_scene(
+                robot,
+                mesh_map,
+                mesh_dir_path,
+                scene_dir / f"{main_name}.glb",
+                scene_dir / f"{main_name}_joints.json",
+                joint_limits=joint_limits,
+                quantize=visual_option.glb_quantize,
+                instancing=visual_option.instancing,
+            )
+
+        # 7. Write missing meshes prompt file if any parts failed
         if missing_meshes:
             self._write_missing_meshes_prompt(
                 missing_meshes, mesh_dir_path, robot, out_dir
             )
 
-        # 7. Print summary panel
+        # 8. Print summary panel
         num_links = sum(
             1 for _, d in robot.nodes(data=True) if d.get("link") or d.get("data")
         )
@@ -258,12 +318,8 @@ class XacroSerializer(RobotSerializer):
             )
         )
 
-        stats = ExportStats(
-            robot_name=sanitize_name(robot.name),
-            output_path=str(out_dir),
-            num_links=num_links,
-            num_joints=num_joints,
-        )
+        stats.num_links = num_links
+        stats.num_joints = num_joints
 
         if missing_meshes:
             stats.missing_mesh_links = len(missing_meshes)
@@ -321,10 +377,16 @@ class XacroSerializer(RobotSerializer):
         children: List,
         mesh_rel_path: str = "meshes",
         default_visual_mesh_ext: str = "obj",
+        use_visual_lods: bool = False,
     ):
         macro = ET.SubElement(root, "{http://www.ros.org/wiki/xacro}macro")
         macro.set("name", sanitize_name(name))
-        macro.set("params", f"prefix:='' visual_mesh_ext:='{default_visual_mesh_ext}'")
+        params = f"prefix:='' visual_mesh_ext:='{default_visual_mesh_ext}'"
+        child_args = {"visual_mesh_ext": "${visual_mesh_ext}"}
+        if use_visual_lods:
+            params += " visual_lod:='0'"
+            child_args["visual_lod"] = "${visual_lod}"
+        macro.set("params", params)
 
         for link in elements["links"]:
             if link:
@@ -348,7 +410,7 @@ class XacroSerializer(RobotSerializer):
                 macro,
                 "{http://www.ros.org/wiki/xacro}" + child_name,
                 prefix="${prefix}",
-                visual_mesh_ext="${visual_mesh_ext}",
+                **child_args,
             )
 
     def _add_robot_macro(
@@ -497,15 +559,21 @@ class XacroSerializer(RobotSerializer):
             entry = mesh_map[name]
             # Handle both old (str) and new (dict) formats
             collision_file = None
+            visual_dir = "visual"
+            # Links sharing meshes with an identical link point at its files
+            visual_name = name
 
             if isinstance(entry, dict):
                 visual_entry = entry.get("visual", f"{name}.stl")
-                if isinstance(visual_entry, dict):
-                    pass
+                if isinstance(visual_entry, dict) and visual_entry:
+                    visual_name = Path(next(iter(visual_entry.values()))).stem
                 elif isinstance(visual_entry, str):
                     pass
 
                 collision_file = entry.get("collision", f"{name}.stl")
+                if entry.get("visual_lods"):
+                    # Level of detail is selected by the visual_lod parameter
+                    visual_dir = "visual/lod${visual_lod}"
             else:
                 collision_file = entry
 
@@ -533,7 +601,7 @@ class XacroSerializer(RobotSerializer):
                         # Use the xacro parameter for extension
                         mesh.set(
                             "filename",
-                            f"{mesh_rel_path}/visual/{name}.${{visual_mesh_ext}}",
+                            f"{mesh_rel_path}/{visual_dir}/{visual_name}.${{visual_mesh_ext}}",
                         )
                     else:
                         mesh.set("filename", f"{mesh_rel_path}/{filename}")
@@ -624,6 +692,13 @@ class XacroSerializer(RobotSerializer):
         bom_path: Optional[Path] = None,
         collision_option: Optional[CollisionOptions] = None,
         ui: Optional[ExportUI] = None,
+        stats: Optional[ExportStats] = None,
+        only_links: Optional[Set[str]] = None,
+        tessellation_cache: Optional[TessellationCache] = None,
+        inertia_method: str = "exact",
+        inertia_compare: bool = False,
+        inertia_max_workers: int = 1,
+        material_densities: Optional[Dict[str, float]] = None,
     ) -> tuple[
         dict[str, Any],
         dict[str, list[dict[str, str]]],
@@ -641,7 +716,12 @@ class XacroSerializer(RobotSerializer):
         asset_path = getattr(robot, "asset_path", None)
 
         if (client and cad) or (cad and asset_path):
-            exporter = StepMeshExporter(client, cad, asset_path=asset_path)
+            exporter = StepMeshExporter(
+                client,
+                cad,
+                asset_path=asset_path,
+                tessellation_cache=tessellation_cache,
+            )
             mesh_map, missing_meshes, report = exporter.export_link_meshes(
                 link_records,
                 mesh_dir,
@@ -649,17 +729,64 @@ class XacroSerializer(RobotSerializer):
                 visual_option=visual_option,
                 collision_option=collision_option,
                 ui=ui,
+                stats=stats,
+                only_links=only_links,
+                inertia_method=inertia_method,
+                inertia_compare=inertia_compare,
+                inertia_max_workers=inertia_max_workers,
+                material_densities=material_densities,
             )
             return mesh_map, missing_meshes, report
 
         return {}, {}, None
 
+    def _select_links(
+        self,
+        robot: "Robot",
+        only_links: Optional[List[str]] = None,
+        subtree: Optional[str] = None,
+    ) -> Optional[Set[str]]:
+        """Sanitized names of the links picked by ``only_links`` and ``subtree``.
+
+        Returns None (every link) when neither is given.
+        """
+        if not only_links and not subtree:
+            return None
+
+        nodes_by_name: Dict[str, Any] = {}
+        for node, data in robot.nodes(data=True):
+            link = data.get("link") or data.get("data")
+            if link:
+                nodes_by_name[sanitize_name(link.name)] = node
+
+        requested = [sanitize_name(n) for n in only_links or []]
+        if subtree:
+            requested.append(sanitize_name(subtree))
+        unknown = [n for n in requested if n not in nodes_by_name]
+        if unknown:
+            raise ValueError(
+                f"Unknown links: {', '.join(unknown)}. "
+                f"Available links: {', '.join(sorted(nodes_by_name))}"
+            )
+
+        selected = set(requested)
+        if subtree:
+            names_by_node = {node: name for name, node in nodes_by_name.items()}
+            root = nodes_by_name[sanitize_name(subtree)]
+            selected |= {
+                names_by_node[node]
+                for node in nx.descendants(robot, root)
+                if node in names_by_node
+            }
+        return selected
+
     def _generate_default_configs(
         self,
         robot: "Robot",
         config_dir: Path,
         config: Optional[ConfigOverride] = None,
         computed_inertials: Optional[Dict[str, Any]] = None,
+        selected_links: Optional[Set[str]] = None,
     ):
         if config is None:
             config = ConfigOverride()
@@ -668,11 +795,14 @@ class XacroSerializer(RobotSerializer):
 
         joint_limits = {}
         inertials = {}
+        # Joint name -> child link name
+        joint_children: Dict[str, str] = {}
         for parent, child in robot.edges:
             edge_data = robot.get_edge_data(parent, child)
             joint = edge_data.get("data")
             if joint and is_joint(joint.name):
                 name = sanitize_name(get_joint_name(joint.name))
+                joint_children[name] = sanitize_name(str(getattr(joint, "child", "")))
 
                 default_limit = {
                     "lower": -3.14,
@@ -742,11 +872,34 @@ class XacroSerializer(RobotSerializer):
 
                     inertials[name] = config.get_inertial(name, default_inertial)
 
+        if selected_links is not None:
+            # Partial export: links and joints outside the selection keep the
+            # values already in the output directory
+            previous_limits = self._load_config_section(
+                config_dir / "joint_limits.yaml", "joint_limits"
+            )
+            for name in joint_limits:
+                if joint_children.get(name) not in selected_links:
+                    joint_limits[name] = previous_limits.get(name, joint_limits[name])
+            previous_inertials = self._load_config_section(
+                config_dir / "inertials.yaml", "inertials"
+            )
+            for name in inertials:
+                if name not in selected_links:
+                    inertials[name] = previous_inertials.get(name, inertials[name])
+
         with open(config_dir / "joint_limits.yaml", "w") as f:
             yaml.dump({"joint_limits": joint_limits}, f)
         with open(config_dir / "inertials.yaml", "w") as f:
             yaml.dump({"inertials": inertials}, f)
 
+    @staticmethod
+    def _load_config_section(path: Path, section: str) -> Dict[str, Any]:
+        if not path.exists():
+            return {}
+        with open(path) as f:
+            return (yaml.safe_load(f) or {}).get(section) or {}
+
     def _write_missing_meshes_prompt(
         self,
         missing_meshes: dict[str, list[dict[str, str]]],
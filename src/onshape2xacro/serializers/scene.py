@@ -0,0 +1,195 @@
+"""Single-file GLB scene of the whole robot.
+
+The node hierarchy mirrors the kinematic tree: every link is a node, every
+joint is a node between its parent and child link carrying the joint
+origin. Viewers animate a joint by composing the joint node's rest
+rotation/translation with the motion about its axis, using the JSON joint
+map written next to the scene.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Tuple
+
+import numpy as np
+from loguru import logger
+from scipy.spatial.transform import Rotation
+
+from onshape2xacro.mesh_exporters.decimation import PartMesh
+from onshape2xacro.mesh_exporters.gltf import GlbBuilder
+from onshape2xacro.naming import sanitize_name
+
+if TYPE_CHECKING:
+    from onshape_robotics_toolkit.robot import Robot
+
+# Link meshes are in millimeters, the scene in meters
+MESH_SCALE = 0.001
+# glTF is Y-up, URDF is Z-up: rotate -90 degrees about X at the scene root
+Z_UP_TO_Y_UP = Rotation.from_euler("x", -90, degrees=True).as_quat().tolist()
+# Visual formats that trimesh reads back with their colors, in order of preference
+SCENE_SOURCE_FORMATS = ("obj", "glb", "dae", "stl")
+
+
+def _mesh_to_parts(mesh: Any) -> List[PartMesh]:
+    """Split a loaded trimesh into one part per face color."""
+    vertices = np.asarray(mesh.vertices)
+    faces = np.asarray(mesh.faces)
+    try:
+        visual = mesh.visual
+        if visual.kind == "texture":
+            visual = visual.to_color()
+        face_colors = np.asarray(visual.face_colors)[:, :3] if visual.kind else None
+    except Exception:
+        face_colors = None
+
+    if face_colors is None or len(face_colors) != len(faces):
+        return [PartMesh(vertices, faces)]
+
+    unique, inverse = np.unique(face_colors, axis=0, return_inverse=True)
+    inverse = inverse.reshape(-1)
+    return [
+        PartMesh(vertices, faces[inverse == i], tuple(float(c) / 255 for c in color))
+        for i, color in enumerate(unique)
+    ]
+
+
+def _visual_source(entry: Any, mesh_dir: Path, instancing: bool) -> Optional[Path]:
+    if not isinstance(entry, dict) or not isinstance(entry.get("visual"), dict):
+        return None
+    visual_files = entry["visual"]
+    for fmt in SCENE_SOURCE_FORMATS:
+        # Instanced GLBs need EXT_mesh_gpu_instancing, which trimesh cannot expand
+        if fmt == "glb" and instancing:
+            continue
+        if fmt in visual_files and (mesh_dir / visual_files[fmt]).exists():
+            return mesh_dir / visual_files[fmt]
+    return None
+
+
+def _origin_trs(origin: Any) -> Tuple[List[float], List[float]]:
+    if origin is None:
+        return [0.0, 0.0, 0.0], [0.0, 0.0, 0.0, 1.0]
+    # URDF rpy is extrinsic roll-pitch-yaw about fixed X, Y, Z
+    rotation = Rotation.from_euler("xyz", [float(v) for v in origin.rpy])
+    return [float(v) for v in origin.xyz], rotation.as_quat().tolist()
+
+
+def write_robot_scene(
+    robot: "Robot",
+    mesh_map: Dict[str, Any],
+    mesh_dir: Path,
+    scene_path: Path,
+    joint_map_path: Path,
+    joint_limits: Optional[Dict[str, Dict[str, float]]] = None,
+    quantize: bool = False,
+    instancing: bool = False,
+) -> None:
+    """Write ``robot`` as one GLB scene plus a JSON joint map.
+
+    Links whose visual meshes are identical share a single glTF mesh.
+    """
+    import trimesh
+
+    from onshape2xacro.serializers import get_joint_name, is_joint
+
+    joint_limits = joint_limits or {}
+    builder = GlbBuilder()
+    root = builder.add_node(
+        {"name": sanitize_name(robot.name), "rotation": Z_UP_TO_Y_UP}
+    )
+
+    # Content hash -> (mesh index, dequantization transform)
+    shared_meshes: Dict[str, Tuple[int, Optional[Dict[str, Any]]]] = {}
+    link_nodes: Dict[Any, int] = {}
+    link_names: Dict[str, int] = {}
+    joints: Dict[str, Dict[str, Any]] = {}
+
+    def _add_link(node_id: Any, parent: int) -> None:
+        link = robot.nodes[node_id].get("data") or robot.nodes[node_id].get("link")
+        name = sanitize_name(getattr(link, "name", str(node_id)))
+        index = builder.add_node({"name": name}, parent=parent)
+        link_nodes[node_id] = index
+        link_names[name] = index
+
+        source = _visual_source(mesh_map.get(name), mesh_dir, instancing)
+        if source is not None:
+            mesh = trimesh.load(str(source), force="mesh")
+            parts = _mesh_to_parts(mesh)
+            digest = hashlib.sha1()
+            for part in parts:
+                digest.update(np.ascontiguousarray(part.vertices, np.float64))
+                digest.update(np.ascontiguousarray(part.faces, np.int64))
+                digest.update(repr(part.color).encode())
+            key = digest.hexdigest()
+            if key not in shared_meshes:
+                shared_meshes[key] = builder.add_mesh(
+                    parts, name=name, quantize=quantize
+                )
+            mesh_index, dequantize = shared_meshes[key]
+            mesh_node: Dict[str, Any] = {"name": f"{name}_visual", "mesh": mesh_index}
+            translation = np.zeros(3)
+            scale = np.ones(3)
+            if dequantize:
+                translation = np.asarray(dequantize["translation"])
+                scale = np.asarray(dequantize["scale"])
+            mesh_node["translation"] = (translation * MESH_SCALE).tolist()
+            mesh_node["scale"] = (scale * MESH_SCALE).tolist()
+            builder.add_node(mesh_node, parent=index)
+
+        for _, child_id, edge in robot.out_edges(node_id, data=True):
+            joint = edge.get("data") or edge.get("joint")
+            if joint is None:
+                _add_link(child_id, index)
+                continue
+
+            movable = is_joint(joint.name)
+            joint_name = sanitize_name(
+                get_joint_name(joint.name) if movable else joint.name
+            )
+            translation, rotation = _origin_trs(getattr(joint, "origin", None))
+            joint_index = builder.add_node(
+                {"name": joint_name, "translation": translation, "rotation": rotation},
+                parent=index,
+            )
+            joint_type = "fixed"
+            if movable:
+                joint_type_str = str(getattr(joint, "joint_type", "fixed")).upper()
+                for candidate in ("revolute", "prismatic", "continuous"):
+                    if candidate.upper() in joint_type_str:
+                        joint_type = candidate
+                        break
+            joints[joint_name] = {
+                "node": joint_index,
+                "type": joint_type,
+                "parent": sanitize_name(joint.parent),
+                "child": sanitize_name(joint.child),
+                "axis": [float(v) for v in joint.axis],
+                "translation": translation,
+                "rotation": rotation,
+            }
+            limits = joint_limits.get(joint_name)
+            if joint_type in ("revolute", "prismatic") and limits:
+                joints[joint_name]["lower"] = limits.get("lower")
+                joints[joint_name]["upper"] = limits.get("upper")
+            _add_link(child_id, joint_index)
+
+    for node_id in robot.nodes:
+        if robot.in_degree(node_id) == 0:
+            _add_link(node_id, root)
+
+    scene_path.parent.mkdir(parents=True, exist_ok=True)
+    builder.write(scene_path)
+    joint_map = {
+        "scene": scene_path.name,
+        "up_axis": "Z",
+        "links": link_names,
+        "joints": joints,
+    }
+    joint_map_path.write_text(json.dumps(joint_map, indent=2))
+    logger.info(
+        f"Wrote robot scene {scene_path.name} ({len(link_names)} links, "
+        f"{len(shared_meshes)} unique meshes)"
+    )
@@ -58,6 +58,18 @@ class ExportStats:
     # Collision summary
     total_collision_stls: int = 0
     coacd_fallback_count: int = 0
+    # Small-part filter summary; dropped parts are never tessellated, so
+    # their size is counted in B-rep faces rather than triangles
+    filtered_visual_parts: int = 0
+    filtered_visual_brep_faces: int = 0
+    filtered_collision_parts: int = 0
+    filtered_collision_brep_faces: int = 0
+    # Links reusing the meshes of a link with identical geometry
+    shared_mesh_links: int = 0
+    # Links reused unchanged from the previous export (build manifest)
+    reused_links: int = 0
+    # Part prototypes loaded from the user-level tessellation cache
+    cached_tessellations: int = 0
     # Missing meshes
     missing_mesh_links: int = 0
     missing_mesh_parts: int = 0
@@ -349,6 +361,33 @@ class RichExportUI:
                 note += f"  [yellow]({stats.coacd_fallback_count} links fell back to convex hull)[/yellow]"
             parts.append(note)
 
+        # Small-part filter note
+        if stats.filtered_visual_parts or stats.filtered_collision_parts:
+            parts.append(
+                f"Small-part filter: {stats.filtered_visual_parts} visual "
+                f"({stats.filtered_visual_brep_faces} B-rep faces), "
+                f"{stats.filtered_collision_parts} collision "
+                f"({stats.filtered_collision_brep_faces} B-rep faces) parts skipped"
+            )
+
+        # Mesh sharing note
+        if stats.shared_mesh_links:
+            parts.append(
+                f"Mesh sharing: {stats.shared_mesh_links} links reuse the meshes "
+                "of an identical link"
+            )
+
+        if stats.reused_links:
+            parts.append(
+                f"Incremental: {stats.reused_links} unchanged links reused from "
+                "the previous export"
+            )
+
+        if stats.cached_tessellations:
+            parts.append(
+                f"Tessellation cache: {stats.cached_tessellations} parts reused"
+            )
+
         # Warnings / next actions
         if stats.missing_mesh_links > 0:
             parts.append(
@@ -36,6 +36,12 @@ def cleanup_artifacts():
     _clean()
 
 
+@pytest.fixture(autouse=True)
+def isolated_user_cache(tmp_path, monkeypatch):
+    # Keep the user-level caches out of the real home directory
+    monkeypatch.setenv("ONSHAPE2XACRO_CACHE_DIR", str(tmp_path / "user_cache"))
+
+
 @pytest.fixture(autouse=True, scope="session")
 def session_cleanup():
     yield
@@ -1,5 +1,7 @@
-from unittest.mock import MagicMock
+from unittest.mock import MagicMock, patch
 import pickle
+
+import pytest
 from types import SimpleNamespace
 
 
@@ -48,7 +50,7 @@ def test_fetch_cad_command(monkeypatch, tmp_path):
         def __init__(self, client, cad):
             pass
 
-        def export_step(self, path):
+        def export_step(self, path, translation=None):
             # Create dummy file
             with open(path, "w") as f:
                 f.write("STEP DATA")
@@ -56,6 +58,15 @@ def test_fetch_cad_command(monkeypatch, tmp_path):
     monkeypatch.setattr(
         "onshape2xacro.mesh_exporters.step.StepMeshExporter", MockExporter
     )
+    started = []
+    monkeypatch.setattr(
+        "onshape2xacro.mesh_exporters.step.StepTranslation.start",
+        lambda *args: started.append(args[1:]) or SimpleNamespace(translation_id="t1"),
+    )
+    monkeypatch.setattr(
+        "onshape2xacro.optimized_cad.OptimizedClient.current_microversion",
+        lambda self, did, wid: "mv1",
+    )
 
     # Mock KinematicGraph and CondensedRobot
     mock_graph = MagicMock()
@@ -89,6 +100,15 @@ def test_fetch_cad_command(monkeypatch, tmp_path):
     assert data.element_id == "000000000000000000000789"
     assert data.name == "test_robot"
     assert data.workspace_id == "000000000000000000000456"
+    # The STEP translation was started from the URL, before the fetch
+    assert started == [
+        (
+            "000000000000000000000123",
+            "w",
+            "000000000000000000000456",
+            "000000000000000000000789",
+        )
+    ]
 
     # Verify configuration.yaml saved
     assert (output_file / "configuration.yaml").exists()
@@ -126,10 +146,12 @@ def test_fetch_cad_existing_config_and_bom_warning(monkeypatch, tmp_path):
     mock_client = MagicMock()
     mock_cad = MagicMock()
     mock_cad.name = "robot"
+    mock_cad.document_microversion = "mv1"
+    mock_cad.subassemblies = {}
 
     monkeypatch.setattr(
         "onshape2xacro.pipeline._get_client_and_cad",
-        lambda u, d: (mock_client, mock_cad),
+        lambda u, d, **kwargs: (mock_client, mock_cad),
     )
     monkeypatch.setattr(
         "onshape2xacro.pipeline.OptimizedCAD.from_url", lambda *args, **kwargs: mock_cad
@@ -170,3 +192,169 @@ def test_fetch_cad_existing_config_and_bom_warning(monkeypatch, tmp_path):
             "BOM file not found" in c for c in calls
         )
         assert any("already exists. Skipping generation" in c for c in calls)
+
+
+def test_fetch_cad_reuses_unchanged_document(monkeypatch, tmp_path):
+    import onshape2xacro.pipeline as pipeline
+    from onshape2xacro.fetch_state import FetchState
+    from onshape2xacro.optimized_cad import OptimizedClient
+    from onshape2xacro.schema import FetchCadConfig
+
+    url = "https://cad.onshape.com/documents/000000000000000000000123/w/000000000000000000000456/e/000000000000000000000789"
+    monkeypatch.setattr(pipeline, "get_credentials", lambda: ("access", "secret"))
+    document = {"microversion": "mv1"}
+    calls = {"fetch": 0, "translate": 0, "export": 0}
+
+    def fetch(*args, **kwargs):
+        calls["fetch"] += 1
+        cad = MockCAD()
+        cad.document_microversion = document["microversion"]
+        cad.subassemblies = {
+            "arm": SimpleNamespace(
+                documentId="d1", elementId="e1", documentMicroversion="s1"
+            ),
+            "gripper": SimpleNamespace(
+                documentId="d2", elementId="e2", documentMicroversion="s2"
+            ),
+        }
+        return cad
+
+    class MockExporter:
+        def __init__(self, client, cad):
+            pass
+
+        def export_step(self, path, translation=None):
+            calls["export"] += 1
+            path.write_text("STEP DATA")
+
+    monkeypatch.setattr("onshape2xacro.optimized_cad.OptimizedCAD.from_url", fetch)
+    monkeypatch.setattr(
+        OptimizedClient,
+        "current_microversion",
+        lambda self, did, wid: document["microversion"],
+    )
+    monkeypatch.setattr(
+        "onshape2xacro.mesh_exporters.step.StepTranslation.start",
+        lambda *args: calls.__setitem__("translate", calls["translate"] + 1)
+        or SimpleNamespace(translation_id=f"t{calls['translate']}"),
+    )
+    monkeypatch.setattr(
+        "onshape2xacro.mesh_exporters.step.StepMeshExporter", MockExporter
+    )
+    monkeypatch.setattr(
+        "onshape2xacro.pipeline.KinematicGraph.from_cad", lambda *args: MagicMock()
+    )
+    monkeypatch.setattr(
+        "onshape2xacro.pipeline.CondensedRobot.from_graph",
+        lambda *args, **kwargs: MagicMock(nodes=["base"]),
+    )
+
+    output_dir = tmp_path / "out"
+    config = FetchCadConfig(url=url, output=output_dir, http_cache_mb=0)
+    pipeline.run_fetch_cad(config)
+    assert calls == {"fetch": 1, "translate": 1, "export": 1}
+    state = FetchState.load(output_dir)
+    assert state.microversion == "mv1"
+    assert state.subassemblies == {"d1/e1": "s1", "d2/e2": "s2"}
+
+    # Unchanged: nothing is fetched, translated or rewritten
+    pickled = (output_dir / "cad.pickle").stat().st_mtime_ns
+    with patch("builtins.print") as mock_print:
+        pipeline.run_fetch_cad(config)
+    assert calls == {"fetch": 1, "translate": 1, "export": 1}
+    assert (output_dir / "cad.pickle").stat().st_mtime_ns == pickled
+    printed = " ".join(str(c) for c in mock_print.mock_calls)
+    assert "reusing cad.pickle and assembly.step" in printed
+
+    # Other options need the CAD data again, but not the STEP
+    pipeline.run_fetch_cad(FetchCadConfig(url=url, output=output_dir, max_depth=2))
+    assert calls == {"fetch": 2, "translate": 1, "export": 1}
+
+    # After an edit everything is fetched, and changes are reported
+    document["microversion"] = "mv2"
+    with patch("builtins.print") as mock_print:
+        pipeline.run_fetch_cad(config)
+    assert calls == {"fetch": 3, "translate": 2, "export": 2}
+    assert FetchState.load(output_dir).microversion == "mv2"
+    printed = " ".join(str(c) for c in mock_print.mock_calls)
+    assert "2 unchanged, 0 changed, 0 new" in printed
+
+
+def test_fetch_cad_resumes_the_interrupted_translation(monkeypatch, tmp_path):
+    import onshape2xacro.pipeline as pipeline
+    from onshape2xacro.fetch_state import PendingTranslation
+    from onshape2xacro.mesh_exporters.step import StepTranslation
+    from onshape2xacro.optimized_cad import OptimizedClient
+    from onshape2xacro.schema import FetchCadConfig
+
+    url = "https://cad.onshape.com/documents/000000000000000000000123/w/000000000000000000000456/e/000000000000000000000789"
+    monkeypatch.setattr(pipeline, "get_credentials", lambda: ("access", "secret"))
+    document = {"microversion": "mv1"}
+    started = []
+    exported = []
+    gone = set()
+
+    def start(*args):
+        started.append(args[1:])
+        return SimpleNamespace(translation_id=f"t{len(started)}")
+
+    def wait(self):
+        if self.translation_id in gone:
+            raise RuntimeError("404")
+        return {"requestState": "DONE"}
+
+    class MockExporter:
+        def __init__(self, client, cad):
+            pass
+
+        def export_step(self, path, translation=None):
+            exported.append(translation and translation.translation_id)
+            if len(exported) == 1:
+                raise ConnectionError("dropped")
+            path.write_text("STEP DATA")
+
+    monkeypatch.setattr(
+        "onshape2xacro.optimized_cad.OptimizedCAD.from_url",
+        lambda *args, **kwargs: MockCAD(),
+    )
+    monkeypatch.setattr(
+        OptimizedClient,
+        "current_microversion",
+        lambda self, did, wid: document["microversion"],
+    )
+    monkeypatch.setattr(StepTranslation, "start", start)
+    monkeypatch.setattr(StepTranslation, "wait", wait)
+    monkeypatch.setattr(
+        "onshape2xacro.mesh_exporters.step.StepMeshExporter", MockExporter
+    )
+    monkeypatch.setattr(
+        "onshape2xacro.pipeline.KinematicGraph.from_cad", lambda *args: MagicMock()
+    )
+    monkeypatch.setattr(
+        "onshape2xacro.pipeline.CondensedRobot.from_graph",
+        lambda *args, **kwargs: MagicMock(nodes=["base"]),
+    )
+    output_dir = tmp_path / "out"
+    config = FetchCadConfig(url=url, output=output_dir, http_cache_mb=0)
+
+    with pytest.raises(ConnectionError):
+        pipeline.run_fetch_cad(config)
+    assert PendingTranslation.load(output_dir).translation_id == "t1"
+
+    # The rerun downloads the same result, so the partial file is resumed
+    pipeline.run_fetch_cad(config)
+    assert len(started) == 1 and exported == ["t1", "t1"]
+    assert PendingTranslation.load(output_dir) is None
+
+    # A translation recorded for another microversion is not reused
+    PendingTranslation(url, "mv0", "t1").save(output_dir)
+    document["microversion"] = "mv2"
+    pipeline.run_fetch_cad(config)
+    assert len(started) == 2 and exported[-1] == "t2"
+
+    # Nor one Onshape no longer knows
+    PendingTranslation(url, "mv3", "t2").save(output_dir)
+    gone.add("t2")
+    document["microversion"] = "mv3"
+    pipeline.run_fetch_cad(config)
+    assert len(started) == 2 and exported[-1] is None
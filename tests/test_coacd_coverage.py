@@ -136,10 +136,7 @@ def test_step_export_with_concurrent_coacd(tmp_path):
                 "onshape2xacro.mesh_exporters.step.as_completed"
             ) as mock_as_completed,
             patch("onshape2xacro.mesh_exporters.step.IFSelect_RetDone", new=1),
-            patch("onshape2xacro.mesh_exporters.step.BRepBuilderAPI_Transform"),
             patch("onshape2xacro.mesh_exporters.step.gp_Trsf"),
-            patch("onshape2xacro.mesh_exporters.step.BRep_Builder"),
-            patch("onshape2xacro.mesh_exporters.step.TopoDS_Compound"),
         ):
             # Setup basic mocks to pass file reading
             mock_reader = mock_reader_cls.return_value
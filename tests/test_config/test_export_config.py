@@ -51,3 +51,33 @@ def test_partial_merge():
     assert config.export.name == "only_name"
     assert config.export.output == Path("output")
     assert config.export.visual_option.formats == ["obj"]
+
+
+def test_load_part_filters(tmp_path):
+    config_path = tmp_path / "configuration.yaml"
+    config_path.write_text(
+        """
+export:
+  visual_option:
+    formats: [obj]
+    part_filter:
+      min_volume_mm3: 50.0
+      name_patterns: ["*screw*"]
+  collision_option:
+    method: fast
+    part_filter:
+      min-extent-mm: 8.0
+"""
+    )
+
+    config = ExportConfiguration.load(config_path)
+    visual_filter = config.export.visual_option.part_filter
+    collision_filter = config.export.collision_option.part_filter
+    assert visual_filter.min_volume_mm3 == 50.0
+    assert visual_filter.name_patterns == ["*screw*"]
+    assert collision_filter.min_extent_mm == 8.0
+    assert collision_filter.enabled
+
+    config.save(config_path)
+    reloaded = ExportConfiguration.load(config_path)
+    assert reloaded.export.visual_option.part_filter == visual_filter
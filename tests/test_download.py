@@ -0,0 +1,209 @@
+"""Tests for resumable downloads."""
+
+import json
+import os
+import re
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+import requests
+
+import onshape2xacro.download as download
+from onshape2xacro.download import ResumableDownload, sidecar_path
+
+MB = 1024 * 1024
+
+
+class FlakyServer:
+    """Local server of one body that honours ranges and drops connections.
+
+    Each request takes the next entry of ``drops`` (if any) as the number
+    of body bytes to send before closing the connection.
+    """
+
+    def __init__(self, body: bytes):
+        self.body = body
+        self.etag = '"v1"'
+        self.ranges = True
+        # Advertise ranges but answer them with the whole body
+        self.ignore_ranges = False
+        # A new ETag on every response
+        self.rotate_etag = False
+        self.drops: list[int | None] = []
+        self.seen: list[dict[str, str | None]] = []
+        self.lock = threading.Lock()
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def do_GET(self):
+                requested = self.headers.get("Range")
+                if_range = self.headers.get("If-Range")
+                with server.lock:
+                    server.seen.append({"range": requested, "if_range": if_range})
+                    drop = server.drops.pop(0) if server.drops else None
+                    if server.rotate_etag:
+                        server.etag = f'"v{len(server.seen)}"'
+                body = server.body
+                start, end = 0, len(body) - 1
+                partial = (
+                    server.ranges
+                    and not server.ignore_ranges
+                    and requested is not None
+                    and if_range in (None, server.etag)
+                )
+                if partial:
+                    first, last = re.match(r"bytes=(\d+)-(\d*)", requested).groups()
+                    start, end = int(first), int(last) if last else len(body) - 1
+                self.send_response(206 if partial else 200)
+                self.send_header("Content-Type", "application/octet-stream")
+                self.send_header("Content-Length", str(end - start + 1))
+                self.send_header("ETag", server.etag)
+                if server.ranges:
+                    self.send_header("Accept-Ranges", "bytes")
+                if partial:
+                    self.send_header(
+                        "Content-Range", f"bytes {start}-{end}/{len(body)}"
+                    )
+                self.end_headers()
+                payload = body[start : end + 1]
+                if drop is not None:
+                    self.wfile.write(payload[:drop])
+                    self.wfile.flush()
+                    self.close_connection = True
+                    return
+                self.wfile.write(payload)
+
+            def log_message(self, *args):
+                pass
+
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.url = f"http://127.0.0.1:{self.server.server_address[1]}/file"
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+
+    def fetch(self, headers):
+        return requests.get(self.url, headers=headers, stream=True, timeout=10)
+
+
+@pytest.fixture
+def server():
+    stub = FlakyServer(os.urandom(3 * MB))
+    yield stub
+    stub.server.shutdown()
+    stub.server.server_close()
+
+
+def _download(server, path, **kwargs):
+    return ResumableDownload(server.fetch, path, server.url, backoff=0, **kwargs)
+
+
+def test_dropped_connection_resumes_with_a_range(server, tmp_path):
+    server.drops = [int(2.5 * MB)]
+    path = tmp_path / "body.download"
+    assert _download(server, path).run()
+
+    assert path.read_bytes() == server.body
+    assert not sidecar_path(path).exists()
+    first, resumed = server.seen
+    assert first["range"] is None
+    first_byte, last_byte = re.match(r"bytes=(\d+)-(\d+)$", resumed["range"]).groups()
+    assert 0 < int(first_byte) <= 2.5 * MB
+    assert int(last_byte) == len(server.body) - 1
+    assert resumed["if_range"] == server.etag
+
+
+def test_server_without_ranges_starts_over(server, tmp_path):
+    server.ranges = False
+    server.drops = [int(2.5 * MB)]
+    path = tmp_path / "body.download"
+    assert _download(server, path).run()
+    assert path.read_bytes() == server.body
+    assert [seen["range"] for seen in server.seen] == [None, None]
+
+
+def test_large_bodies_download_in_parallel_segments(server, monkeypatch, tmp_path):
+    monkeypatch.setattr(download, "PARALLEL_MIN_SIZE", MB)
+    # One of the ranged segments drops part way
+    server.drops = [None, None, int(0.3 * MB)]
+    path = tmp_path / "body.download"
+    assert _download(server, path, segments=4).run()
+
+    assert path.read_bytes() == server.body
+    ranges = [seen["range"] for seen in server.seen]
+    assert ranges[0] is None
+    # Three segments after the first, plus the resumed one
+    assert len(ranges) == 5 and all(ranges[1:])
+
+
+def test_interrupted_download_resumes_in_a_later_run(server, tmp_path):
+    server.drops = [int(2.5 * MB)]
+    path = tmp_path / "body.download"
+    with pytest.raises(requests.exceptions.ChunkedEncodingError):
+        _download(server, path, max_retries=0).run()
+
+    state = json.loads(sidecar_path(path).read_text())
+    assert state["size"] == len(server.body) and state["etag"] == server.etag
+    assert path.stat().st_size == len(server.body)
+
+    server.seen.clear()
+    assert _download(server, path).run()
+    assert path.read_bytes() == server.body
+    assert len(server.seen) == 1 and server.seen[0]["range"].startswith("bytes=")
+
+
+def test_changed_body_is_downloaded_anew(server, tmp_path):
+    server.drops = [int(2.5 * MB)]
+    path = tmp_path / "body.download"
+    with pytest.raises(requests.exceptions.ChunkedEncodingError):
+        _download(server, path, max_retries=0).run()
+
+    server.body = os.urandom(2 * MB)
+    server.etag = '"v2"'
+    server.seen.clear()
+    assert _download(server, path).run()
+    assert path.read_bytes() == server.body
+    # The stale range was refused, so the new body was requested whole
+    assert [seen["if_range"] for seen in server.seen] == ['"v1"', None]
+
+
+def test_rejected_body_is_not_kept(server, tmp_path):
+    path = tmp_path / "body.download"
+    assert not _download(server, path).run(accept=lambda head: False)
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_ignored_ranges_fall_back_to_one_whole_download(server, monkeypatch, tmp_path):
+    monkeypatch.setattr(download, "PARALLEL_MIN_SIZE", MB)
+    server.ignore_ranges = True
+    path = tmp_path / "body.download"
+    assert _download(server, path, segments=4).run()
+
+    assert path.read_bytes() == server.body
+    ranges = [seen["range"] for seen in server.seen]
+    # The whole-body answers to the three segments, then one plain GET
+    assert len(ranges) == 5 and all(ranges[1:4]) and ranges[4] is None
+    assert not sidecar_path(path).exists()
+
+
+def test_changing_etag_falls_back_to_one_whole_download(server, tmp_path):
+    server.rotate_etag = True
+    server.drops = [int(2.5 * MB)]
+    path = tmp_path / "body.download"
+    assert _download(server, path, max_retries=3).run()
+
+    assert path.read_bytes() == server.body
+    ranges = [seen["range"] for seen in server.seen]
+    # Dropped, the resume refused, then the whole body without ranges
+    assert ranges[0] is None and ranges[1] is not None and ranges[2:] == [None]
+    assert server.seen[1]["if_range"] == '"v1"'
+
+
+def test_restarts_are_bounded(server, monkeypatch, tmp_path):
+    monkeypatch.setattr(download, "PARALLEL_MIN_SIZE", MB)
+    server.ignore_ranges = True
+    path = tmp_path / "body.download"
+    with pytest.raises(RuntimeError, match="restarted"):
+        _download(server, path, max_retries=0).run()
+    assert len(server.seen) == 4
@@ -0,0 +1,136 @@
+"""Tests for the persistent Onshape API response cache."""
+
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from onshape2xacro.http_cache import HttpCache, document_address
+from onshape2xacro.optimized_cad import OptimizedClient
+from onshape_robotics_toolkit.connect import HTTP
+
+DID = "a" * 24
+WID = "b" * 24
+MID = "c" * 24
+EID = "d" * 24
+
+
+class StubOnshape:
+    """Local server answering a few document paths and counting requests."""
+
+    def __init__(self):
+        self.microversion = "1" * 24
+        self.requests: list[str] = []
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                stub.requests.append(self.path)
+                path = self.path.split("?")[0]
+                if path.endswith("/currentmicroversion"):
+                    payload = {"microversion": stub.microversion}
+                elif "/missing" in path:
+                    self.send_response(404)
+                    self.end_headers()
+                    return
+                else:
+                    payload = {"path": path, "microversion": stub.microversion}
+                body = json.dumps(payload).encode()
+                self.send_response(200)
+                self.send_header("Content-Type", "application/json;charset=UTF-8")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args):
+                pass
+
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.url = f"http://127.0.0.1:{self.server.server_address[1]}"
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+
+    def count(self, fragment: str) -> int:
+        return sum(fragment in path for path in self.requests)
+
+
+@pytest.fixture
+def stub(monkeypatch):
+    monkeypatch.setenv("ONSHAPE_ACCESS_KEY", "access")
+    monkeypatch.setenv("ONSHAPE_SECRET_KEY", "secret")
+    server = StubOnshape()
+    yield server
+    server.server.shutdown()
+    server.server.server_close()
+
+
+def _client(stub):
+    return OptimizedClient(base_url=stub.url, http_cache=HttpCache.open(16))
+
+
+def test_document_address():
+    assert document_address(f"/api/assemblies/d/{DID}/w/{WID}/e/{EID}") == (
+        DID,
+        "w",
+        WID,
+    )
+    assert document_address(f"/api/documents/{DID}") is None
+
+
+def test_repeated_fetch_of_unchanged_document_hits_the_cache(stub):
+    workspace = f"/api/assemblies/d/{DID}/w/{WID}/e/{EID}"
+    immutable = f"/api/parts/d/{DID}/m/{MID}/e/{EID}/partid/JHD/massproperties"
+
+    first = _client(stub)
+    for path in (workspace, immutable):
+        assert first.request(HTTP.GET, path, query={"a": "1"}).json()["path"] == path
+    assert len(stub.requests) == 3  # microversion lookup + two requests
+
+    second = _client(stub)
+    assert second.request(HTTP.GET, workspace, query={"a": "1"}).json() == {
+        "path": workspace,
+        "microversion": stub.microversion,
+    }
+    assert second.request(HTTP.GET, immutable, query={"a": "1"}).json()["path"] == (
+        immutable
+    )
+    # Only the workspace was revalidated
+    assert len(stub.requests) == 4
+    assert second.http_cache.hits == 2 and second.http_cache.hit_rate == 1.0
+    assert second.api_call_count == 1
+
+    # A different query is a different response
+    second.request(HTTP.GET, immutable, query={"a": "2"})
+    assert len(stub.requests) == 5
+
+
+def test_workspace_edits_invalidate_workspace_responses(stub):
+    workspace = f"/api/assemblies/d/{DID}/w/{WID}/e/{EID}"
+    immutable = f"/api/parts/d/{DID}/m/{MID}/e/{EID}/massproperties"
+    client = _client(stub)
+    client.request(HTTP.GET, workspace)
+    client.request(HTTP.GET, immutable)
+
+    stub.microversion = "2" * 24
+    client = _client(stub)
+    assert client.request(HTTP.GET, workspace).json()["microversion"] == "2" * 24
+    client.request(HTTP.GET, immutable)
+    assert stub.count(f"/e/{EID}") == 3
+    assert stub.count("currentmicroversion") == 2
+
+
+def test_failures_and_uncached_requests_go_to_the_network(stub):
+    missing = f"/api/parts/d/{DID}/m/{MID}/e/{EID}/missing"
+    metadata = f"/api/documents/{DID}"
+    for _ in range(2):
+        client = _client(stub)
+        assert client.request(HTTP.GET, missing).status_code == 404
+        client.request(HTTP.GET, metadata)
+    assert stub.count("/missing") == 2
+    assert stub.count(metadata) == 2
+
+    part = f"/api/parts/d/{DID}/m/{MID}/e/{EID}"
+    uncached = OptimizedClient(base_url=stub.url)
+    uncached.request(HTTP.GET, part)
+    uncached.request(HTTP.GET, part)
+    assert stub.requests.count(part) == 2
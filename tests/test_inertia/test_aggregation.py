@@ -0,0 +1,83 @@
+"""Tests for batched inertia aggregation and validation."""
+
+import numpy as np
+import pytest
+from scipy.spatial.transform import Rotation
+
+from onshape2xacro.inertia.aggregation import (
+    aggregate,
+    place_parts,
+    stack_parts,
+    validate_tensors,
+)
+from onshape2xacro.inertia.types import MassProperties
+
+
+def _random_parts(count, seed=0):
+    rng = np.random.default_rng(seed)
+    parts, transforms = [], []
+    for _ in range(count):
+        extents = rng.uniform(1.0, 20.0, 3)
+        volume = float(np.prod(extents))
+        inertia = np.diag(
+            volume / 12 * (np.sum(extents**2) - extents**2)
+        )  # box about its COM, unit density
+        parts.append(MassProperties(volume, rng.uniform(-5, 5, 3), inertia))
+        transform = np.eye(4)
+        transform[:3, :3] = Rotation.random(random_state=rng).as_matrix()
+        transform[:3, 3] = rng.uniform(-100, 100, 3)
+        transforms.append(transform)
+    return parts, np.stack(transforms)
+
+
+def test_batched_aggregation_matches_per_part_loop():
+    parts, transforms = _random_parts(50)
+    masses = np.linspace(0.1, 2.0, len(parts))
+
+    volumes, coms, inertias = stack_parts(parts)
+    coms, inertias = place_parts(coms, inertias, transforms)
+    total, com, tensor = aggregate(masses, coms, inertias * masses[:, None, None])
+
+    # Reference: place one part at a time, then shift each to the link COM
+    placed = [
+        MassProperties(
+            p.volume,
+            t[:3, :3] @ p.com + t[:3, 3],
+            t[:3, :3] @ p.inertia @ t[:3, :3].T,
+        )
+        for p, t in zip(parts, transforms)
+    ]
+    expected_com = sum(m * p.com for m, p in zip(masses, placed)) / masses.sum()
+    expected = np.zeros((3, 3))
+    for m, p in zip(masses, placed):
+        d = p.com - expected_com
+        expected += m * p.inertia + m * (d @ d * np.eye(3) - np.outer(d, d))
+
+    assert total == pytest.approx(masses.sum())
+    assert np.allclose(com, expected_com)
+    assert np.allclose(tensor, expected, rtol=1e-12)
+    assert np.allclose(tensor, tensor.T)
+
+
+def test_aggregate_without_mass():
+    total, com, tensor = aggregate(np.zeros(2), np.ones((2, 3)), np.ones((2, 3, 3)))
+    assert total == 0.0 and not com.any() and not tensor.any()
+
+
+def test_validate_tensors_in_one_batch():
+    valid = np.diag([1.0, 2.0, 2.5])
+    triangle = np.diag([1.0, 1.0, 3.0])
+    zero = np.diag([0.0, 1.0, 1.0])
+    # Positive diagonal but an off-diagonal term too large
+    indefinite = np.array([[1.0, 2.0, 0.0], [2.0, 1.0, 0.0], [0.0, 0.0, 1.5]])
+
+    warnings = validate_tensors(np.stack([valid, triangle, zero, indefinite]))
+    assert warnings[0] == []
+    assert warnings[1] == [
+        "Triangle inequality violated: ixx+iyy < izz (1.000e+00+1.000e+00 < 3.000e+00)"
+    ]
+    assert warnings[2][0].startswith("Invalid inertia: diagonal elements")
+    assert "exactly zero" in warnings[2][1]
+    assert warnings[3] == [
+        "Inertia tensor is not positive definite (smallest principal moment -1.000e+00)"
+    ]
@@ -1,8 +1,10 @@
 """Tests for BOM parser."""
 
+import random
+
 import pytest
 from pathlib import Path
-from onshape2xacro.inertia.bom import BOMParser, BOMEntry
+from onshape2xacro.inertia.bom import BOMParser, BOMEntry, BOMIndex, normalize_name
 
 
 @pytest.fixture
@@ -43,3 +45,56 @@ def test_bom_entry_has_material():
     entry = BOMEntry(name="test", material="steel", mass_kg=None)
     assert entry.has_mass is False
     assert entry.has_material is True
+
+
+def _scan_link(entries, link_name):
+    if link_name in entries:
+        return link_name
+    return next((n for n in entries if n.lower() in link_name.lower()), None)
+
+
+def _scan_part(entries, part_id, part_name_full):
+    # Linear-scan reference for BOMIndex.match_part
+    if part_id in entries:
+        return part_id
+    for name in entries:
+        if normalize_name(name) == normalize_name(part_id):
+            return name
+    if part_name_full:
+        full = normalize_name(part_name_full)
+        for name in sorted(entries, key=len, reverse=True):
+            bom = normalize_name(name)
+            if len(bom) >= 3 and (bom in full or full in bom):
+                return name
+    return None
+
+
+def test_bom_index_matches_linear_scan():
+    rng = random.Random(0)
+    words = ["base", "plate", "M3", "screw", "servo", "horn", "arm", "x", "4310"]
+    separators = [" ", "_", "-", ".", "&"]
+
+    def name(k):
+        return rng.choice(separators).join(rng.choice(words) for _ in range(k))
+
+    entries = {}
+    for _ in range(200):
+        n = name(rng.randint(1, 3))
+        entries[n] = BOMEntry(name=n, material=None, mass_kg=1.0)
+    index = BOMIndex(entries)
+
+    for i in range(500):
+        full = f"{name(rng.randint(1, 4))}_{rng.randint(1, 3)}"
+        if rng.random() < 0.2:
+            full = f"sub-asm-{name(1)}_1_{full}"
+        part_id, entry, match_type, match = index.match_part(full, i)
+        assert match == _scan_part(entries, part_id, full)
+        assert (entry is None) == (match is None) and (match_type == "none") == (
+            match is None
+        )
+        link = name(rng.randint(1, 3))
+        assert index.match_link(link)[2] == _scan_link(entries, link)
+
+    assert index.match_part(None, 7)[0] == "solid_7"
+    # Memoized lookups return the same result
+    assert index.match_part("base_plate_1", 0) is index.match_part("base_plate_1", 0)
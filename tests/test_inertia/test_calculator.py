@@ -62,3 +62,49 @@ def test_material_density_lookup():
 
     # Unknown returns default
     assert calc._get_density("unobtanium") == 1000
+
+
+def test_user_material_densities():
+    calc = InertiaCalculator(material_densities={"Unobtanium": 500.0, "Steel": 7900.0})
+    assert calc._get_density("unobtanium alloy") == 500.0
+    # User entries override the built-in table
+    assert calc._get_density("steel") == 7900.0
+    assert calc._get_density("Aluminum 6061") == 2700
+    assert calc.materials._resolved["Aluminum 6061"] == 2700
+
+
+def test_prototype_instances_match_direct_integration():
+    """Placed prototype properties equal integrating the placed copies."""
+    import cadquery as cq
+    import numpy as np
+    from unittest.mock import MagicMock, patch
+
+    prototype = cq.Workplane("XY").box(10, 20, 30).translate((5, 0, 0)).val()
+    rotation = np.array([[0.0, -1.0, 0.0], [1.0, 0.0, 0.0], [0.0, 0.0, 1.0]])
+    placements = [np.eye(4), np.eye(4)]
+    placements[1][:3, :3] = rotation
+    placements[1][:3, 3] = [40.0, 10.0, 0.0]
+
+    calc = InertiaCalculator(default_density=1000.0)
+    with patch.object(
+        calc, "_solid_mass_properties", wraps=calc._solid_mass_properties
+    ) as mock_integrate:
+        parts = [calc.prototype_properties(prototype.wrapped) for _ in placements]
+    assert mock_integrate.call_count == 1
+    props = calc.compute_from_parts_with_bom(
+        parts, {}, "link", MagicMock(), transforms=np.stack(placements)
+    )
+
+    placed = cq.Compound.makeCompound(
+        [
+            prototype,
+            prototype.rotate((0, 0, 0), (0, 0, 1), 90).translate((40, 10, 0)),
+        ]
+    )
+    expected = calc._scale_properties(calc._solid_mass_properties(placed), 1000.0)
+    assert props.mass == pytest.approx(expected.mass)
+    assert props.com == pytest.approx(expected.com)
+    for name in ("ixx", "iyy", "izz", "ixy", "ixz", "iyz"):
+        assert getattr(props, name) == pytest.approx(
+            getattr(expected, name), rel=1e-9, abs=1e-15
+        ), name
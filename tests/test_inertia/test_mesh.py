@@ -0,0 +1,57 @@
+"""Tests for mesh-based mass properties."""
+
+import cadquery as cq
+import numpy as np
+import pytest
+import trimesh
+from scipy.spatial.transform import Rotation
+
+from onshape2xacro.inertia.calculator import InertiaCalculator
+from onshape2xacro.inertia.mesh import mesh_mass_properties
+from onshape2xacro.inertia.report import MethodComparison
+from onshape2xacro.inertia.types import InertialProperties
+
+
+def test_box_matches_analytic_values():
+    mesh = trimesh.creation.box((10.0, 20.0, 30.0))
+    transform = np.eye(4)
+    transform[:3, :3] = Rotation.from_euler("xyz", [0.3, -0.7, 1.1]).as_matrix()
+    transform[:3, 3] = [500.0, -200.0, 100.0]
+    mesh.apply_transform(transform)
+
+    props = mesh_mass_properties(mesh.vertices, mesh.faces)
+    volume = 10.0 * 20.0 * 30.0
+    local = np.diag([20.0**2 + 30.0**2, 10.0**2 + 30.0**2, 10.0**2 + 20.0**2])
+    rotation = transform[:3, :3]
+
+    assert props.volume == pytest.approx(volume)
+    assert np.allclose(props.com, transform[:3, 3])
+    assert np.allclose(props.inertia, rotation @ (volume / 12 * local) @ rotation.T)
+
+    inverted = mesh_mass_properties(mesh.vertices, mesh.faces[:, ::-1])
+    assert inverted.volume == pytest.approx(volume)
+    assert np.allclose(inverted.inertia, props.inertia)
+
+
+def test_tessellated_solid_is_close_to_exact_integration():
+    shape = cq.Workplane("XY").cylinder(40.0, 15.0).faces(">Z").hole(8.0).val().wrapped
+    exact = InertiaCalculator().prototype_properties(shape)
+    vertices, triangles = cq.Shape.cast(shape).tessellate(0.01)
+    props = mesh_mass_properties(
+        np.array([v.toTuple() for v in vertices]), np.array(triangles)
+    )
+
+    assert props.volume == pytest.approx(exact.volume, rel=1e-3)
+    assert np.allclose(props.com, exact.com, atol=1e-3)
+    assert np.allclose(props.inertia, exact.inertia, rtol=2e-3, atol=1.0)
+
+
+def test_method_comparison_errors():
+    exact = InertialProperties(mass=2.0, com=(0.0, 0.0, 0.0), ixx=1.0, iyy=1.0, izz=1.0)
+    mesh = InertialProperties(
+        mass=2.02, com=(0.001, 0.0, 0.0), ixx=1.0, iyy=1.0, izz=1.03
+    )
+    comparison = MethodComparison.between(exact, mesh)
+    assert comparison.mass_error == pytest.approx(0.01)
+    assert comparison.com_error_mm == pytest.approx(1.0)
+    assert comparison.inertia_error == pytest.approx(0.03 / np.sqrt(3))
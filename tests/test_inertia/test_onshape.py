@@ -0,0 +1,108 @@
+"""Tests for inertia from Onshape-computed mass properties."""
+
+from types import SimpleNamespace
+
+import cadquery as cq
+import numpy as np
+import pytest
+from scipy.spatial.transform import Rotation
+
+from onshape2xacro.inertia.bom import BOMEntry
+from onshape2xacro.inertia.calculator import InertiaCalculator
+from onshape2xacro.inertia.onshape import onshape_mass_properties
+from onshape2xacro.inertia.stage import compute_link_inertia, LinkInertiaTask
+
+STEEL = 7850.0
+
+
+def _shapes():
+    plate = cq.Workplane("XY").box(80.0, 40.0, 5.0).val().wrapped
+    screw = cq.Workplane("XY").cylinder(10.0, 1.5).val().wrapped
+    return plate, screw
+
+
+def _onshape_part(props, density):
+    """A part carrying what Onshape reports for ``props`` (mm) at ``density``."""
+    volume = props.volume * 1e-9
+    return SimpleNamespace(
+        MassProperty=SimpleNamespace(
+            mass=[volume * density, volume * density, volume * density],
+            volume=[volume, volume, volume],
+            centroid=[*(props.com * 1e-3), 0.0],
+            inertia=[*(props.inertia.ravel() * 1e-15 * density), 0.0],
+        )
+    )
+
+
+def _task(bom, shapes, onshape, method="onshape"):
+    transforms = np.repeat(np.eye(4)[None], 2, axis=0)
+    transforms[0, :3, :3] = Rotation.from_euler("xyz", [30, 0, 45], True).as_matrix()
+    transforms[0, :3, 3] = [12.0, -4.0, 7.0]
+    transforms[1, :3, 3] = [10.0, 5.0, 5.0]
+    return LinkInertiaTask(
+        link_name="base",
+        prototype_index=[0, 1],
+        transforms=transforms,
+        part_metadata=[{"part_name": "base_plate_1"}, {"part_name": "M3 screw_1"}],
+        bom_entries=bom,
+        method=method,
+        shapes=shapes,
+        onshape=onshape,
+    )
+
+
+def test_conversion_skips_parts_without_usable_data():
+    assert onshape_mass_properties(SimpleNamespace(MassProperty=None)) is None
+    assert onshape_mass_properties(SimpleNamespace()) is None
+    # No material assigned in Onshape
+    massless = SimpleNamespace(
+        MassProperty=SimpleNamespace(
+            mass=[0.0], volume=[1e-6], centroid=[0.0] * 3, inertia=[0.0] * 9
+        )
+    )
+    assert onshape_mass_properties(massless) is None
+
+
+def test_onshape_parts_match_exact_integration_without_their_geometry():
+    plate, screw = _shapes()
+    calc = InertiaCalculator()
+    known = onshape_mass_properties(
+        _onshape_part(calc.prototype_properties(plate), STEEL)
+    )
+    assert known is not None and known[1] == pytest.approx(STEEL)
+
+    steel = {
+        "base_plate": BOMEntry("base_plate", "Steel", None),
+        "M3 screw": BOMEntry("M3 screw", "Steel", None),
+    }
+    exact = compute_link_inertia(
+        _task(steel, [plate, screw], [], method="exact"), InertiaCalculator()
+    )
+    # The plate's shape is never needed; the screw falls back to the STEP
+    onshape = compute_link_inertia(
+        _task({"M3 screw": steel["M3 screw"]}, [None, screw], [known, None]),
+        InertiaCalculator(),
+    )
+
+    assert onshape.error is None
+    assert onshape.properties.mass == pytest.approx(exact.properties.mass, rel=1e-9)
+    assert np.allclose(onshape.properties.com, exact.properties.com, atol=1e-12)
+    for axis in ("ixx", "iyy", "izz", "ixy", "ixz", "iyz"):
+        assert getattr(onshape.properties, axis) == pytest.approx(
+            getattr(exact.properties, axis), rel=1e-9, abs=1e-15
+        )
+    assert [p.mass_source for p in onshape.parts] == ["Onshape", "Material Density"]
+    assert not onshape.parts[0].warnings
+
+
+def test_bom_mass_overrides_onshape_mass():
+    plate, screw = _shapes()
+    known = onshape_mass_properties(
+        _onshape_part(InertiaCalculator().prototype_properties(plate), STEEL)
+    )
+    bom = {"base_plate": BOMEntry("base_plate", None, 0.5)}
+    result = compute_link_inertia(
+        _task(bom, [None, screw], [known, None]), InertiaCalculator()
+    )
+    assert result.parts[0].mass_source == "BOM Mass"
+    assert result.parts[0].mass_kg == pytest.approx(0.5)
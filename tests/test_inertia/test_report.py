@@ -1,6 +1,6 @@
 """Tests for inertia report."""
 
-from onshape2xacro.inertia.report import InertiaReport
+from onshape2xacro.inertia.report import InertiaReport, MethodComparison
 
 
 def test_report_add_warning():
@@ -28,3 +28,10 @@ def test_report_no_warnings():
     report = InertiaReport()
     summary = report.get_summary()
     assert "no warnings" in summary.lower() or "all parts" in summary.lower()
+
+
+def test_report_comparison_table():
+    report = InertiaReport()
+    report.comparisons["link1"] = MethodComparison(0.001, 0.05, 0.004)
+    table = report.generate_comparison_table()
+    assert "| link1 | 0.100% | 0.050 | 0.400% |" in table
@@ -0,0 +1,114 @@
+"""Tests for the parallel link inertia stage."""
+
+import cadquery as cq
+import numpy as np
+import pytest
+
+from onshape2xacro.inertia.bom import BOMEntry
+from onshape2xacro.inertia.calculator import InertiaCalculator
+from onshape2xacro.inertia.report import InertiaReport
+from onshape2xacro.inertia.stage import (
+    LinkInertiaTask,
+    deserialize_shape,
+    merge_results,
+    run_inertia_stage,
+    serialize_shape,
+)
+
+BOM = {
+    "base_plate": BOMEntry("base_plate", "Aluminum", None),
+    "M3 screw": BOMEntry("M3 screw", "Steel", None),
+    "horn": BOMEntry("horn", None, 0.02),
+    "unused": BOMEntry("unused", "PLA", None),
+}
+
+
+def _shapes():
+    plate = cq.Workplane("XY").box(80.0, 40.0, 5.0).val().wrapped
+    screw = cq.Workplane("XY").cylinder(10.0, 1.5).val().wrapped
+    return plate, screw
+
+
+def _tasks(calc):
+    plate, screw = _shapes()
+    tasks = []
+    for k, link_name in enumerate(("base", "arm", "wrist")):
+        metadata = [{"part_name": "base_plate_1"}] + [
+            {"part_name": f"M3 screw_{i}"} for i in range(k + 1)
+        ]
+        transforms = np.repeat(np.eye(4)[None], len(metadata), axis=0)
+        transforms[1:, :3, 3] = [[10.0 * i, 5.0, 5.0] for i in range(k + 1)]
+        tasks.append(
+            LinkInertiaTask(
+                link_name=link_name,
+                prototype_index=[0] + [1] * (k + 1),
+                transforms=transforms,
+                part_metadata=metadata,
+                bom_entries=calc.bom_subset(BOM, link_name, len(metadata), metadata),
+                shapes=[plate, screw],
+            )
+        )
+    return tasks
+
+
+def test_shape_serialization_round_trip():
+    plate, _ = _shapes()
+    calc = InertiaCalculator()
+    original = calc.prototype_properties(plate)
+    restored = InertiaCalculator().prototype_properties(
+        deserialize_shape(serialize_shape(plate))
+    )
+    assert restored.volume == original.volume
+    assert np.array_equal(restored.com, original.com)
+    assert np.array_equal(restored.inertia, original.inertia)
+
+
+def test_bom_subset_resolves_like_the_full_bom():
+    calc = InertiaCalculator()
+    metadata = [{"part_name": "base_plate_1"}, {"part_name": "M3 screw_2"}]
+    subset = calc.bom_subset(BOM, "base", 2, metadata)
+    assert list(subset) == ["base_plate", "M3 screw"]
+
+    parts = [calc.prototype_properties(s) for s in _shapes()]
+    full_report, subset_report = InertiaReport(), InertiaReport()
+    full = calc.compute_from_parts_with_bom(parts, BOM, "base", full_report, metadata)
+    sub = calc.compute_from_parts_with_bom(
+        parts, subset, "base", subset_report, metadata
+    )
+    assert full == sub
+    assert full_report.link_parts == subset_report.link_parts
+
+
+def test_parallel_stage_matches_serial_run():
+    calc = InertiaCalculator()
+    tasks = _tasks(calc)
+    serial, parallel = InertiaReport(), InertiaReport()
+    merge_results(run_inertia_stage(tasks, max_workers=1, calc=calc), serial)
+    seen = []
+    merge_results(
+        run_inertia_stage(tasks, max_workers=2, progress=seen.append), parallel
+    )
+
+    assert [r.link_name for r in seen] == ["base", "arm", "wrist"]
+    assert list(parallel.link_properties) == ["base", "arm", "wrist"]
+    assert parallel.link_properties == serial.link_properties
+    assert parallel.link_parts == serial.link_parts
+    assert parallel.generate_debug_table() == serial.generate_debug_table()
+    assert serial.link_properties["base"].mass == pytest.approx(
+        80 * 40 * 5 * 1e-9 * 2700 + np.pi * 1.5**2 * 10 * 1e-9 * 7850, rel=1e-6
+    )
+
+
+def test_failed_links_are_reported():
+    task = LinkInertiaTask(
+        link_name="broken",
+        prototype_index=[0],
+        transforms=np.eye(4)[None],
+        part_metadata=[],
+        bom_entries={},
+        shapes=[],
+    )
+    report = InertiaReport()
+    computed, failed = merge_results(run_inertia_stage([task]), report)
+    assert computed == [] and failed == ["broken"]
+    assert "broken" not in report.link_properties
@@ -43,13 +43,21 @@ def test_full_config_workflow(monkeypatch, tmp_path):
         def __init__(self, client, cad):
             pass
 
-        def export_step(self, path):
+        def export_step(self, path, translation=None):
             with open(path, "w") as f:
                 f.write("STEP DATA")
 
     monkeypatch.setattr(
         "onshape2xacro.mesh_exporters.step.StepMeshExporter", MockExporter
     )
+    monkeypatch.setattr(
+        "onshape2xacro.mesh_exporters.step.StepTranslation.start",
+        lambda *args: MagicMock(translation_id="t1"),
+    )
+    monkeypatch.setattr(
+        "onshape2xacro.optimized_cad.OptimizedClient.current_microversion",
+        lambda self, did, wid: "mv1",
+    )
 
     mock_graph = MagicMock()
     monkeypatch.setattr(
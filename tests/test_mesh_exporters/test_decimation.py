@@ -0,0 +1,107 @@
+"""Tests for part-aware visual mesh decimation."""
+
+import numpy as np
+import trimesh
+
+import onshape2xacro.mesh_exporters.decimation as decimation
+from onshape2xacro.mesh_exporters.decimation import (
+    MIN_PART_FACES,
+    DecimationPool,
+    PartMesh,
+    allocate_face_budget,
+    decimate_parts,
+    part_visibility,
+)
+
+
+def _sphere(radius=1.0, center=(0.0, 0.0, 0.0), subdivisions=3, color=None):
+    mesh = trimesh.creation.icosphere(subdivisions=subdivisions, radius=radius)
+    mesh.apply_translation(center)
+    return PartMesh(np.asarray(mesh.vertices), np.asarray(mesh.faces), color)
+
+
+def test_allocate_face_budget_caps_and_redistributes():
+    big = _sphere(10.0, subdivisions=4)  # 5120 faces
+    small = _sphere(1.0, center=(30, 0, 0), subdivisions=1)  # 80 faces
+    parts = [big, small]
+
+    targets = allocate_face_budget(parts, 2000, weights=np.array([1.0, 1.0]))
+
+    # Small part is capped at its own face count, the rest goes to the big part
+    assert targets[1] == small.face_count
+    assert targets[0] == 2000 - small.face_count
+    assert targets.sum() <= 2000
+
+
+def test_allocate_face_budget_keeps_minimum_faces():
+    parts = [_sphere(10.0, subdivisions=4), _sphere(0.1, center=(30, 0, 0))]
+    targets = allocate_face_budget(parts, 500)
+    assert targets[1] >= MIN_PART_FACES
+    assert targets[0] <= parts[0].face_count
+
+
+def test_allocate_face_budget_no_decimation_needed():
+    parts = [_sphere(subdivisions=1), _sphere(subdivisions=1, center=(5, 0, 0))]
+    targets = allocate_face_budget(parts, 10_000)
+    assert list(targets) == [p.face_count for p in parts]
+
+
+def test_part_visibility_penalizes_hidden_parts():
+    shell = _sphere(10.0, subdivisions=3)
+    hidden = _sphere(1.0, subdivisions=2)
+    visibility = part_visibility([shell, hidden])
+    assert visibility[0] > 0.9
+    assert visibility[1] < 0.5
+
+
+def test_decimate_parts_meets_budget_and_keeps_colors():
+    red = (1.0, 0.0, 0.0)
+    blue = (0.0, 0.0, 1.0)
+    parts = [
+        _sphere(10.0, subdivisions=4, color=red),
+        _sphere(5.0, center=(30, 0, 0), subdivisions=4, color=blue),
+    ]
+
+    decimated = decimate_parts(parts, 2000, max_workers=1)
+
+    assert len(decimated) == 2
+    assert sum(p.face_count for p in decimated) <= 2100
+    # Larger visible part gets the bigger share
+    assert decimated[0].face_count > decimated[1].face_count
+    assert [p.color for p in decimated] == [red, blue]
+
+    for part in decimated:
+        assert part.faces.shape == (part.face_count, 3)
+        assert part.faces.min() >= 0 and part.faces.max() < len(part.vertices)
+
+
+def test_progressive_lods_seed_from_previous_level():
+    from onshape2xacro.mesh_exporters.step import _lod_ratios
+
+    assert _lod_ratios([0.05, 0.25, 1.5, 0.25]) == [0.25, 0.05]
+
+    parts = [_sphere(10.0, subdivisions=4), _sphere(5.0, center=(30, 0, 0))]
+    base = sum(p.face_count for p in parts)
+    seed = parts
+    counts = []
+    for ratio in _lod_ratios([0.25, 0.05]):
+        seed = decimate_parts(seed, int(base * ratio))
+        counts.append(sum(p.face_count for p in seed))
+    assert base > counts[0] > counts[1]
+
+
+def test_shared_pool_starts_once_and_skips_small_task_lists(monkeypatch):
+    parts = [_sphere(10.0, subdivisions=4), _sphere(5.0, center=(30, 0, 0))]
+    with DecimationPool(max_workers=2) as pool:
+        # Below POOL_MIN_FACES: decimated inline, no processes started
+        decimate_parts(parts, 2000, pool=pool)
+        assert pool._executor is None
+
+        monkeypatch.setattr(decimation, "POOL_MIN_FACES", 1000)
+        first = decimate_parts(parts, 2000, pool=pool)
+        executor = pool._executor
+        assert executor is not None
+        second = decimate_parts(parts, 1000, pool=pool)
+        assert pool._executor is executor
+    assert pool._executor is None
+    assert sum(p.face_count for p in first) > sum(p.face_count for p in second)
@@ -0,0 +1,181 @@
+"""Tests for the quantized GLB writer."""
+
+import json
+import struct
+
+import numpy as np
+import pytest
+import trimesh
+
+from onshape2xacro.mesh_exporters.buffers import weld_mesh
+from onshape2xacro.mesh_exporters.decimation import PartMesh
+from onshape2xacro.mesh_exporters.gltf import (
+    INSTANCING_EXTENSION,
+    QUANTIZATION_EXTENSION,
+    UNSIGNED_SHORT,
+    write_glb,
+    write_instanced_glb,
+)
+
+
+def _soup(mesh, color=None):
+    """Unwelded triangle soup, as read back from an STL file."""
+    vertices = np.asarray(mesh.vertices)[np.asarray(mesh.faces)].reshape(-1, 3)
+    return PartMesh(vertices, np.arange(len(vertices)).reshape(-1, 3), color)
+
+
+def _read_glb(path):
+    data = path.read_bytes()
+    magic, version, length = struct.unpack("<III", data[:12])
+    assert (magic, version, length) == (0x46546C67, 2, len(data))
+    json_length = struct.unpack("<I", data[12:16])[0]
+    binary = data[20 + json_length + 8 :]
+    return json.loads(data[20 : 20 + json_length]), binary
+
+
+def _read_json(path):
+    return _read_glb(path)[0]
+
+
+def _accessor(gltf, binary, index):
+    accessor = gltf["accessors"][index]
+    view = gltf["bufferViews"][accessor["bufferView"]]
+    dtype = {5120: np.int8, 5123: np.uint16, 5125: np.uint32, 5126: np.float32}[
+        accessor["componentType"]
+    ]
+    width = {"SCALAR": 1, "VEC3": 3, "VEC4": 4}[accessor["type"]]
+    raw = binary[view["byteOffset"] : view["byteOffset"] + view["byteLength"]]
+    stride = view.get("byteStride", width * np.dtype(dtype).itemsize)
+    rows = np.frombuffer(raw, dtype=dtype).reshape(accessor["count"], -1)
+    assert rows.shape[1] * np.dtype(dtype).itemsize == stride
+    return rows[:, :width].astype(np.float64)
+
+
+def test_weld_mesh_keeps_sharp_edges():
+    box = _soup(trimesh.creation.box((10, 20, 30)))
+    positions, normals, triangles = weld_mesh(box.vertices, box.faces)
+    # 8 corners, each split into 3 vertices (one per adjacent side)
+    assert len(positions) == 24
+    assert len(triangles) == 12
+    assert np.allclose(np.linalg.norm(normals, axis=1), 1.0)
+
+    sphere = _soup(trimesh.creation.icosphere(subdivisions=2))
+    positions, _, _ = weld_mesh(sphere.vertices, sphere.faces)
+    assert len(positions) == 162  # fully welded, smooth shading
+
+
+def test_write_glb_quantized(tmp_path):
+    sphere = trimesh.creation.icosphere(subdivisions=3, radius=50.0)
+    box = trimesh.creation.box((100, 20, 30))
+    box.apply_translation((200, 0, 0))
+    parts = [_soup(sphere, (1.0, 0.0, 0.0)), _soup(box, (0.0, 0.0, 1.0))]
+
+    path = tmp_path / "link.glb"
+    write_glb(path, parts, name="link", quantize=True)
+
+    gltf = _read_json(path)
+    assert gltf["extensionsRequired"] == [QUANTIZATION_EXTENSION]
+    assert len(gltf["materials"]) == 2
+    primitives = gltf["meshes"][0]["primitives"]
+    assert [p["material"] for p in primitives] == [0, 1]
+    for primitive in primitives:
+        indices = gltf["accessors"][primitive["indices"]]
+        position = gltf["accessors"][primitive["attributes"]["POSITION"]]
+        assert indices["componentType"] == UNSIGNED_SHORT
+        assert position["componentType"] == UNSIGNED_SHORT
+
+    loaded = trimesh.load(path, force="mesh")
+    assert len(loaded.faces) == len(sphere.faces) + len(box.faces)
+    expected = np.array([[-50.0, -50.0, -50.0], [250.0, 50.0, 50.0]])
+    assert np.allclose(loaded.bounds, expected, atol=0.01)
+
+    float_path = tmp_path / "float.glb"
+    write_glb(float_path, parts)
+    assert "extensionsUsed" not in _read_json(float_path)
+    assert path.stat().st_size < float_path.stat().st_size
+
+
+def test_write_glb_without_colors_has_no_materials(tmp_path):
+    path = tmp_path / "plain.glb"
+    write_glb(path, [_soup(trimesh.creation.box((1, 1, 1)))])
+    gltf = _read_json(path)
+    assert "materials" not in gltf
+    assert "material" not in gltf["meshes"][0]["primitives"][0]
+    assert trimesh.load(path, force="mesh").bounds == pytest.approx(
+        np.array([[-0.5] * 3, [0.5] * 3]), abs=1e-4
+    )
+
+
+def test_write_instanced_glb_places_instances(tmp_path):
+    from scipy.spatial.transform import Rotation
+
+    screw = _soup(trimesh.creation.box((2, 2, 10)), (0.5, 0.5, 0.5))
+    plate = _soup(trimesh.creation.box((100, 60, 5)), (0.2, 0.4, 0.8))
+    transforms = []
+    for x in (-40.0, 40.0, 0.0):
+        matrix = np.eye(4)
+        matrix[:3, 3] = [x, 20.0, 5.0]
+        transforms.append(matrix)
+    transforms[2][:3, :3] = Rotation.from_euler("y", 90, degrees=True).as_matrix()
+
+    path = tmp_path / "instanced.glb"
+    write_instanced_glb(
+        path, [(plate, [np.eye(4)]), (screw, transforms)], name="base", quantize=True
+    )
+
+    gltf, binary = _read_glb(path)
+    assert INSTANCING_EXTENSION in gltf["extensionsRequired"]
+    assert len(gltf["meshes"]) == 2
+    root = gltf["nodes"][0]
+    assert root["name"] == "base" and len(root["children"]) == 2
+
+    # Expand the screw instances and compare with the directly placed boxes
+    node = gltf["nodes"][root["children"][1]]
+    attributes = node["extensions"][INSTANCING_EXTENSION]["attributes"]
+    translations = _accessor(gltf, binary, attributes["TRANSLATION"])
+    rotations = _accessor(gltf, binary, attributes["ROTATION"])
+    scales = _accessor(gltf, binary, attributes["SCALE"])
+    primitive = gltf["meshes"][node["mesh"]]["primitives"][0]
+    grid = _accessor(gltf, binary, primitive["attributes"]["POSITION"])
+
+    for i, matrix in enumerate(transforms):
+        placed = (
+            Rotation.from_quat(rotations[i]).apply(grid * scales[i]) + translations[i]
+        )
+        expected = trimesh.transform_points(screw.vertices, matrix)
+        assert np.allclose(placed.min(axis=0), expected.min(axis=0), atol=1e-3)
+        assert np.allclose(placed.max(axis=0), expected.max(axis=0), atol=1e-3)
+
+
+def test_write_instanced_glb_keeps_mirrored_instances_mirrored(tmp_path):
+    # Off-centre, so that mirroring moves it
+    box = trimesh.creation.box((2, 4, 6))
+    box.apply_translation((11.0, 2.0, 3.0))
+    part = _soup(box)
+    mirror = np.diag([-1.0, 1.0, 1.0, 1.0])
+    shifted = np.eye(4)
+    shifted[:3, 3] = [0.0, 50.0, 0.0]
+
+    path = tmp_path / "mirrored.glb"
+    write_instanced_glb(path, [(part, [np.eye(4), shifted, mirror])])
+
+    gltf, binary = _read_glb(path)
+    # The mirrored copy is a mesh of its own; the others are still instanced
+    assert len(gltf["meshes"]) == 2
+    children = [gltf["nodes"][i] for i in gltf["nodes"][0]["children"]]
+    assert sum(INSTANCING_EXTENSION in c.get("extensions", {}) for c in children) == 1
+
+    mirrored = [c for c in children if "extensions" not in c][0]
+    primitive = gltf["meshes"][mirrored["mesh"]]["primitives"][0]
+    positions = _accessor(gltf, binary, primitive["attributes"]["POSITION"])
+    placed = positions * mirrored.get("scale", [1, 1, 1]) + mirrored.get(
+        "translation", [0, 0, 0]
+    )
+    assert np.allclose(placed.min(axis=0), [-12.0, 0.0, 0.0], atol=1e-3)
+    assert np.allclose(placed.max(axis=0), [-10.0, 4.0, 6.0], atol=1e-3)
+
+    # Outward facing after the mirror
+    single = tmp_path / "single.glb"
+    write_instanced_glb(single, [(part, [mirror])])
+    loaded = trimesh.load(single, force="mesh")
+    assert loaded.volume == pytest.approx(48.0, rel=1e-3)
@@ -0,0 +1,396 @@
+"""Tests for incremental exports driven by the build manifest."""
+
+from pathlib import Path
+from types import SimpleNamespace
+from unittest.mock import MagicMock, patch
+
+import numpy as np
+import pytest
+import trimesh
+from OCP.BRepAlgoAPI import BRepAlgoAPI_Cut
+from OCP.BRepPrimAPI import BRepPrimAPI_MakeBox, BRepPrimAPI_MakeCylinder
+from OCP.gp import gp_Ax2, gp_Dir, gp_Pnt
+
+from onshape2xacro.config.export_config import VisualMeshOptions
+from onshape2xacro.inertia.calculator import InertiaCalculator
+from onshape2xacro.inertia.report import InertiaReport
+from onshape2xacro.inertia.types import InertialProperties, MassProperties
+from onshape2xacro.mesh_exporters.manifest import (
+    MANIFEST_NAME,
+    BuildManifest,
+    LinkBuild,
+    inputs_digest,
+)
+from onshape2xacro.mesh_exporters.step import StepMeshExporter
+from onshape2xacro.mesh_exporters.tessellation_cache import shape_fingerprint
+
+
+def test_manifest_round_trip_and_lookup(tmp_path):
+    (tmp_path / "visual").mkdir()
+    (tmp_path / "visual" / "base.obj").write_text("")
+    report = InertiaReport()
+    report.link_properties["base"] = InertialProperties(
+        mass=1.5, com=(0.0, 0.1, 0.0), ixx=1.0, iyy=2.0, izz=3.0
+    )
+    report.add_warning("base", "screw", "no mass")
+    report.add_warning("arm", "horn", "no mass")
+
+    manifest = BuildManifest.load(tmp_path)
+    mesh = {"visual": {"obj": "visual/base.obj"}, "collision": []}
+    manifest.links["base"] = LinkBuild.from_export("abc", mesh, [], "base", report)
+    manifest.save()
+
+    loaded = BuildManifest.load(tmp_path)
+    assert loaded.lookup("base", "other") is None
+    build = loaded.lookup("base", "abc")
+    restored = InertiaReport()
+    build.restore_inertia("base", restored)
+    assert restored.link_properties == report.link_properties
+    assert [w.part_name for w in restored.warnings] == ["screw"]
+
+    # Deleted output files force a rebuild
+    (tmp_path / "visual" / "base.obj").unlink()
+    assert loaded.lookup("base", "abc") is None
+
+    (tmp_path / MANIFEST_NAME).write_text("{not json")
+    assert BuildManifest.load(tmp_path).links == {}
+
+
+def test_inputs_digest_ignores_float_noise():
+    transform = np.eye(4)
+    noisy = transform + 1e-12
+    assert inputs_digest("link", transform) == inputs_digest("link", noisy)
+    assert inputs_digest("link", transform) != inputs_digest("link", transform * 2)
+    assert inputs_digest(VisualMeshOptions()) != inputs_digest(
+        VisualMeshOptions(formats=["stl"])
+    )
+
+
+def _export(
+    exporter,
+    mesh_dir,
+    link_records,
+    only_links=None,
+    fingerprints=None,
+    shapes=None,
+    **kwargs,
+):
+    # B-rep fingerprint of each part's mocked shape in the STEP file, unless
+    # ``shapes`` gives the part a real B-rep
+    fingerprints = fingerprints or {"part_1": "a", "part_2": "b"}
+    shapes = shapes or {}
+    with (
+        patch("onshape2xacro.mesh_exporters.step.BRepMesh_IncrementalMesh"),
+        patch("onshape2xacro.mesh_exporters.step.StlAPI_Writer") as mock_writer,
+        patch(
+            "onshape2xacro.mesh_exporters.step.STEPCAFControl_Reader"
+        ) as mock_reader_cls,
+        patch("onshape2xacro.mesh_exporters.step.TDocStd_Document"),
+        patch("onshape2xacro.mesh_exporters.step._get_shape_tool"),
+        patch("onshape2xacro.mesh_exporters.step.XCAFDoc_DocumentTool"),
+        patch(
+            "onshape2xacro.mesh_exporters.step._get_free_shape_labels"
+        ) as mock_labels,
+        patch("onshape2xacro.mesh_exporters.step._collect_shapes") as mock_collect,
+        patch("trimesh.load", return_value=trimesh.creation.box((1, 2, 3))),
+        patch("pymeshlab.MeshSet") as mock_meshset,
+        patch("onshape2xacro.mesh_exporters.step.IFSelect_RetDone", new=1),
+        patch(
+            "onshape2xacro.mesh_exporters.step.shape_fingerprint",
+            side_effect=lambda shape: (
+                shape.fingerprint
+                if isinstance(shape, MagicMock)
+                else shape_fingerprint(shape)
+            ),
+        ),
+    ):
+        mock_writer.return_value.Write.side_effect = lambda shape, path: Path(
+            path
+        ).touch()
+        # A convex hull of a dozen faces, saved as an empty file
+        meshset = mock_meshset.return_value
+        meshset.current_mesh.return_value.face_number.return_value = 12
+        meshset.save_current_mesh.side_effect = lambda path: Path(path).touch()
+        mock_reader_cls.return_value.ReadFile.return_value = 1
+        mock_labels.return_value.Length.return_value = 1
+
+        def populate_shapes(st, ct, lbl, loc, found, locations, colors, path=()):
+            for key in ("part_1", "part_2"):
+                found[key] = [
+                    shapes.get(key) or MagicMock(fingerprint=fingerprints[key])
+                ]
+                locations[key] = [MagicMock()]
+                colors[key] = [(0.5, 0.5, 0.5)]
+
+        mock_collect.side_effect = populate_shapes
+        mesh_map, _, _ = exporter.export_link_meshes(
+            link_records,
+            mesh_dir,
+            visual_option=VisualMeshOptions(formats=["obj"]),
+            only_links=only_links,
+            **kwargs,
+        )
+        return mesh_map, mock_reader_cls.call_count
+
+
+def test_export_reuses_unchanged_links(tmp_path):
+    cad = MagicMock()
+    cad.parts = {}
+    for key in ("part_1", "part_2"):
+        cad.parts[key] = MagicMock(isRigidAssembly=False, partId=key)
+        cad.parts[key].worldToPartTF.to_tf = np.eye(4)
+    cad.instances = {}
+    cad.occurrences = {}
+    link_records = {}
+    for name, key in (("base", "part_1"), ("arm", "part_2")):
+        link_records[name] = MagicMock(
+            keys=[key], part_names=[key], frame_transform=np.eye(4)
+        )
+
+    exporter = StepMeshExporter(None, cad, asset_path=tmp_path / "assembly.step")
+    exporter.asset_path.write_bytes(
+        b"ISO-10303-21;\nHEADER;\nENDSEC;\nDATA;\nENDSEC;\nEND-ISO-10303-21;\n"
+    )
+    mesh_dir = tmp_path / "meshes"
+
+    first, reads = _export(exporter, mesh_dir, link_records)
+    assert reads == 1 and set(first) == {"base", "arm"}
+    base_mtime = (mesh_dir / "visual" / "base.obj").stat().st_mtime_ns
+
+    # Nothing changed: the STEP file is not even parsed
+    second, reads = _export(exporter, mesh_dir, link_records)
+    assert reads == 0 and second == first
+
+    # Moving one part rebuilds only its link
+    moved = np.eye(4)
+    moved[:3, 3] = [0.01, 0, 0]
+    cad.parts["part_2"].worldToPartTF.to_tf = moved
+    third, reads = _export(exporter, mesh_dir, link_records)
+    assert reads == 1 and third == first
+    assert (mesh_dir / "visual" / "base.obj").stat().st_mtime_ns == base_mtime
+    assert BuildManifest.load(mesh_dir).links.keys() == {"base", "arm"}
+
+
+def test_export_rebuilds_only_links_with_edited_parts(tmp_path):
+    cad = MagicMock()
+    cad.parts = {}
+    for key in ("part_1", "part_2"):
+        cad.parts[key] = MagicMock(isRigidAssembly=False, partId=key)
+        cad.parts[key].worldToPartTF.to_tf = np.eye(4)
+    cad.instances = {}
+    cad.occurrences = {}
+    link_records = {
+        name: MagicMock(keys=[key], part_names=[key], frame_transform=np.eye(4))
+        for name, key in (("base", "part_1"), ("arm", "part_2"))
+    }
+    exporter = StepMeshExporter(None, cad, asset_path=tmp_path / "assembly.step")
+    exporter.asset_path.write_bytes(
+        b"ISO-10303-21;\nHEADER;\nENDSEC;\nDATA;\nENDSEC;\nEND-ISO-10303-21;\n"
+    )
+    mesh_dir = tmp_path / "meshes"
+    _export(exporter, mesh_dir, link_records)
+    mtimes = {
+        name: (mesh_dir / "visual" / f"{name}.obj").stat().st_mtime_ns
+        for name in ("base", "arm")
+    }
+
+    # A new STEP file in which only the arm's part was edited
+    exporter.asset_path.write_bytes(
+        b"ISO-10303-21;\nHEADER;\nENDSEC;\nDATA;\n#1=EDIT;\nENDSEC;\n"
+        b"END-ISO-10303-21;\n"
+    )
+    _, reads = _export(
+        exporter, mesh_dir, link_records, fingerprints={"part_1": "a", "part_2": "c"}
+    )
+    assert reads == 1
+    assert (mesh_dir / "visual" / "base.obj").stat().st_mtime_ns == mtimes["base"]
+    assert (mesh_dir / "visual" / "arm.obj").stat().st_mtime_ns != mtimes["arm"]
+
+    # The recorded hashes now match the new file: nothing is parsed
+    _, reads = _export(
+        exporter, mesh_dir, link_records, fingerprints={"part_1": "a", "part_2": "c"}
+    )
+    assert reads == 0
+
+
+def _plate(holes):
+    """20 x 20 x 2 mm plate with 3 mm holes at ``holes``."""
+    shape = BRepPrimAPI_MakeBox(gp_Pnt(-10, -10, 0), 20.0, 20.0, 2.0).Shape()
+    for x, y in holes:
+        axis = gp_Ax2(gp_Pnt(x, y, -1), gp_Dir(0, 0, 1))
+        hole = BRepPrimAPI_MakeCylinder(axis, 1.5, 4.0).Shape()
+        shape = BRepAlgoAPI_Cut(shape, hole).Shape()
+    return shape
+
+
+def test_export_rebuilds_links_whose_holes_moved(tmp_path):
+    cad = MagicMock()
+    cad.parts = {}
+    for key in ("part_1", "part_2"):
+        cad.parts[key] = MagicMock(isRigidAssembly=False, partId=key)
+        cad.parts[key].worldToPartTF.to_tf = np.eye(4)
+    cad.instances = {}
+    cad.occurrences = {}
+    link_records = {
+        name: MagicMock(keys=[key], part_names=[key], frame_transform=np.eye(4))
+        for name, key in (("base", "part_1"), ("arm", "part_2"))
+    }
+    exporter = StepMeshExporter(None, cad, asset_path=tmp_path / "assembly.step")
+    mesh_dir = tmp_path / "meshes"
+
+    def export(revision, plate):
+        # Each run reads a new STEP file
+        exporter.asset_path.write_bytes(f"ISO-10303-21;\n/* {revision} */\n".encode())
+        _export(exporter, mesh_dir, link_records, shapes={"part_2": plate})
+        return (mesh_dir / "visual" / "arm.obj").stat().st_mtime_ns
+
+    first = export(1, _plate([(6, 0), (-6, 0)]))
+    assert export(2, _plate([(6, 0), (-6, 0)])) == first
+    # Moved symmetrically: area, volume and centroid are all unchanged
+    assert export(3, _plate([(0, 6), (0, -6)])) != first
+
+
+def test_links_sharing_failed_meshes_are_not_recorded(tmp_path):
+    cad = MagicMock()
+    cad.parts = {"part_1": MagicMock(isRigidAssembly=False, partId="part_1")}
+    cad.parts["part_1"].worldToPartTF.to_tf = np.eye(4)
+    cad.instances = {}
+    cad.occurrences = {}
+    # Two links with the same geometry: the arm shares the base's meshes
+    link_records = {
+        name: MagicMock(
+            keys=["part_1"], part_names=["part_1"], frame_transform=np.eye(4)
+        )
+        for name in ("base", "arm")
+    }
+    exporter = StepMeshExporter(None, cad, asset_path=tmp_path / "assembly.step")
+    exporter.asset_path.write_bytes(
+        b"ISO-10303-21;\nHEADER;\nENDSEC;\nDATA;\nENDSEC;\nEND-ISO-10303-21;\n"
+    )
+    mesh_dir = tmp_path / "meshes"
+    with patch(
+        "onshape2xacro.mesh_exporters.step.emit_visual_formats",
+        side_effect=RuntimeError("disk full"),
+    ):
+        mesh_map, _ = _export(exporter, mesh_dir, link_records)
+    assert mesh_map["arm"]["shared_with"] == "base"
+    # Neither the failed base nor the arm sharing its fallback is recorded
+    assert BuildManifest.load(mesh_dir).links == {}
+
+    mesh_map, reads = _export(exporter, mesh_dir, link_records)
+    assert reads == 1 and mesh_map["arm"]["shared_with"] == "base"
+    assert BuildManifest.load(mesh_dir).links.keys() == {"base", "arm"}
+
+
+def test_export_only_links_keeps_other_links(tmp_path):
+    cad = MagicMock()
+    cad.parts = {}
+    for key in ("part_1", "part_2"):
+        cad.parts[key] = MagicMock(isRigidAssembly=False, partId=key)
+        cad.parts[key].worldToPartTF.to_tf = np.eye(4)
+    cad.instances = {}
+    cad.occurrences = {}
+    link_records = {
+        name: MagicMock(keys=[key], part_names=[key], frame_transform=np.eye(4))
+        for name, key in (("base", "part_1"), ("arm", "part_2"))
+    }
+    exporter = StepMeshExporter(None, cad, asset_path=tmp_path / "assembly.step")
+    exporter.asset_path.write_bytes(
+        b"ISO-10303-21;\nHEADER;\nENDSEC;\nDATA;\nENDSEC;\nEND-ISO-10303-21;\n"
+    )
+    mesh_dir = tmp_path / "meshes"
+    _export(exporter, mesh_dir, link_records)
+    base_record = BuildManifest.load(mesh_dir).links["base"]
+    base_mtime = (mesh_dir / "visual" / "base.obj").stat().st_mtime_ns
+
+    # Both links changed, but only the arm is selected
+    for key in ("part_1", "part_2"):
+        moved = np.eye(4)
+        moved[:3, 3] = [0.01, 0, 0]
+        cad.parts[key].worldToPartTF.to_tf = moved
+    mesh_map, reads = _export(exporter, mesh_dir, link_records, only_links={"arm"})
+    assert reads == 1 and set(mesh_map) == {"base", "arm"}
+    assert (mesh_dir / "visual" / "base.obj").stat().st_mtime_ns == base_mtime
+    links = BuildManifest.load(mesh_dir).links
+    # The base keeps its old record, so a full export still rebuilds it
+    assert links["base"] == base_record
+
+    _, reads = _export(exporter, mesh_dir, link_records)
+    assert reads == 1
+    assert BuildManifest.load(mesh_dir).links["base"] != base_record
+
+
+def test_export_mesh_inertia_with_comparison(tmp_path):
+    cad = MagicMock()
+    cad.parts = {"part_1": MagicMock(isRigidAssembly=False, partId="part_1")}
+    cad.parts["part_1"].worldToPartTF.to_tf = np.eye(4)
+    cad.instances = {}
+    cad.occurrences = {}
+    link_records = {
+        "base": MagicMock(
+            keys=["part_1"], part_names=["part_1"], frame_transform=np.eye(4)
+        )
+    }
+    exporter = StepMeshExporter(None, cad, asset_path=tmp_path / "assembly.step")
+    exporter.asset_path.write_bytes(
+        b"ISO-10303-21;\nHEADER;\nENDSEC;\nDATA;\nENDSEC;\nEND-ISO-10303-21;\n"
+    )
+    # The mocked tessellation is a 1x2x3 mm box; the "exact" result is 1% heavier
+    box = trimesh.creation.box((1, 2, 3))
+    exact = MassProperties(6.06, np.zeros(3), np.asarray(box.moment_inertia) * 1.01)
+    mesh_dir = tmp_path / "meshes"
+    with patch(
+        "onshape2xacro.inertia.InertiaCalculator.prototype_properties",
+        return_value=exact,
+    ) as mock_exact:
+        _export(
+            exporter,
+            mesh_dir,
+            link_records,
+            bom_path=tmp_path / "bom.csv",
+            inertia_method="mesh",
+            inertia_compare=True,
+        )
+    assert mock_exact.called
+
+    build = BuildManifest.load(mesh_dir).links["base"]
+    calc = InertiaCalculator()
+    assert build.inertia["mass"] == pytest.approx(6.0 * 1e-9 * calc.default_density)
+    assert build.inertia["ixx"] == pytest.approx(
+        box.moment_inertia[0, 0] * 1e-15 * calc.default_density
+    )
+    assert build.comparison["mass_error"] == pytest.approx(0.01 / 1.01)
+    assert build.comparison["inertia_error"] == pytest.approx(0.01 / 1.01)
+
+
+def test_export_onshape_inertia_without_bom(tmp_path):
+    cad = MagicMock()
+    cad.parts = {"part_1": MagicMock(isRigidAssembly=False, partId="part_1")}
+    cad.parts["part_1"].worldToPartTF.to_tf = np.eye(4)
+    # 1 kg, 1e-4 m³, centroid 10 mm along x
+    cad.parts["part_1"].MassProperty = SimpleNamespace(
+        mass=[1.0], volume=[1e-4], centroid=[0.01, 0.0, 0.0], inertia=[1e-3] * 9
+    )
+    cad.instances = {}
+    cad.occurrences = {}
+    link_records = {
+        "base": MagicMock(
+            keys=["part_1"], part_names=["part_1"], frame_transform=np.eye(4)
+        )
+    }
+    exporter = StepMeshExporter(None, cad, asset_path=tmp_path / "assembly.step")
+    exporter.asset_path.write_bytes(
+        b"ISO-10303-21;\nHEADER;\nENDSEC;\nDATA;\nENDSEC;\nEND-ISO-10303-21;\n"
+    )
+    mesh_dir = tmp_path / "meshes"
+    with patch(
+        "onshape2xacro.inertia.InertiaCalculator.prototype_properties"
+    ) as mock_exact:
+        _export(exporter, mesh_dir, link_records, inertia_method="onshape")
+    assert not mock_exact.called
+
+    build = BuildManifest.load(mesh_dir).links["base"]
+    assert build.inertia["mass"] == pytest.approx(1.0)
+    assert build.inertia["com"][0] == pytest.approx(0.01)
+    assert build.inertia["ixx"] == pytest.approx(1e-3)
+    assert build.parts[0]["mass_source"] == "Onshape"
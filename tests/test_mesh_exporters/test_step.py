@@ -1,5 +1,8 @@
+import collada
 import numpy as np
-from unittest.mock import MagicMock, patch, ANY
+import pytest
+import trimesh
+from unittest.mock import MagicMock, patch
 from pathlib import Path
 import sys
 from onshape2xacro.config.export_config import VisualMeshOptions
@@ -43,9 +46,6 @@ def test_step_export_visual_formats(tmp_path):
             # pymeshlab.MeshSet is now mocked via sys.modules patch above,
             # but we can still patch it here if we want specific behavior or just rely on the mock_pymeshlab
             patch("onshape2xacro.mesh_exporters.step.IFSelect_RetDone", new=1),
-            patch("onshape2xacro.mesh_exporters.step.BRepBuilderAPI_Transform"),
-            patch("onshape2xacro.mesh_exporters.step.BRep_Builder"),
-            patch("onshape2xacro.mesh_exporters.step.TopoDS_Compound"),
         ):
             # Setup mock behavior
             mock_writer.return_value.Write.side_effect = lambda shape, path: Path(
@@ -80,8 +80,7 @@ def test_step_export_visual_formats(tmp_path):
             link_records = {"link1": link_record}
 
             # Test DAE export
-            mock_mesh = MagicMock()
-            mock_trimesh_load.return_value = mock_mesh
+            mock_trimesh_load.return_value = trimesh.creation.box((10, 20, 30))
 
             # Create a dummy STEP file with valid header to pass validation
             exporter.asset_path = tmp_path / "assembly.step"
@@ -101,57 +100,37 @@ def test_step_export_visual_formats(tmp_path):
                 locations["part_key"] = [MagicMock()]  # Mock TopLoc_Location
                 colors["part_key"] = [(0.1, 0.2, 0.3)]  # Mock color
 
-            with (
-                patch(
-                    "onshape2xacro.mesh_exporters.step._collect_shapes",
-                    side_effect=populate_shapes,
-                ),
-                patch("trimesh.util.concatenate") as mock_concat,
+            with patch(
+                "onshape2xacro.mesh_exporters.step._collect_shapes",
+                side_effect=populate_shapes,
             ):
-                mock_concat.return_value = mock_mesh
-                exporter.export_link_meshes(
+                mesh_map, _, _ = exporter.export_link_meshes(
                     link_records,
                     mesh_dir,
                     visual_option=VisualMeshOptions(formats=["dae"]),
                 )
 
-                # Verify color was applied
-                # We need to capture the mesh object created by trimesh.load
-                # Since mock_trimesh_load returns mock_mesh, we can check if visual.face_colors was set
-                # But wait, trimesh.load returns a mesh. We create a NEW list of meshes.
-
-                # We should check that trimesh.util.concatenate was called with meshes having face_colors set
-                assert mock_concat.called
-                meshes_list = mock_concat.call_args[0][0]
-                assert len(meshes_list) == 1
-                # We can't easily verify the attribute set on a MagicMock unless we configure it,
-                # but verifying concatenate is called implies we went through the color path
-
-                # Verify DAE export logic:
-                # 1. Intermediate OBJ export via trimesh
-                mock_mesh.export.assert_called_with(ANY, file_type="obj")
-
-                # 2. PyMeshLab conversion
-                # Verify that pymeshlab.MeshSet was used (via our sys.modules mock)
-                assert mock_pymeshlab.MeshSet.called
+                assert mesh_map["link1"]["visual"] == {"dae": "visual/link1.dae"}
+
+                # DAE is written directly, with the part color as its material
                 ms_instance = mock_pymeshlab.MeshSet.return_value
-                ms_instance.load_new_mesh.assert_called_with(
-                    ANY
-                )  # Should load temp OBJ
-                ms_instance.save_current_mesh.assert_called_with(ANY)  # Should save DAE
+                assert all(
+                    "visual" not in str(c.args[0])
+                    for c in ms_instance.save_current_mesh.call_args_list
+                )
+                dae = collada.Collada(str(mesh_dir / "visual" / "link1.dae"))
+                (effect,) = dae.effects
+                assert effect.diffuse == pytest.approx((0.1, 0.2, 0.3, 1.0))
 
             # Test OBJ export
-            with (
-                patch(
-                    "onshape2xacro.mesh_exporters.step._collect_shapes",
-                    side_effect=populate_shapes,
-                ),
-                patch("trimesh.util.concatenate") as mock_concat,
+            with patch(
+                "onshape2xacro.mesh_exporters.step._collect_shapes",
+                side_effect=populate_shapes,
             ):
-                mock_concat.return_value = mock_mesh
                 exporter.export_link_meshes(
                     link_records,
                     mesh_dir,
                     visual_option=VisualMeshOptions(formats=["obj"]),
                 )
-            mock_mesh.export.assert_called_with(ANY, file_type="obj")
+            obj = trimesh.load(mesh_dir / "visual" / "link1.obj", force="mesh")
+            assert np.allclose(obj.extents, [10, 20, 30])
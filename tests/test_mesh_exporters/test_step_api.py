@@ -1,9 +1,30 @@
+import filecmp
+import json
+import os
+import shutil
+import threading
+import tracemalloc
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
 import pytest
 from unittest.mock import MagicMock, patch
 from pathlib import Path
 import io
 import zipfile
-from onshape2xacro.mesh_exporters.step import StepMeshExporter
+from onshape2xacro.mesh_exporters.step import (
+    DOWNLOAD_CHUNK_SIZE,
+    StepMeshExporter,
+    StepTranslation,
+)
+from onshape2xacro.optimized_cad import OptimizedClient
+from onshape2xacro.scheduler import RequestScheduler
+
+
+def _download(content):
+    response = MagicMock()
+    response.content = content
+    response.iter_content.return_value = iter([content])
+    return response
 
 
 @pytest.fixture
@@ -39,8 +60,7 @@ def test_export_step_success(mock_client, mock_cad, tmp_path):
     }
 
     # Mock Download GET
-    mock_download = MagicMock()
-    mock_download.content = (
+    mock_download = _download(
         b"ISO-10303-21; HEADER; ENDSEC; DATA; ENDSEC; END-ISO-10303-21;"
     )
 
@@ -79,8 +99,7 @@ def test_export_step_zip_handling(mock_client, mock_cad, tmp_path):
         "resultExternalDataIds": ["file_id"],
     }
 
-    mock_download = MagicMock()
-    mock_download.content = zip_content
+    mock_download = _download(zip_content)
 
     mock_client.request.side_effect = [mock_post, mock_status, mock_download]
 
@@ -104,12 +123,10 @@ def test_export_step_fallback_download(mock_client, mock_cad, tmp_path):
     }
 
     # First download returns XML (e.g. Parasolid manifest)
-    mock_download_xml = MagicMock()
-    mock_download_xml.content = b"<?xml version='1.0'?>"
+    mock_download_xml = _download(b"<?xml version='1.0'?>")
 
     # Fallback download returns STEP
-    mock_download_fallback = MagicMock()
-    mock_download_fallback.content = b"ISO-10303-21;"
+    mock_download_fallback = _download(b"ISO-10303-21;")
 
     mock_client.request.side_effect = [
         mock_post,
@@ -164,3 +181,184 @@ def test_export_step_no_external_ids(mock_client, mock_cad, tmp_path):
 
     with patch("time.sleep"), pytest.raises(RuntimeError, match="No external data ids"):
         exporter.export_step(tmp_path / "out.step")
+
+
+DID, WID, EID = "a" * 24, "b" * 24, "c" * 24
+
+
+class StubTranslations:
+    """Local Onshape answering one STEP translation and its downloads.
+
+    ``files`` maps external data ids (and ``"download"``, the translation
+    download fallback) to the files served for them.
+    """
+
+    def __init__(self):
+        self.states = ["DONE"]
+        self.files: dict[str, Path] = {}
+        self.seen: list[tuple[str, str]] = []
+        # Range headers of file requests, and bytes sent before dropping them
+        self.ranges: list[str | None] = []
+        self.drops: dict[str, list[int]] = {}
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def _send(self, body, content_type="application/json"):
+                self.send_response(200)
+                self.send_header("Content-Type", content_type)
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def do_POST(self):
+                self.rfile.read(int(self.headers["Content-Length"]))
+                stub.seen.append(("POST", self.path))
+                self._send(json.dumps({"id": "t1"}).encode())
+
+            def do_GET(self):
+                path = self.path.split("?")[0]
+                stub.seen.append(("GET", path))
+                if path == "/api/translations/t1":
+                    status = {"requestState": stub.states.pop(0)}
+                    if status["requestState"] == "DONE":
+                        status["resultExternalDataIds"] = [
+                            fid for fid in stub.files if fid != "download"
+                        ]
+                    self._send(json.dumps(status).encode())
+                    return
+                file_id = path.rsplit("/", 1)[-1]
+                source = stub.files[file_id]
+                size = source.stat().st_size
+                requested = self.headers.get("Range")
+                stub.ranges.append(requested)
+                start = int(requested[6:].split("-")[0]) if requested else 0
+                self.send_response(206 if requested else 200)
+                self.send_header("Content-Type", "application/octet-stream")
+                self.send_header("Content-Length", str(size - start))
+                self.send_header("Accept-Ranges", "bytes")
+                self.send_header("ETag", f'"{size}"')
+                if requested:
+                    self.send_header(
+                        "Content-Range", f"bytes {start}-{size - 1}/{size}"
+                    )
+                self.end_headers()
+                with open(source, "rb") as f:
+                    f.seek(start)
+                    if stub.drops.get(file_id):
+                        # Close the connection part way through the body
+                        self.wfile.write(f.read(stub.drops[file_id].pop(0)))
+                        self.close_connection = True
+                        return
+                    shutil.copyfileobj(f, self.wfile, 64 * 1024)
+
+            def log_message(self, *args):
+                pass
+
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.url = f"http://127.0.0.1:{self.server.server_address[1]}"
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+
+    def client(self):
+        return OptimizedClient(
+            base_url=self.url, scheduler=RequestScheduler(requests_per_second=0)
+        )
+
+
+@pytest.fixture
+def stub(monkeypatch):
+    monkeypatch.setenv("ONSHAPE_ACCESS_KEY", "access")
+    monkeypatch.setenv("ONSHAPE_SECRET_KEY", "secret")
+    server = StubTranslations()
+    yield server
+    server.server.shutdown()
+    server.server.server_close()
+
+
+def test_translation_started_early_polls_with_backoff(stub, monkeypatch, tmp_path):
+    stub.states = ["ACTIVE", "ACTIVE", "ACTIVE", "DONE"]
+    stub.files["f1"] = tmp_path / "served.step"
+    stub.files["f1"].write_bytes(b"ISO-10303-21;\nDATA;")
+    delays = []
+    monkeypatch.setattr("onshape2xacro.mesh_exporters.step.time.sleep", delays.append)
+
+    client = stub.client()
+    translation = StepTranslation.start(client, DID, "w", WID, EID)
+    assert stub.seen == [
+        ("POST", f"/api/assemblies/d/{DID}/w/{WID}/e/{EID}/translations")
+    ]
+    exporter = StepMeshExporter(client, MagicMock())
+    output = exporter.export_step(tmp_path / "a.step", translation=translation)
+
+    assert output.read_bytes() == b"ISO-10303-21;\nDATA;"
+    # Only the given translation is polled, starting sub-second
+    assert [path for method, path in stub.seen if method == "POST"] == [stub.seen[0][1]]
+    assert stub.seen[-1] == ("GET", f"/api/documents/d/{DID}/externaldata/f1")
+    assert delays == pytest.approx([0.25, 0.375, 0.5625])
+
+
+def test_large_zipped_step_is_streamed(stub, tmp_path):
+    step = tmp_path / "big.step"
+    with open(step, "wb") as f:
+        f.write(b"ISO-10303-21;\nHEADER;\nENDSEC;\nDATA;\n")
+        for i in range(800_000):
+            f.write(b"#%d=CARTESIAN_POINT('',(%d.,0.,0.));\n" % (i, i))
+    with zipfile.ZipFile(tmp_path / "big.zip", "w", zipfile.ZIP_DEFLATED) as zf:
+        zf.write(step, "assembly.step")
+    stub.files["manifest"] = tmp_path / "manifest.xml"
+    stub.files["manifest"].write_bytes(b"<?xml version='1.0'?><manifest/>")
+    stub.files["f1"] = tmp_path / "big.zip"
+
+    output_dir = tmp_path / "out"
+    output_dir.mkdir()
+    translation = StepTranslation(stub.client(), DID, "t1")
+    tracemalloc.start()
+    try:
+        translation.download(output_dir / "assembly.step")
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    # Memory is bounded by the chunk size, not the STEP size
+    assert step.stat().st_size > 30 * DOWNLOAD_CHUNK_SIZE
+    assert peak < 10 * DOWNLOAD_CHUNK_SIZE
+    assert filecmp.cmp(step, output_dir / "assembly.step", shallow=False)
+    # Temporary files were renamed or removed
+    assert [p.name for p in output_dir.iterdir()] == ["assembly.step"]
+
+
+def test_failed_download_keeps_previous_step(stub, tmp_path):
+    stub.files["f1"] = tmp_path / "manifest.xml"
+    stub.files["f1"].write_bytes(b"<?xml version='1.0'?><manifest/>")
+    stub.files["download"] = tmp_path / "broken.zip"
+    stub.files["download"].write_bytes(b"PK\x03\x04 not really a zip")
+    output_dir = tmp_path / "out"
+    output_dir.mkdir()
+    (output_dir / "assembly.step").write_bytes(b"ISO-10303-21; previous")
+
+    with pytest.raises(RuntimeError, match="No STEP content"):
+        StepTranslation(stub.client(), DID, "t1").download(output_dir / "assembly.step")
+    assert (output_dir / "assembly.step").read_bytes() == b"ISO-10303-21; previous"
+    assert [p.name for p in output_dir.iterdir()] == ["assembly.step"]
+
+
+def test_fallback_download_resumes_after_dropped_connections(stub, tmp_path):
+    step = tmp_path / "served.step"
+    step.write_bytes(b"ISO-10303-21;\n" + os.urandom(3 * DOWNLOAD_CHUNK_SIZE))
+    stub.files["manifest"] = tmp_path / "manifest.xml"
+    stub.files["manifest"].write_bytes(b"<?xml version='1.0'?><manifest/>")
+    stub.files["download"] = step
+    stub.drops["download"] = [2 * DOWNLOAD_CHUNK_SIZE + 100, DOWNLOAD_CHUNK_SIZE // 2]
+
+    output_dir = tmp_path / "out"
+    output_dir.mkdir()
+    translation = StepTranslation(stub.client(), DID, "t1")
+    with patch("onshape2xacro.download.time.sleep"):
+        translation.download(output_dir / "assembly.step")
+
+    assert filecmp.cmp(step, output_dir / "assembly.step", shallow=False)
+    assert [p.name for p in output_dir.iterdir()] == ["assembly.step"]
+    # After the manifest, the fallback download resumed where it broke off
+    resume = f"bytes={2 * DOWNLOAD_CHUNK_SIZE}-{step.stat().st_size - 1}"
+    assert stub.ranges == [None, None, resume, resume]
@@ -1,11 +1,12 @@
-from unittest.mock import MagicMock, patch, ANY
+from unittest.mock import MagicMock, patch
 from pathlib import Path
 import numpy as np
+import trimesh
 from onshape2xacro.mesh_exporters.step import StepMeshExporter, _collect_shapes
 from onshape2xacro.config.export_config import VisualMeshOptions
 
 
-def test_dae_pymeshlab_fallback(tmp_path):
+def test_dae_without_pymeshlab(tmp_path):
     client = MagicMock()
     cad = MagicMock()
     exporter = StepMeshExporter(client, cad)
@@ -27,12 +28,8 @@ def test_dae_pymeshlab_fallback(tmp_path):
             "onshape2xacro.mesh_exporters.step._get_free_shape_labels"
         ) as mock_labels,
         patch("trimesh.load") as mock_trimesh_load,
-        patch("trimesh.util.concatenate") as mock_concat,
         patch("pymeshlab.MeshSet") as mock_mesh_set,
         patch("onshape2xacro.mesh_exporters.step.IFSelect_RetDone", new=1),
-        patch("onshape2xacro.mesh_exporters.step.BRepBuilderAPI_Transform"),
-        patch("onshape2xacro.mesh_exporters.step.BRep_Builder"),
-        patch("onshape2xacro.mesh_exporters.step.TopoDS_Compound"),
     ):
         # Mock writer to create file
         mock_writer.return_value.Write.side_effect = lambda shape, path: Path(
@@ -60,10 +57,7 @@ def test_dae_pymeshlab_fallback(tmp_path):
         link_record.frame_transform = np.eye(4)
         link_records = {"link1": link_record}
 
-        # Mock trimesh
-        mock_mesh = MagicMock()
-        mock_trimesh_load.return_value = mock_mesh
-        mock_concat.return_value = mock_mesh
+        mock_trimesh_load.return_value = trimesh.creation.box((1, 2, 3))
 
         # Create dummy STEP file
         exporter.asset_path = tmp_path / "assembly.step"
@@ -93,10 +87,9 @@ def test_dae_pymeshlab_fallback(tmp_path):
                 link_records, mesh_dir, visual_option=VisualMeshOptions(formats=["dae"])
             )
 
-            # VERIFY fallback
-            # Should have called combined.export with dae
-            mock_mesh.export.assert_any_call(ANY, file_type="dae")
-            # Should have printed error (we can't easily verify print, but code path execution is enough)
+            # VERIFY: the DAE writer does not depend on PyMeshLab
+            dae = trimesh.load(mesh_dir / "visual" / "link1.dae", force="mesh")
+            assert np.allclose(dae.extents, [1, 2, 3])
 
 
 def test_collect_shapes_no_reference():
@@ -0,0 +1,35 @@
+"""Tests for content-addressed sharing of identical link meshes."""
+
+import numpy as np
+import cadquery as cq
+
+from onshape2xacro.mesh_exporters.step import _link_fingerprint
+
+
+def _tf(x=0.0, y=0.0, z=0.0):
+    matrix = np.eye(4)
+    matrix[:3, 3] = [x, y, z]
+    return matrix
+
+
+def test_link_fingerprint_matches_repeated_modules():
+    motor = cq.Workplane("XY").box(10, 10, 20).val().wrapped
+    horn = cq.Workplane("XY").cylinder(2, 5).val().wrapped
+    red = (1.0, 0.0, 0.0)
+
+    left = [
+        (motor, red, True, True, _tf()),
+        (horn, None, True, True, _tf(z=11.0)),
+    ]
+    # Same parts in a different order, with sub-micron transform noise
+    right = [
+        (horn, None, True, True, _tf(z=11.0000001)),
+        (motor, red, True, True, _tf()),
+    ]
+    assert _link_fingerprint(left) == _link_fingerprint(right)
+
+    moved = [left[0], (horn, None, True, True, _tf(z=12.0))]
+    recolored = [(motor, (0.0, 0.0, 1.0), True, True, _tf()), left[1]]
+    filtered = [left[0], (horn, None, False, True, _tf(z=11.0))]
+    for variant in (moved, recolored, filtered):
+        assert _link_fingerprint(variant) != _link_fingerprint(left)
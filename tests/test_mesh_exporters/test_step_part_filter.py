@@ -0,0 +1,42 @@
+"""Tests for the small-part filter applied before tessellation."""
+
+import pytest
+import cadquery as cq
+
+from onshape2xacro.config.export_config import PartFilterOptions
+from onshape2xacro.mesh_exporters.step import _measure_shape, _part_filter_reason
+
+
+@pytest.fixture
+def box_shape():
+    return cq.Workplane("XY").box(10, 20, 5).val().wrapped
+
+
+def test_measure_shape(box_shape):
+    volume, extent, faces = _measure_shape(box_shape)
+    assert volume == pytest.approx(1000.0, rel=1e-6)
+    assert extent == pytest.approx(20.0, abs=0.1)
+    assert faces == 6
+
+
+def test_filter_disabled_by_default():
+    assert not PartFilterOptions().enabled
+    assert _part_filter_reason(PartFilterOptions(), "screw", (1.0, 1.0, 6)) is None
+
+
+def test_filter_by_name_pattern_is_case_insensitive():
+    part_filter = PartFilterOptions(name_patterns=["*screw*", "washer*"])
+    assert part_filter.enabled
+    assert _part_filter_reason(part_filter, "M3x10 Socket SCREW_2", None)
+    assert _part_filter_reason(part_filter, "Washer M3", None)
+    assert _part_filter_reason(part_filter, "base_plate", None) is None
+
+
+def test_filter_by_volume_and_extent():
+    by_volume = PartFilterOptions(min_volume_mm3=500.0)
+    assert "volume" in _part_filter_reason(by_volume, "part", (100.0, 50.0, 6))
+    assert _part_filter_reason(by_volume, "part", (1000.0, 50.0, 6)) is None
+
+    by_extent = PartFilterOptions(min_extent_mm=15.0)
+    assert "extent" in _part_filter_reason(by_extent, "part", (1e6, 10.0, 6))
+    assert _part_filter_reason(by_extent, "part", (1e6, 20.0, 6)) is None
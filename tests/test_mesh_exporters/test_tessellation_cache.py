@@ -0,0 +1,103 @@
+"""Tests for the user-level tessellation cache."""
+
+import math
+import os
+from unittest.mock import patch
+
+import numpy as np
+from OCP.BRepAlgoAPI import BRepAlgoAPI_Cut
+from OCP.BRepBuilderAPI import BRepBuilderAPI_Transform
+from OCP.BRepPrimAPI import BRepPrimAPI_MakeBox, BRepPrimAPI_MakeCylinder
+from OCP.gp import gp_Ax1, gp_Ax2, gp_Dir, gp_Pnt, gp_Trsf
+from OCP.StlAPI import StlAPI_Writer
+
+from onshape2xacro.cache import prune_lru, user_cache_dir
+from onshape2xacro.mesh_exporters import step
+from onshape2xacro.mesh_exporters.step import StepMeshExporter
+from onshape2xacro.mesh_exporters.tessellation_cache import (
+    TessellationCache,
+    shape_fingerprint,
+)
+
+
+def test_shape_fingerprint_matches_identical_geometry():
+    box = BRepPrimAPI_MakeBox(10.0, 20.0, 30.0).Shape()
+    same_box = BRepPrimAPI_MakeBox(10.0, 20.0, 30.0).Shape()
+    other_box = BRepPrimAPI_MakeBox(10.0, 20.0, 31.0).Shape()
+    cylinder = BRepPrimAPI_MakeCylinder(5.0, 30.0).Shape()
+
+    assert shape_fingerprint(box) == shape_fingerprint(same_box)
+    assert shape_fingerprint(box) != shape_fingerprint(other_box)
+    assert shape_fingerprint(box) != shape_fingerprint(cylinder)
+
+
+def _plate(holes):
+    """20 x 20 x 2 mm plate centred on the z axis with 3 mm holes at ``holes``."""
+    shape = BRepPrimAPI_MakeBox(gp_Pnt(-10, -10, 0), 20.0, 20.0, 2.0).Shape()
+    for x, y in holes:
+        axis = gp_Ax2(gp_Pnt(x, y, -1), gp_Dir(0, 0, 1))
+        hole = BRepPrimAPI_MakeCylinder(axis, 1.5, 4.0).Shape()
+        shape = BRepAlgoAPI_Cut(shape, hole).Shape()
+    return shape
+
+
+def test_shape_fingerprint_tells_moved_features_from_roundoff():
+    plate = _plate([(6, 0), (-6, 0)])
+    # Same faces, areas, volume, centroid and bounds; only the holes moved
+    turned = _plate([(0, 6), (0, -6)])
+    assert shape_fingerprint(plate) != shape_fingerprint(turned)
+
+    # Six turns of 60 degrees: the same plate up to roundoff
+    step_trsf = gp_Trsf()
+    step_trsf.SetRotation(gp_Ax1(gp_Pnt(0, 0, 0), gp_Dir(0, 0, 1)), math.pi / 3)
+    rotated = plate
+    for _ in range(6):
+        rotated = BRepBuilderAPI_Transform(rotated, step_trsf, True).Shape()
+    assert shape_fingerprint(rotated) == shape_fingerprint(plate)
+
+
+def test_cache_round_trip_and_lru_eviction(tmp_path):
+    cache = TessellationCache.open(max_size_mb=1)
+    assert cache.directory == user_cache_dir("tessellation")
+    assert TessellationCache.open(max_size_mb=0) is None
+
+    vertices = np.random.default_rng(0).random((100, 3)).astype(np.float32)
+    faces = np.arange(99 * 3).reshape(-1, 3) % 100
+    cache.put("a", vertices, faces)
+    cached_vertices, cached_faces = cache.get("a")
+    assert np.array_equal(cached_vertices, vertices)
+    assert np.array_equal(cached_faces, faces)
+    assert cache.get("missing") is None
+    assert (cache.hits, cache.misses) == (1, 1)
+
+    # Oldest entries go first; a hit makes an entry recent again
+    for i, key in enumerate(["a", "b", "c"]):
+        cache.put(key, vertices, faces)
+        os.utime(cache.directory / f"{key}.npz", (1000 + i, 1000 + i))
+    cache.get("a")
+    entry_size = (cache.directory / "a.npz").stat().st_size
+    assert prune_lru(cache.directory, 2 * entry_size, "*.npz") == 1
+    assert sorted(p.stem for p in cache.directory.glob("*.npz")) == ["a", "c"]
+
+    (cache.directory / "c.npz").write_bytes(b"corrupt")
+    assert cache.get("c") is None
+    assert not (cache.directory / "c.npz").exists()
+
+
+def test_exporter_reuses_cached_tessellation(tmp_path):
+    shape = BRepPrimAPI_MakeBox(10.0, 20.0, 30.0).Shape()
+    cache = TessellationCache.open(max_size_mb=16)
+
+    first = StepMeshExporter(None, None, tessellation_cache=cache)
+    vertices, faces = first._tessellate(shape, {}, StlAPI_Writer(), tmp_path)
+    assert cache.misses == 1 and len(faces) == 12
+
+    # Another export (fresh in-memory state, same B-rep) skips meshing
+    second = StepMeshExporter(None, None, tessellation_cache=cache)
+    other = BRepPrimAPI_MakeBox(10.0, 20.0, 30.0).Shape()
+    with patch.object(step, "BRepMesh_IncrementalMesh") as mock_mesh:
+        cached = second._tessellate(other, {}, StlAPI_Writer(), tmp_path)
+    mock_mesh.assert_not_called()
+    assert cache.hits == 1
+    assert np.array_equal(cached[0], vertices)
+    assert np.array_equal(cached[1], faces)
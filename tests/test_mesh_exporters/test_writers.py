@@ -0,0 +1,110 @@
+"""Tests for the shared-buffer visual format writers."""
+
+from unittest.mock import patch
+
+import numpy as np
+import trimesh
+
+from onshape2xacro.mesh_exporters.buffers import WeldedMesh
+from onshape2xacro.mesh_exporters.decimation import PartMesh
+from onshape2xacro.mesh_exporters.writers import (
+    NATIVE_FORMATS,
+    emit_visual_formats,
+    write_dae,
+    write_ply,
+    write_stl,
+)
+
+
+def _parts():
+    sphere = trimesh.creation.icosphere(subdivisions=4, radius=40.0)
+    box = trimesh.creation.box((100, 20, 30))
+    box.apply_translation((150, 0, 0))
+    return [
+        PartMesh(sphere.vertices, sphere.faces, (1.0, 0.0, 0.0)),
+        PartMesh(box.vertices, box.faces, (0.0, 0.0, 1.0)),
+    ]
+
+
+def test_write_stl_round_trip(tmp_path):
+    mesh = WeldedMesh.from_parts(_parts())
+    path = tmp_path / "link.stl"
+    write_stl(path, mesh)
+
+    loaded = trimesh.load(path, force="mesh")
+    assert len(loaded.faces) == mesh.face_count
+    assert np.allclose(loaded.bounds, [[-40, -40, -40], [200, 40, 40]], atol=1e-3)
+    # Outward facing normals survive the round trip
+    assert loaded.is_watertight and loaded.volume > 0
+
+
+def test_write_ply_binary_with_colors(tmp_path):
+    mesh = WeldedMesh.from_parts(_parts())
+    path = tmp_path / "link.ply"
+    write_ply(path, mesh)
+
+    header = path.read_bytes().split(b"end_header\n")[0].decode()
+    assert "format binary_little_endian 1.0" in header
+    assert "property uchar red" in header
+    loaded = trimesh.load(path, force="mesh", process=False)
+    assert len(loaded.vertices) == mesh.vertex_count
+    positions, normals, triangles, _ = mesh.concatenated()
+    assert np.array_equal(loaded.faces, triangles)
+    assert np.allclose(loaded.vertices, positions, atol=1e-4)
+    colors = np.unique(loaded.visual.vertex_colors, axis=0).tolist()
+    assert colors == [[0, 0, 255, 255], [255, 0, 0, 255]]
+
+
+def test_write_dae_material_per_color(tmp_path):
+    import collada
+
+    mesh = WeldedMesh.from_parts(_parts())
+    path = tmp_path / "link.dae"
+    write_dae(path, mesh, name="link")
+
+    dae = collada.Collada(str(path))
+    assert [e.diffuse for e in dae.effects] == [(1, 0, 0, 1), (0, 0, 1, 1)]
+    (geometry,) = dae.geometries
+    assert [len(p) for p in geometry.primitives] == [
+        len(g.triangles) for g in mesh.groups
+    ]
+    loaded = trimesh.load(path, force="mesh")
+    assert np.allclose(loaded.bounds, [[-40, -40, -40], [200, 40, 40]], atol=1e-3)
+
+
+def test_emit_visual_formats_from_one_mesh(tmp_path):
+    mesh = WeldedMesh.from_parts(_parts())
+    targets = {fmt: tmp_path / f"link.{fmt}" for fmt in NATIVE_FORMATS}
+    emit_visual_formats(mesh, targets, "link", max_workers=4)
+
+    for fmt, path in targets.items():
+        loaded = trimesh.load(path, force="mesh")
+        assert len(loaded.faces) == mesh.face_count, fmt
+        assert np.allclose(loaded.bounds, [[-40, -40, -40], [200, 40, 40]], atol=0.01)
+    # Colors come from the same buffers
+    obj = trimesh.load(targets["obj"], force="mesh")
+    colors = np.unique(obj.visual.vertex_colors[:, :3], axis=0).tolist()
+    assert colors == [[0, 0, 255], [255, 0, 0]]
+
+
+def test_fit_visual_size_decimates_once_per_iteration(tmp_path):
+    from onshape2xacro.mesh_exporters import step
+
+    parts = _parts()
+    targets = {fmt: tmp_path / f"link.{fmt}" for fmt in ("obj", "stl", "glb")}
+    emit_visual_formats(WeldedMesh.from_parts(parts), targets, "link")
+    # Between the GLB and STL sizes: only obj and stl are oversized
+    limit = (targets["glb"].stat().st_size + targets["stl"].stat().st_size) // 2
+    glb_before = targets["glb"].read_bytes()
+
+    with patch.object(
+        step, "decimate_parts", wraps=step.decimate_parts
+    ) as mock_decimate:
+        decimated = step._fit_visual_size(parts, targets, limit, "link")
+
+    assert mock_decimate.call_count == 1
+    assert targets["obj"].stat().st_size <= limit
+    assert targets["stl"].stat().st_size <= limit
+    assert targets["glb"].read_bytes() == glb_before
+    assert sum(p.face_count for p in decimated) < sum(p.face_count for p in parts)
+    assert [p.color for p in decimated] == [p.color for p in parts]
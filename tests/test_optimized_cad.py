@@ -267,3 +267,88 @@ def test_fetch_mass_properties_mixed(mock_cad, mock_client):
     # Verify API calls
     mock_client.get_mass_property.assert_called()
     mock_client.get_assembly_mass_properties.assert_called()
+
+
+def test_fetch_mate_limits_concurrent_matches_definition_order(mock_cad, mock_client):
+    import threading
+    import time
+
+    def limit_feature(feature_id, low, high):
+        feature = MagicMock()
+        feature.message.featureType = "mate"
+        feature.message.featureId = feature_id
+        feature.message.parameter_dict.return_value = {
+            "limitsEnabled": {"message": {"value": True}},
+            "limitAxialZMin": {
+                "typeName": "BTMParameterNullableQuantity",
+                "message": {"isNull": False, "expression": str(low)},
+            },
+            "limitAxialZMax": {
+                "typeName": "BTMParameterNullableQuantity",
+                "message": {"isNull": False, "expression": str(high)},
+            },
+        }
+        return feature
+
+    # Definitions x0..x3; x1 is used by two instances, x3 fails to fetch
+    instances = [("x0", "s0"), ("x1", "s1a"), ("x1", "s1b"), ("x2", "s2"), ("x3", "s3")]
+    mates = {}
+    for eid, name in instances:
+        key = PathKey(path=(name,), name_path=(name,))
+        sub = MagicMock(spec=SubAssembly)
+        sub.isRigid = False
+        sub.documentId = "d2"
+        sub.documentMicroversion = "mv2"
+        sub.elementId = eid
+        mock_cad.subassemblies[key] = sub
+        mock_cad.instances[key] = MagicMock(suppressed=False)
+        mate = MagicMock(spec=MateFeatureData)
+        mate.id = f"feat_{eid}"
+        mate.name = f"joint_{name}"
+        mate.mateType = "REVOLUTE"
+        mates[name] = mate
+        mock_cad.mates[(key, mate.id, name)] = mate
+
+    active = peak = 0
+    lock = threading.Lock()
+
+    def get_features(did, wtype, wid, eid):
+        nonlocal active, peak
+        with lock:
+            active += 1
+            peak = max(peak, active)
+        # Earlier definitions answer last
+        time.sleep({"x0": 0.08, "x1": 0.05, "x2": 0.02}.get(eid, 0.0))
+        with lock:
+            active -= 1
+        if eid == "x3":
+            raise RuntimeError("boom")
+        response = MagicMock()
+        index = int(eid[1:])
+        response.features = [limit_feature(f"feat_{eid}", -index, index)]
+        return response
+
+    mock_client.get_features.side_effect = get_features
+    with (
+        patch(
+            "onshape2xacro.optimized_cad.parse_onshape_expression",
+            side_effect=lambda x: float(x),
+        ),
+        patch("onshape2xacro.optimized_cad.update_mate_limits") as mock_update,
+    ):
+        mock_cad.fetch_mate_limits(mock_client)
+
+    assert peak > 1
+    assert mates["s0"].limits == {"min": 0.0, "max": 0.0}
+    assert mates["s1a"].limits == mates["s1b"].limits == {"min": -1.0, "max": 1.0}
+    assert mates["s2"].limits == {"min": -2.0, "max": 2.0}
+    assert not hasattr(mates["s3"], "limits")
+    # Applied in definition order, as the serial loop did
+    assert [c.args[0] for c in mock_update.call_args_list] == [
+        "joint_s0",
+        "joint_s1a",
+        "joint_s1b",
+        "joint_s2",
+    ]
+    # Root assembly plus four distinct definitions
+    assert mock_client.get_features.call_count == 5
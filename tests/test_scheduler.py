@@ -0,0 +1,151 @@
+"""Tests for the Onshape API request scheduler."""
+
+import asyncio
+import io
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+import requests
+
+from onshape2xacro.optimized_cad import OptimizedClient
+from onshape2xacro.scheduler import (
+    RequestScheduler,
+    TokenBucket,
+    endpoint_name,
+    gather_bounded,
+)
+from onshape_robotics_toolkit.connect import HTTP
+
+DID = "a" * 24
+
+
+def _response(status, **headers):
+    response = requests.Response()
+    response.status_code = status
+    response.headers.update(headers)
+    response.raw = io.BytesIO(b"")
+    return response
+
+
+def test_endpoint_name_elides_ids():
+    assert (
+        endpoint_name(
+            f"https://cad.onshape.com/api/assemblies/d/{DID}/w/{DID}/e/{DID}?a=1"
+        )
+        == "/api/assemblies/d/{id}/w/{id}/e/{id}"
+    )
+
+
+def test_retry_after_pauses_and_retries():
+    scheduler = RequestScheduler(requests_per_second=0, backoff=0.001)
+    responses = [_response(429, **{"Retry-After": "0.2"}), _response(200)]
+    start = time.monotonic()
+    result = scheduler.retrying(f"/api/parts/d/{DID}", lambda: responses.pop(0))
+    assert result.status_code == 200
+    assert time.monotonic() - start >= 0.2
+    stats = scheduler.stats["/api/parts/d/{id}"]
+    assert stats.retries == 1 and stats.failures == 0
+
+    # The bucket holds every other request until the pause is over
+    scheduler.bucket.pause(0.1)
+    start = time.monotonic()
+    scheduler.bucket.acquire()
+    assert time.monotonic() - start >= 0.09
+
+
+def test_retries_run_out():
+    scheduler = RequestScheduler(max_retries=2, backoff=0.001)
+    assert scheduler.retrying("/x", lambda: _response(503)).status_code == 503
+
+    def unreachable():
+        raise requests.ConnectionError("refused")
+
+    with pytest.raises(requests.ConnectionError):
+        scheduler.retrying("/y", unreachable)
+    assert scheduler.stats["/x"].retries == 2
+    assert scheduler.stats["/x"].failures == 1
+    assert scheduler.stats["/y"].failures == 1
+    assert "/x: 0 requests" in "\n".join(scheduler.report())
+
+
+def test_token_bucket_rate():
+    bucket = TokenBucket(rate=50, burst=1)
+    start = time.monotonic()
+    for _ in range(6):
+        bucket.acquire()
+    assert time.monotonic() - start >= 0.09
+
+
+def test_gather_bounded_limits_concurrency():
+    active = peak = 0
+    lock = threading.Lock()
+
+    def work(i):
+        nonlocal active, peak
+        with lock:
+            active += 1
+            peak = max(peak, active)
+        time.sleep(0.02)
+        with lock:
+            active -= 1
+        if i == 3:
+            raise ValueError(i)
+        return i
+
+    async def run():
+        return await gather_bounded(
+            [asyncio.to_thread(work, i) for i in range(12)], limit=3
+        )
+
+    results = asyncio.run(run())
+    assert peak <= 3
+    assert results[:3] == [0, 1, 2] and isinstance(results[3], ValueError)
+
+
+def test_client_retries_rate_limited_requests(monkeypatch):
+    monkeypatch.setenv("ONSHAPE_ACCESS_KEY", "access")
+    monkeypatch.setenv("ONSHAPE_SECRET_KEY", "secret")
+    seen = []
+
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def do_GET(self):
+            seen.append((self.headers["On-Nonce"], self.client_address[1]))
+            if len(seen) == 1:
+                self.send_response(429)
+                self.send_header("Retry-After", "0")
+                self.send_header("Content-Length", "0")
+                self.end_headers()
+                return
+            body = b'{"ok": true}'
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    try:
+        client = OptimizedClient(
+            base_url=f"http://127.0.0.1:{server.server_address[1]}",
+            scheduler=RequestScheduler(backoff=0.001),
+        )
+        assert client.request(HTTP.GET, f"/api/documents/{DID}").json() == {"ok": True}
+        client.request(HTTP.GET, f"/api/documents/{DID}")
+    finally:
+        server.shutdown()
+        server.server_close()
+
+    # Re-signed retry, and one kept-alive connection for every request
+    assert len(seen) == 3
+    assert len({nonce for nonce, _ in seen}) == 3
+    assert len({port for _, port in seen}) == 1
+    stats = client.scheduler.stats["/api/documents/{id}"]
+    assert stats.requests == 3 and stats.retries == 1
@@ -0,0 +1,78 @@
+import json
+from unittest.mock import patch
+
+import networkx as nx
+import numpy as np
+import trimesh
+from onshape_robotics_toolkit.models.link import Origin
+
+from onshape2xacro.condensed_robot import JointRecord, LinkRecord
+from onshape2xacro.config.export_config import VisualMeshOptions
+from onshape2xacro.serializers import XacroSerializer
+
+
+def _three_link_robot():
+    robot = nx.DiGraph()
+    robot.name = "Scene Robot"
+    for name in ["base", "arm_left", "arm_right"]:
+        robot.add_node(name, data=LinkRecord(name, [name], [], [name], keys=[name]))
+    for side, y in [("left", 0.1), ("right", -0.1)]:
+        joint = JointRecord(
+            f"joint_{side}",
+            "REVOLUTE",
+            "base",
+            f"arm_{side}",
+            (0, 0, 1),
+            origin=Origin(xyz=(0.0, y, 0.05), rpy=(0.0, 0.0, np.pi / 2)),
+        )
+        robot.add_edge("base", f"arm_{side}", data=joint)
+    robot.client = object()
+    robot.cad = object()
+    return robot
+
+
+def test_robot_scene_mirrors_kinematic_tree(tmp_path):
+    robot = _three_link_robot()
+    out = tmp_path / "output"
+    visual_dir = out / "meshes" / "visual"
+    visual_dir.mkdir(parents=True)
+    trimesh.creation.box((100, 50, 20)).export(visual_dir / "base.obj")
+    arm = trimesh.creation.box((10, 10, 80))
+    arm.export(visual_dir / "arm_left.obj")
+    arm.export(visual_dir / "arm_right.obj")
+
+    mesh_map = {
+        name: {"visual": {"obj": f"visual/{name}.obj"}, "collision": []}
+        for name in ["base", "arm_left", "arm_right"]
+    }
+    with patch("onshape2xacro.serializers.StepMeshExporter") as mock_exporter_cls:
+        mock_exporter_cls.return_value.export_link_meshes.return_value = (
+            mesh_map,
+            {},
+            None,
+        )
+        XacroSerializer().save(
+            robot,
+            str(out),
+            download_assets=True,
+            visual_option=VisualMeshOptions(formats=["obj"], scene=True),
+        )
+
+    joint_map = json.loads((out / "scene" / "scene_robot_joints.json").read_text())
+    assert joint_map["scene"] == "scene_robot.glb"
+    assert set(joint_map["links"]) == {"base", "arm_left", "arm_right"}
+    left = joint_map["joints"]["left"]
+    assert left["type"] == "revolute"
+    assert (left["parent"], left["child"]) == ("base", "arm_left")
+    assert left["translation"] == [0.0, 0.1, 0.05]
+    assert left["lower"] == -3.14 and left["upper"] == 3.14
+
+    scene = trimesh.load(out / "scene" / "scene_robot.glb")
+    # The two identical arms share one mesh
+    assert len(scene.geometry) == 2
+    # The arm's lowest corner (-5, -5, -40) mm, yawed by the joint origin,
+    # moved to (0, 0.1, 0.05) m and turned into the glTF Y-up frame
+    arm_node = next(n for n in scene.graph.nodes_geometry if "arm_left" in n)
+    transform, geometry = scene.graph[arm_node]
+    placed = trimesh.transform_points(scene.geometry[geometry].vertices, transform)
+    assert np.isclose(placed, [0.005, 0.01, -0.095], atol=1e-4).all(axis=1).any()
@@ -46,6 +46,7 @@ class DummyResponse:
     def __init__(self, payload=None, content=b""):
         self._payload = payload or {}
         self.content = content
+        self.headers = {}
 
     def raise_for_status(self):
         return None
@@ -53,6 +54,12 @@ class DummyResponse:
     def json(self):
         return self._payload
 
+    def iter_content(self, chunk_size):
+        return iter([self.content])
+
+    def close(self):
+        pass
+
 
 def test_export_step_uses_workspace_id(tmp_path: Path, monkeypatch):
     import time
@@ -68,6 +68,7 @@ def test_export_step_extracts_from_zip(tmp_path: Path):
         def __init__(self, payload=None, content=b""):
             self._payload = payload or {}
             self.content = content
+            self.headers = {}
 
         def raise_for_status(self):
             pass
@@ -75,6 +76,12 @@ def test_export_step_extracts_from_zip(tmp_path: Path):
         def json(self):
             return self._payload
 
+        def iter_content(self, chunk_size):
+            return iter([self.content])
+
+        def close(self):
+            pass
+
     # Create a zip containing a STEP file
     zip_buffer = io.BytesIO()
     with zipfile.ZipFile(zip_buffer, "w") as zf:
@@ -114,6 +121,7 @@ def test_export_step_detects_step_directly(tmp_path: Path):
         def __init__(self, payload=None, content=b""):
             self._payload = payload or {}
             self.content = content
+            self.headers = {}
 
         def raise_for_status(self):
             pass
@@ -121,6 +129,12 @@ def test_export_step_detects_step_directly(tmp_path: Path):
         def json(self):
             return self._payload
 
+        def iter_content(self, chunk_size):
+            return iter([self.content])
+
+        def close(self):
+            pass
+
     class DummyClient:
         def request(self, method, path, **kwargs):
             if path.endswith("/translations"):
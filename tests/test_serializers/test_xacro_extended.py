@@ -8,6 +8,7 @@ from onshape2xacro.serializers import (
     get_joint_name,
 )
 from onshape2xacro.condensed_robot import LinkRecord, JointRecord
+from onshape2xacro.config.export_config import VisualMeshOptions
 
 
 def test_is_module_boundary():
@@ -232,3 +233,119 @@ def test_xacro_link_mesh_map_dict(tmp_path):
         assert "c2.stl" in content
         # Visual uses dynamic extension anyway
         assert "visual/link1.${visual_mesh_ext}" in content
+
+
+def test_xacro_visual_lod_arg(tmp_path):
+    robot = nx.DiGraph()
+    robot.name = "lod_robot"
+    robot.add_node("link1", data=LinkRecord("link1", [], [], [], keys=["p1"]))
+
+    serializer = XacroSerializer()
+    robot.client = MagicMock()
+    robot.cad = MagicMock()
+
+    out = tmp_path / "output"
+    with patch("onshape2xacro.serializers.StepMeshExporter") as mock_exporter_cls:
+        mock_exporter = mock_exporter_cls.return_value
+        mock_exporter.export_link_meshes.return_value = (
+            {
+                "link1": {
+                    "visual": {"obj": "visual/lod0/link1.obj"},
+                    "visual_lods": [
+                        {"obj": "visual/lod0/link1.obj"},
+                        {"obj": "visual/lod1/link1.obj"},
+                    ],
+                    "collision": "collision/link1.stl",
+                }
+            },
+            {},
+            None,
+        )
+        serializer.save(
+            robot,
+            str(out),
+            download_assets=True,
+            visual_option=VisualMeshOptions(formats=["obj"], lods=[0.25]),
+        )
+
+    content = (out / "urdf" / "lod_robot.xacro").read_text()
+    assert "visual_lod:='0'" in content
+    assert "visual/lod${visual_lod}/link1.${visual_mesh_ext}" in content
+
+    entry = (out / "urdf" / "lod_robot.urdf.xacro").read_text()
+    assert '<xacro:arg name="visual_lod" default="0"/>' in entry
+    assert 'visual_lod="$(arg visual_lod)"' in entry
+
+
+def test_xacro_shared_link_meshes(tmp_path):
+    robot = nx.DiGraph()
+    robot.name = "shared_robot"
+    for name in ["leg_a", "leg_b"]:
+        robot.add_node(name, data=LinkRecord(name, [], [], [], keys=[name]))
+
+    serializer = XacroSerializer()
+    robot.client = MagicMock()
+    robot.cad = MagicMock()
+
+    out = tmp_path / "output"
+    with patch("onshape2xacro.serializers.StepMeshExporter") as mock_exporter_cls:
+        mock_exporter = mock_exporter_cls.return_value
+        leg = {"visual": {"obj": "visual/leg_a.obj"}, "collision": ["c/leg_a_0.stl"]}
+        mock_exporter.export_link_meshes.return_value = (
+            {"leg_a": leg, "leg_b": {**leg, "shared_with": "leg_a"}},
+            {},
+            None,
+        )
+        serializer.save(robot, str(out), download_assets=True)
+
+    content = (out / "urdf" / "shared_robot.xacro").read_text()
+    assert content.count("visual/leg_a.${visual_mesh_ext}") == 2
+    assert "leg_b.${visual_mesh_ext}" not in content
+    assert content.count("c/leg_a_0.stl") == 2
+
+
+def test_xacro_subtree_export_keeps_other_links(tmp_path):
+    import pytest
+    import yaml
+
+    robot = nx.DiGraph()
+    robot.name = "partial_robot"
+    for name in ["base", "arm", "hand", "leg"]:
+        robot.add_node(name, data=LinkRecord(name, [name], [], [name], keys=[name]))
+    for parent, child in [("base", "arm"), ("arm", "hand"), ("base", "leg")]:
+        joint = JointRecord(f"joint_{child}", "REVOLUTE", parent, child, (0, 0, 1))
+        robot.add_edge(parent, child, data=joint)
+    robot.client = MagicMock()
+    robot.cad = MagicMock()
+
+    serializer = XacroSerializer()
+    assert serializer._select_links(robot) is None
+    assert serializer._select_links(robot, subtree="arm") == {"arm", "hand"}
+    assert serializer._select_links(robot, ["leg"], "hand") == {"leg", "hand"}
+    with pytest.raises(ValueError, match="Unknown links: claw"):
+        serializer._select_links(robot, ["claw"])
+
+    # Hand-tuned values from a previous export of the whole robot
+    out = tmp_path / "output"
+    (out / "config").mkdir(parents=True)
+    previous = {"mass": 2.0, "origin": {"xyz": "0 0 0", "rpy": "0 0 0"}}
+    (out / "config" / "inertials.yaml").write_text(
+        yaml.dump({"inertials": {"base": previous, "hand": previous}})
+    )
+    (out / "config" / "joint_limits.yaml").write_text(
+        yaml.dump({"joint_limits": {"leg": {"lower": -1.0}, "hand": {"lower": -1.0}}})
+    )
+
+    with patch("onshape2xacro.serializers.StepMeshExporter") as mock_exporter_cls:
+        mock_exporter = mock_exporter_cls.return_value
+        mock_exporter.export_link_meshes.return_value = ({}, {}, None)
+        serializer.save(robot, str(out), download_assets=True, subtree="arm")
+
+    call = mock_exporter.export_link_meshes.call_args
+    assert call.kwargs["only_links"] == {"arm", "hand"}
+    inertials = yaml.safe_load((out / "config" / "inertials.yaml").read_text())
+    assert inertials["inertials"]["base"] == previous
+    assert inertials["inertials"]["hand"]["mass"] == 1.0
+    limits = yaml.safe_load((out / "config" / "joint_limits.yaml").read_text())
+    assert limits["joint_limits"]["leg"] == {"lower": -1.0}
+    assert limits["joint_limits"]["hand"]["lower"] == -3.14